@@ -18,12 +18,45 @@ def start_server():
     config = uvicorn.Config(fast_app, host="127.0.0.1", port=8000, log_level="error")
     server = uvicorn.Server(config)
     server.run()
+
+def wait_until_ready(url="http://127.0.0.1:8000/ready", timeout=90):
+    """Sunucu /ready 200 donene kadar bekle (port + motor isinmasi). Zaman asiminda yine de devam."""
+    import json
+    import time
+    import urllib.request
+    import urllib.error
+    
+    start = time.time()
+    last = None
+    while time.time() - start < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=2) as res:
+                if res.status == 200:
+                    print(f"Sunucu hazir ({time.time() - start:.1f}s)")
+                    return True
+        except urllib.error.HTTPError as e:
+            # 503: port acik, servisler hala kuruluyor
+            try:
+                status = json.loads(e.read().decode("utf-8")).get("services", {})
+                building = [n for n, s in status.items() if s.get("state") == "building"]
+                if building and building != last:
+                    print(f"Hazirlaniyor: {', '.join(building)}...")
+                    last = building
+            except: pass
+        except Exception:
+            pass  # Port henuz acilmadi
+        time.sleep(0.25)
+    print("Sunucu hazirlik zaman asimi, pencere yine de aciliyor.")
+    return False
 # --- END FEATURE: start_server ---
 
 if __name__ == '__main__':
     # 1. Start Server Thread
     t = threading.Thread(target=start_server, daemon=True)
     t.start()
+    
+    # Pencere, sunucu istek kabul etmeye hazir olunca acilir
+    wait_until_ready()
 
     # 2. Launch Webview
     # Use 'edge' or 'cef' for better rendering if available
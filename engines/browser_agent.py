@@ -6,7 +6,7 @@ Iki model kullanir: Planlayici (kod modeli) + Gorucu (vision modeli).
 
 import json
 import re
-import ollama
+from engines.ollama_client import get_ollama
 import base64
 from utils.settings_manager import SettingsManager
 
@@ -62,8 +62,9 @@ BILINEN SITELER VE SELECTORLER:
 CEVAP (SADECE JSON ARRAY):"""
 
         try:
-            response = ollama.chat(
+            response = get_ollama().chat(
                 model=self.planner_model,
+                role="browser_planner",
                 messages=[{"role": "user", "content": prompt}],
                 options={"temperature": 0.1, "num_predict": 1024}
             )
@@ -89,8 +90,9 @@ CEVAP (SADECE JSON ARRAY):"""
         Return: str (analiz sonucu)
         """
         try:
-            response = ollama.chat(
+            response = get_ollama().chat(
                 model=self.vision_model,
+                role="browser_vision",
                 messages=[{
                     "role": "user",
                     "content": question,
@@ -124,8 +126,9 @@ CEVAP (SADECE JSON ARRAY):"""
 Sadece JSON array dondur:"""
 
         try:
-            response = ollama.chat(
+            response = get_ollama().chat(
                 model=self.planner_model,
+                role="browser_planner",
                 messages=[{"role": "user", "content": prompt}],
                 options={"temperature": 0.2, "num_predict": 1024}
             )
@@ -0,0 +1,383 @@
+"""
+Command Index — sik sistem komutlari icin sablon + slot dizini; emin eslesmeyen istek LLM'e duser.
+Sistem muhendisi prompt'undaki komut kutuphanesi de ayni veriden uretilir.
+
+config.json:
+    "command_index": {"enabled": true, "threshold": 0.8}
+"""
+
+import os
+import re
+import difflib
+from urllib.parse import quote_plus
+
+from utils.embeddings import TURKISH_FOLD
+from utils.metrics import REGISTRY
+
+# --- FEATURE: command_index ---
+SYSTEM_COMMANDS = REGISTRY.counter(
+    "jarvis_system_command_total",
+    "SYSTEM istekleri (source: template = sablondan dogrudan, llm = sistem muhendisi modeli).",
+    ("source",),
+)
+
+SITES = [
+    # (takma adlar, url, kutuphane ornegi)
+    (("youtube", "yutub"), "https://www.youtube.com", "YouTube aç"),
+    (("google",), "https://www.google.com", "Google aç"),
+    (("instagram", "insta"), "https://www.instagram.com", "Instagram aç"),
+    (("twitter", "x"), "https://x.com", "Twitter aç"),
+    (("whatsapp web", "whatsapp", "wp web"), "https://web.whatsapp.com", "WhatsApp Web aç"),
+    (("gmail", "mail", "e posta", "eposta"), "https://mail.google.com", "Gmail aç"),
+    (("chatgpt", "chat gpt"), "https://chat.openai.com", "ChatGPT aç"),
+    (("reddit",), "https://www.reddit.com", "Reddit aç"),
+    (("wikipedia", "vikipedi"), "https://tr.wikipedia.org", "Wikipedia aç"),
+    (("haber sitesi", "haberler", "hurriyet"), "https://www.hurriyet.com.tr", "Haber sitesi aç"),
+]
+
+APPS = [
+    (("hesap makinesi",), "calc", "Hesap makinesi"),
+    (("not defteri", "notepad"), "notepad", "Not defteri"),
+    (("paint",), "mspaint", "Paint"),
+    (("dosya gezgini", "explorer"), "explorer", "Dosya gezgini"),
+    (("gorev yoneticisi",), "taskmgr", "Görev yöneticisi"),
+    (("ayarlar",), "ms-settings:", "Ayarlar"),
+    (("kontrol paneli",), "control", "Kontrol paneli"),
+    (("komut satiri", "cmd"), "cmd", "Komut satırı"),
+    (("powershell",), "powershell", "PowerShell"),
+    (("snipping tool", "ekran alintisi"), "SnippingTool", "Snipping Tool"),
+    (("word",), "winword", "Word"),
+    (("excel",), "excel", "Excel"),
+    (("spotify",), "spotify", "Spotify"),
+    (("discord",), "discord", "Discord"),
+    (("steam",), "steam", "Steam"),
+    (("vs code", "vscode", "visual studio code"), "code", "VS Code"),
+]
+
+PROCESSES = [
+    (("chrome", "google chrome"), '"chrome"', "Chrome kapat"),
+    (("firefox",), '"firefox"', "Firefox kapat"),
+    (("discord",), '"Discord"', "Discord kapat"),
+    (("spotify",), '"Spotify"', "Spotify kapat"),
+    (("tum tarayicilar", "tarayicilar", "butun tarayicilar"), '"chrome","msedge","firefox"', "Tüm tarayıcıları kapat"),
+]
+
+MUTE = "(New-Object -ComObject WScript.Shell).SendKeys([char]173)"
+VOLUME_UP = "(New-Object -ComObject WScript.Shell).SendKeys([char]175)"
+VOLUME_DOWN = "(New-Object -ComObject WScript.Shell).SendKeys([char]174)"
+
+OPEN_VERBS = ("ac", "baslat", "calistir", "gir")
+CLOSE_VERBS = ("kapat", "kapa", "sonlandir", "durdur")
+VERB_SUFFIXES = {"", "ar", "er", "ir", "ur", "abilir", "ebilir", "iver", "sana", "in", "iniz"}
+POLITE_TAIL = re.compile(r"(?:\s+(?:lutfen|hemen|jarvis|efendim|misin|misiniz|mi))+$")
+OBJECT_NOISE = {"sitesi", "sitesini", "uygulamasi", "uygulamasini", "programi", "programini", "bana", "hemen", "lutfen"}
+FOLDER_NAME = re.compile(r"^[\w][\w .()-]{0,100}$", re.UNICODE)
+# Olumsuz emir: "kilitleme", "acma", "gosterme", "kapatmayin", "silmesin"
+NEGATIVE_VERB = re.compile(r"(?:ma|me)(?:yin|yiniz|sin|sinlar|sinler)?$")
+QUANTIFIERS = {"tum", "tumu", "tumunu", "butun", "hepsi", "hepsini", "her", "herseyi"}
+PLURAL_OBJECT = re.compile(r"^(?:dosya|klasor)(?:lar|ler)")
+# Soru: "bilgisayari kapatir mi", "siler misin?" — geri alinamaz komutlar bu durumda LLM'e gider
+QUESTION_TAIL = re.compile(r"(?:^|\s)m[iu](?:sin|siniz|sun|sunuz|yim|yiz|dir)?(?:\s+(?:lutfen|hemen|jarvis|efendim))*\W*$|\?\W*$")
+IRREVERSIBLE = ("power:", "delete:", "clean:")
+FILE_NAME = re.compile(r"\.\w{1,5}$")
+
+
+def _fold(text):
+    return (text or "").replace("İ", "i").replace("I", "ı").lower().translate(TURKISH_FOLD)
+
+
+def _words(text):
+    """Orijinal kelimeler (kenar noktalama atilir), katlanmis karsiliklari ve ham halleri, bire bir."""
+    pairs = [(w.strip("\"“”?!.,;:"), w) for w in (text or "").split()]
+    pairs = [(w, raw) for w, raw in pairs if w]
+    return [w for w, _ in pairs], [_fold(w) for w, _ in pairs], [raw for _, raw in pairs]
+
+
+def _strip_suffix(word):
+    """ "chrome'u" -> "chrome", "wifi'yi" -> "wifi" """
+    return re.split(r"['’]", word)[0]
+
+
+class CommandMatch:
+    __slots__ = ("id", "command", "description", "score")
+
+    def __init__(self, command_id, command, description, score):
+        self.id = command_id
+        self.command = command
+        self.description = description
+        self.score = score
+
+    def render(self):
+        """Sistem muhendisi modeliyle ayni bicim: kisa aciklama + powershell blogu."""
+        return f"{self.description}\n```powershell\n{self.command}\n```"
+
+
+class CommandIndex:
+    DEFAULTS = {"enabled": True, "threshold": 0.8}
+
+    def __init__(self, paths, settings=None):
+        self.config = dict(self.DEFAULTS, **((settings.get("command_index", {}) if settings else {}) or {}))
+        self.enabled = bool(self.config["enabled"])
+        self.threshold = float(self.config["threshold"])
+        self.paths = paths
+        desktop, docs, downloads = paths["desktop"], paths["documents"], paths["downloads"]
+
+        # Ac / kapat fiilleriyle kullanilan nesneler: takma ad -> (id, komut, aciklama)
+        self.open_objects = {}
+        for aliases, url, example in SITES:
+            for alias in aliases:
+                self.open_objects[alias] = (f"site:{aliases[0]}", f'Start-Process "{url}"', f"{example} ediliyor.")
+        for aliases, exe, example in APPS:
+            for alias in aliases:
+                self.open_objects[alias] = (f"app:{aliases[0]}", f"Start-Process {exe}", f"{example} açılıyor.")
+        for alias, path, label in ((("indirilenler", "indirilenler klasoru", "downloads"), downloads, "İndirilenler"),
+                                   (("belgelerim", "belgeler", "belgeler klasoru"), docs, "Belgelerim"),
+                                   (("masaustu",), desktop, "Masaüstü")):
+            for a in alias:
+                self.open_objects[a] = (f"folder:{alias[0]}", f'Start-Process "{path}"', f"{label} açılıyor.")
+        for a in ("ses", "sesi"):
+            self.open_objects[a] = ("volume:up", VOLUME_UP, "Ses açılıyor.")
+        for a in ("wifi", "wi fi", "kablosuz"):
+            self.open_objects[a] = ("wifi:on", 'netsh interface set interface "Wi-Fi" enable', "WiFi açılıyor.")
+
+        self.close_objects = {}
+        for aliases, names, example in PROCESSES:
+            for alias in aliases:
+                self.close_objects[alias] = (f"close:{aliases[0]}",
+                                             f"Stop-Process -Name {names} -Force -ErrorAction SilentlyContinue",
+                                             f"{example.replace(' kapat', '')} kapatılıyor.")
+        for a in ("ses", "sesi"):
+            self.close_objects[a] = ("volume:mute", MUTE, "Ses kapatılıyor.")
+        for a in ("wifi", "wi fi", "kablosuz"):
+            self.close_objects[a] = ("wifi:off", 'netsh interface set interface "Wi-Fi" disable', "WiFi kapatılıyor.")
+        # Bilgisayari kapatmak geri alinamaz: sadece birebir takma ad (bulanik eslesme yok)
+        self.exact_close = {"bilgisayar", "bilgisayari", "pc", "pcyi"}
+        for a in self.exact_close:
+            self.close_objects[a] = ("power:shutdown", "Stop-Computer -Force", "Bilgisayar kapatılıyor.")
+
+        # Sabit cumleler: (id, tetikleyiciler, komut, aciklama, birebir_mi)
+        self.phrases = [
+            ("clean:temp", ("temp temizle", "temp klasorunu temizle", "gecici dosyalari temizle", "gecici dosyalari sil"),
+             'Remove-Item -Path "$env:TEMP\\*" -Recurse -Force -ErrorAction SilentlyContinue', "Temp klasörü temizleniyor.", True),
+            ("clean:recycle", ("geri donusum kutusunu bosalt", "cop kutusunu bosalt", "geri donusum kutusunu temizle"),
+             "Clear-RecycleBin -Force -ErrorAction SilentlyContinue", "Geri dönüşüm kutusu boşaltılıyor.", True),
+            ("clean:downloads", ("indirilenler temizle", "indirilenleri temizle", "indirilenler klasorunu temizle"),
+             f'Remove-Item -Path "{downloads}\\*" -Recurse -Force -ErrorAction SilentlyContinue',
+             "İndirilenler temizleniyor.", True),
+            ("volume:up", ("sesi arttir", "sesi artir", "sesi yukselt", "sesi ac", "ses ac", "sesi yukari al"),
+             VOLUME_UP, "Ses arttırılıyor.", False),
+            ("volume:down", ("sesi azalt", "sesi kis", "sesi dusur", "ses kis", "sesi asagi al"),
+             VOLUME_DOWN, "Ses azaltılıyor.", False),
+            ("power:restart", ("yeniden baslat", "bilgisayari yeniden baslat", "restart at", "pc yi yeniden baslat"),
+             "Restart-Computer -Force", "Bilgisayar yeniden başlatılıyor.", True),
+            ("power:sleep", ("uyku modu", "uyku moduna al", "bilgisayari uyku moduna al", "uyut"),
+             "rundll32.exe powrprof.dll,SetSuspendState 0,1,0", "Uyku moduna geçiliyor.", True),
+            ("power:lock", ("ekrani kilitle", "bilgisayari kilitle", "kilitle"),
+             "rundll32.exe user32.dll,LockWorkStation", "Ekran kilitleniyor.", False),
+            ("net:ip", ("ip adresimi goster", "ip adresim ne", "ip adresimi soyle", "ip adresi"),
+             "Get-NetIPAddress -AddressFamily IPv4 | Select-Object IPAddress, InterfaceAlias", "IP adresleri:", False),
+        ]
+
+        # Slotlu kaliplar (katlanmis metin uzerinde): (id, kalip)
+        self.templates = [
+            ("search:youtube", re.compile(r"^youtube'?(?:da|de|ta) (?P<query>.+?) (?:ara|arat|bul|ac)\w*$")),
+            ("search:youtube", re.compile(r"^(?P<query>.+?) youtube'?(?:da|de|ta) (?:ara|arat|bul)\w*$")),
+            ("search:google", re.compile(r"^google'?(?:da|de|la) (?P<query>.+?) (?:ara|arat|bul)\w*$")),
+            ("search:google", re.compile(r"^(?P<query>.+?) google'?(?:da|de|la|a) (?:ara|arat|bul)\w*$")),
+            ("create:file", re.compile(
+                r"^masaustu\w* (?:(?:bir|yeni) )?(?P<name>\S+\.\w{1,5}) (?:adinda |adli |isimli |isminde )?"
+                r"(?:(?:bir|yeni) )?dosya\w* (?:olustur|yap|ac)\w*$")),
+            ("create:folder", re.compile(
+                r"^masaustu\w* (?:(?:bir|yeni) )?(?:(?P<name>.+?) (?:adinda |adli |isimli |isminde )?)?"
+                r"(?:(?:bir|yeni) )?klasor\w* (?:olustur|yap|ac)\w*$")),
+            ("delete:folder", re.compile(r"^(?:masaustu\w* )?(?:(?:bir|yeni) )?(?P<name>.+?) klasor\w* sil\w*$")),
+            ("delete:file", re.compile(r"^(?:masaustu\w* )?(?P<name>.+?) dosya\w* sil\w*$")),
+        ]
+
+    # ==================== ESLESTIRME ====================
+
+    def _fuzzy(self, key, table, exact=()):
+        if key in table:
+            return key, 1.0
+        candidates = [alias for alias in table if alias not in exact]
+        best = difflib.get_close_matches(key, candidates, n=1, cutoff=self.threshold)
+        if not best:
+            return None, 0.0
+        return best[0], difflib.SequenceMatcher(None, key, best[0]).ratio()
+
+    def _verb_object(self, folded_words):
+        if len(folded_words) < 2:
+            return None
+        verb = folded_words[-1]
+        for verbs, table in ((OPEN_VERBS, self.open_objects), (CLOSE_VERBS, self.close_objects)):
+            stem = next((v for v in verbs if verb.startswith(v) and verb[len(v):] in VERB_SUFFIXES), None)
+            if stem is None:
+                continue
+            words = [_strip_suffix(w) for w in folded_words[:-1] if w not in OBJECT_NOISE]
+            key = " ".join(w for w in words if w)
+            if not key:
+                return None
+            exact = self.exact_close if table is self.close_objects else ()
+            alias, score = self._fuzzy(key, table, exact)
+            if alias is None:
+                return None
+            command_id, command, description = table[alias]
+            return CommandMatch(command_id, command, description, score)
+        return None
+
+    def _phrase(self, text, fuzzy=False):
+        """fuzzy=False: sadece birebir tetikleyici. fuzzy=True: zararsiz cumlelerde en yakin eslesme."""
+        best = None
+        for command_id, triggers, command, description, exact in self.phrases:
+            for trigger in triggers:
+                if text == trigger:
+                    return CommandMatch(command_id, command, description, 1.0)
+                if exact or not fuzzy:
+                    continue
+                score = difflib.SequenceMatcher(None, text, trigger).ratio()
+                if score >= self.threshold and (best is None or score > best.score):
+                    best = CommandMatch(command_id, command, description, score)
+        return best
+
+    def _slot(self, original, folded, match, name):
+        """Slotu katlanmis metin konumundan orijinal kelimelere geri tasir (buyuk harf / Turkce harf korunur)."""
+        start, end = match.span(name)
+        if start < 0:
+            return None
+        first = " ".join(folded)[:start].count(" ")
+        last = first + " ".join(folded)[start:end].count(" ")
+        return " ".join(original[first:last + 1])
+
+    def _template(self, original, folded, raw):
+        text = " ".join(folded)
+        desktop = self.paths["desktop"]
+        for command_id, pattern in self.templates:
+            found = pattern.match(text)
+            if not found:
+                continue
+            if command_id.startswith("search:"):
+                query = self._slot(original, folded, found, "query")
+                query = re.sub(r"['’](?:[iıuü]|y[iıuü]|n[iıuü]|[iıuü]n|n[iıuü]n)$", "", query)
+                base = ("https://www.youtube.com/results?search_query=" if command_id == "search:youtube"
+                        else "https://www.google.com/search?q=")
+                return CommandMatch(command_id, f'Start-Process "{base}{quote_plus(query)}"',
+                                    f"\"{query}\" aranıyor.", 1.0)
+
+            # "tum dosyalari sil", "butun klasorleri sil": tek bir isim degil, LLM karar versin
+            if any(w in QUANTIFIERS or PLURAL_OBJECT.match(w) for w in folded):
+                return None
+            name = self._slot(original, folded, found, "name")
+            if name is None and command_id == "create:folder":
+                name = "Yeni Klasör"
+            elif name is not None and name != self._slot(raw, folded, found, "name"):
+                return None  # Isimden noktalama/tirnak atildi ('"evil"; rm'): yazilan isim bu degil
+            if not name or ".." in name or not FOLDER_NAME.match(name):
+                return None  # Guvenli olmayan / anlasilmayan isim: LLM karar versin
+            if command_id == "delete:file" and not FILE_NAME.search(name):
+                return None  # Uzantisiz "Proje dosyasini sil": hangi dosya oldugu belirsiz
+            path = f"{desktop}\\{name}"
+            if command_id == "create:folder":
+                return CommandMatch(command_id, f'New-Item -Path "{path}" -ItemType Directory -Force',
+                                    f"Masaüstünde \"{name}\" klasörü oluşturuluyor.", 1.0)
+            if command_id == "create:file":
+                return CommandMatch(command_id, f'New-Item -Path "{path}" -ItemType File -Force',
+                                    f"Masaüstünde \"{name}\" dosyası oluşturuluyor.", 1.0)
+            if command_id == "delete:folder":
+                return CommandMatch(command_id, f'Remove-Item -Path "{path}" -Recurse -Force',
+                                    f"\"{name}\" klasörü siliniyor.", 1.0)
+            return CommandMatch(command_id, f'Remove-Item -Path "{path}" -Force',
+                                f"\"{name}\" dosyası siliniyor.", 1.0)
+        return None
+
+    def match(self, prompt):
+        """Emin eslesme varsa CommandMatch, yoksa None (LLM'e dusulur)."""
+        if not self.enabled:
+            return None
+        original, folded, raw = _words(prompt)
+        question = bool(QUESTION_TAIL.search(_fold(prompt).strip()))
+        text = POLITE_TAIL.sub("", " ".join(folded)).strip()
+        if not text:
+            return None
+        folded = text.split(" ")
+        original, raw = original[:len(folded)], raw[:len(folded)]
+        if NEGATIVE_VERB.search(folded[-1]):
+            return None  # "ekrani kilitleme" = kilitleme demek; model baglamdan anlasin
+        # Komut model onayi olmadan calisir: once slotlu/birebir eslesmeler, bulanik cumleler en son
+        found = (self._template(original, folded, raw) or self._phrase(text) or self._verb_object(folded)
+                 or self._phrase(text, fuzzy=True))
+        if found is not None and question and found.id.startswith(IRREVERSIBLE):
+            return None  # "bilgisayari kapatir mi" bir soru; model onayi olmadan kapatilmaz
+        return found
+
+    # ==================== LLM PROMPT'U ====================
+
+    def library_text(self):
+        """Sistem muhendisi prompt'undaki 'HAZIR KOMUT KUTUPHANESI' — ayni veriden uretilir."""
+        desktop, docs, downloads = self.paths["desktop"], self.paths["documents"], self.paths["downloads"]
+        lines = ["--- WEB SİTELERİ AÇMA ---"]
+        for aliases, url, example in SITES:
+            lines.append(f"\"{example}\" -> Start-Process \"{url}\"")
+            if aliases[0] == "youtube":
+                lines.append("\"YouTube'da X ara\" -> Start-Process \"https://www.youtube.com/results?search_query=X\"")
+            if aliases[0] == "google":
+                lines.append("\"Google'da X ara\" -> Start-Process \"https://www.google.com/search?q=X\"")
+        lines += ["", "--- UYGULAMALAR AÇMA ---"]
+        lines += [f"\"{example}\" -> Start-Process {exe}" for _, exe, example in APPS]
+        lines += ["", "--- UYGULAMA KAPATMA ---"]
+        lines += [f"\"{example}\" -> Stop-Process -Name {names} -Force -ErrorAction SilentlyContinue"
+                  for _, names, example in PROCESSES]
+        lines += [
+            "", "--- DOSYA/KLASÖR İŞLEMLERİ ---",
+            f"\"Masaüstünde X klasörü oluştur\" -> New-Item -Path \"{desktop}\\X\" -ItemType Directory -Force",
+            f"\"Masaüstünde X.txt dosyası oluştur\" -> New-Item -Path \"{desktop}\\X.txt\" -ItemType File -Force",
+            f"\"X klasörünü sil\" -> Remove-Item -Path \"{desktop}\\X\" -Recurse -Force",
+            f"\"X dosyasını sil\" -> Remove-Item -Path \"{desktop}\\X\" -Force",
+            f"\"İndirilenler klasörünü aç\" -> Start-Process \"{downloads}\"",
+            f"\"Belgelerim'i aç\" -> Start-Process \"{docs}\"",
+            f"\"Masaüstünü aç\" -> Start-Process \"{desktop}\"",
+            "", "--- TEMİZLİK ---",
+            f"\"Temp temizle\" -> Remove-Item -Path \"$env:TEMP\\*\" -Recurse -Force -ErrorAction SilentlyContinue",
+            "\"Geri dönüşüm kutusunu boşalt\" -> Clear-RecycleBin -Force -ErrorAction SilentlyContinue",
+            f"\"İndirilenler temizle\" -> Remove-Item -Path \"{downloads}\\*\" -Recurse -Force -ErrorAction SilentlyContinue",
+            "", "--- SES/PARLAKLIK ---",
+            f"\"Sesi kapat\" -> {MUTE}",
+            f"\"Sesi aç\" -> {VOLUME_UP}",
+            f"\"Sesi arttır\" -> {VOLUME_UP}",
+            f"\"Sesi azalt\" -> {VOLUME_DOWN}",
+            "", "--- SİSTEM İŞLEMLERİ ---",
+            "\"Bilgisayarı kapat\" -> Stop-Computer -Force",
+            "\"Yeniden başlat\" -> Restart-Computer -Force",
+            "\"Uyku modu\" -> rundll32.exe powrprof.dll,SetSuspendState 0,1,0",
+            "\"Ekranı kilitle\" -> rundll32.exe user32.dll,LockWorkStation",
+            "\"WiFi kapat\" -> netsh interface set interface \"Wi-Fi\" disable",
+            "\"WiFi aç\" -> netsh interface set interface \"Wi-Fi\" enable",
+            "\"IP adresimi göster\" -> Get-NetIPAddress -AddressFamily IPv4 | Select-Object IPAddress, InterfaceAlias",
+            "\"Tarih/Saat göster\" -> Get-Date -Format 'dd MMMM yyyy, dddd HH:mm:ss'",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def system_paths():
+    """Masaustu / Belgeler / Indirilenler (OneDrive yonlendirmesi varsa onu kullanir)."""
+    user_profile = os.path.expanduser("~")
+    onedrive = os.path.join(user_profile, "OneDrive")
+    if os.path.exists(os.path.join(onedrive, "Desktop")):
+        desktop, docs = os.path.join(onedrive, "Desktop"), os.path.join(onedrive, "Documents")
+    else:
+        desktop, docs = os.path.join(user_profile, "Desktop"), os.path.join(user_profile, "Documents")
+    return {"home": user_profile, "desktop": desktop, "documents": docs,
+            "downloads": f"{user_profile}\\Downloads"}
+# --- END FEATURE: command_index ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
@@ -0,0 +1,270 @@
+"""
+Context Builder — tum ajanlar icin token butceli prompt birlestirici.
+CPU'da prompt-eval suresi prompt token sayisiyla dogrusal buyudugu icin her ajan
+mesaj listesini buradan alir:
+- Token tahmini (karakter/4 + mesaj basi ek yuk; model bazli gercek prompt_eval_count ile kalibre)
+- Hafiza tek sefer; tekrar eden / gecmiste zaten gecen bilgiler atilir
+- Gecmis yeniden eskiye dogru butceye sigdigi kadar; uzun mesajlar kirpilir, tekrarlar atilir
+- Onek kararliligi: sabit sistem prompt'u en basta, degisken icerik (hafiza, tarih/saat)
+  son kullanici mesajinda. Ollama KV-cache'i sistem prompt'u + gecmisi tekrar hesaplamaz.
+- Gercek prompt_eval_count ve kirpilan tahmini token metrik olarak kaydedilir; tahmini toplam
+  ile degerlendirilen token farkindan onek cache isabet orani cikarilir
+
+Ayarlar (config.json "context_budget", hepsi opsiyonel):
+    "context_budget": {"chat": 3072, "search": 2048, "commander": 1024, "max_history": 10}
+"""
+
+import json
+import threading
+
+from utils.embeddings import normalize_text
+from utils.metrics import REGISTRY
+
+# --- FEATURE: context_builder ---
+PROMPT_TOKENS = REGISTRY.histogram(
+    "jarvis_prompt_tokens",
+    "Ajan basina prompt token sayisi (kind: estimated = builder tahmini, actual = Ollama prompt_eval_count).",
+    ("agent", "kind"),
+    buckets=(64, 128, 256, 512, 1024, 1536, 2048, 3072, 4096, 8192),
+)
+PREFILL_TOKENS = REGISTRY.counter(
+    "jarvis_prompt_prefill_tokens_total",
+    "Prompt token'lari (kind: total = tahmini toplam, evaluated = Ollama'nin gercekten isledigi).",
+    ("agent", "kind"),
+)
+PREFIX_CACHE_RATIO = REGISTRY.gauge(
+    "jarvis_prompt_prefix_cache_ratio",
+    "Onek cache'inden gelen prompt token orani (1 - evaluated/total).",
+    ("agent",),
+)
+CONTEXT_TRIMMED = REGISTRY.counter(
+    "jarvis_context_trimmed_tokens_total",
+    "Butce nedeniyle prompt'a girmeyen tahmini token (part: history/memory/duplicate).",
+    ("agent", "part"),
+)
+
+
+class ContextBuilder:
+    # Toplam prompt butcesi (token); cevap icin model penceresinde yer kalir
+    DEFAULT_BUDGETS = {
+        "chat": 3072,
+        "search": 2048,
+        "commander": 1024,
+        "lead_dev": 2048,
+        "system_engineer": 1536,
+        "analyst": 2048,
+        "math": 768,
+    }
+    DEFAULT_BUDGET = 2048
+    MESSAGE_OVERHEAD = 4        # Sablon token'lari (rol etiketi, ayiricilar)
+    MEMORY_SHARE = 0.2          # Hafiza butcenin en fazla bu kadarini kullanir
+    MESSAGE_SHARE = 0.35        # Tek bir gecmis mesaji butcenin en fazla bu kadarini kullanir
+    DEDUP_MIN_CHARS = 40        # Bundan kisa gecmis mesajlari tekrar kontrolune girmez
+
+    def __init__(self, settings=None):
+        cfg = (settings.get("context_budget", {}) if settings else {}) or {}
+        self.max_history = int(cfg.get("max_history", 10))
+        self.budgets = dict(self.DEFAULT_BUDGETS)
+        self.budgets.update({k: int(v) for k, v in cfg.items() if k != "max_history"})
+        self._ratio = {}        # model -> gercek/tahmin orani (ussel ortalama)
+        self._prefill = {}      # ajan -> {"calls", "total", "evaluated"}
+        self._lock = threading.Lock()
+
+    # ==================== TOKEN TAHMINI ====================
+
+    @staticmethod
+    def _raw_tokens(text):
+        return (len(text or "") + 3) // 4
+
+    def estimate(self, text, model=None):
+        ratio = self._ratio.get(model, 1.0) if model else 1.0
+        return int(self._raw_tokens(text) * ratio) + 1
+
+    def estimate_messages(self, messages, model=None):
+        return sum(self.estimate(m.get("content", ""), model) + self.MESSAGE_OVERHEAD for m in messages)
+
+    def budget_for(self, agent):
+        return self.budgets.get(agent, self.DEFAULT_BUDGET)
+
+    def _truncate(self, text, max_tokens, model=None):
+        if self.estimate(text, model) <= max_tokens:
+            return text
+        ratio = self._ratio.get(model, 1.0) if model else 1.0
+        keep = max(0, int(max_tokens * 4 / ratio) - 3)
+        return text[:keep].rstrip() + " …"
+
+    # ==================== HAFIZA ====================
+
+    @staticmethod
+    def _memory_items(memory):
+        """Hafiza: JSON liste/dict dokumu ya da duz metin -> tekil maddeler (sira korunur)."""
+        if not memory:
+            return []
+        items = None
+        if isinstance(memory, (list, tuple)):
+            items = list(memory)
+        else:
+            try:
+                parsed = json.loads(memory)
+                if isinstance(parsed, list):
+                    items = parsed
+                elif isinstance(parsed, dict):
+                    items = [f"{k}: {v}" for k, v in parsed.items()]
+            except (TypeError, ValueError):
+                items = [line for line in str(memory).splitlines()]
+        if items is None:
+            items = [str(memory)]
+        seen, unique = set(), []
+        for item in items:
+            text = str(item).strip()
+            key = normalize_text(text)
+            if text and key not in seen:
+                seen.add(key)
+                unique.append(text)
+        return unique
+
+    # ==================== BIRLESTIRME ====================
+
+    def build(self, agent, system_prompt, prompt, history=None, memory=None,
+              memory_header="[HAFIZA BİLGİSİ]:", model=None, max_history=None, volatile=None):
+        """
+        [system, ...gecmis..., user(degisken baglam + prompt)] listesi dondurur.
+        history: [{"role": "user"/"ai", "text": ...}] — son eleman prompt'un kendisiyse atlanir.
+        volatile: her cagrida degisen kisa baglam (tarih/saat vb.); hafiza ile birlikte son mesaja girer.
+        """
+        budget = self.budget_for(agent)
+        max_history = self.max_history if max_history is None else max_history
+        trimmed = {"history": 0, "memory": 0, "duplicate": 0}
+
+        prompt_tokens = self.estimate(prompt, model) + self.estimate(volatile, model) + self.MESSAGE_OVERHEAD
+        system_tokens = self.estimate(system_prompt, model) + self.MESSAGE_OVERHEAD
+        remaining = budget - prompt_tokens - system_tokens
+
+        # Gecmis: prompt'un kendisi ve ardisik tekrarlar haric, yeniden eskiye
+        past = list(history or [])
+        if past and normalize_text(past[-1].get("text", "")) == normalize_text(prompt):
+            past = past[:-1]
+        past = past[-max_history:] if max_history > 0 else []
+
+        # Hafiza: gecmiste ya da sistem prompt'unda aynen gecen maddeler tekrar gonderilmez
+        context_norm = normalize_text(system_prompt + " " + " ".join(m.get("text", "") for m in past))
+        memory_lines = []
+        memory_budget = int(budget * self.MEMORY_SHARE)
+        used_memory = 0
+        for item in self._memory_items(memory):
+            cost = self.estimate(item, model) + 1
+            if normalize_text(item) in context_norm:
+                trimmed["duplicate"] += cost
+                continue
+            if used_memory + cost > min(memory_budget, max(remaining, 0)):
+                trimmed["memory"] += cost
+                continue
+            memory_lines.append(item)
+            used_memory += cost
+        suffix = [volatile] if volatile else []
+        if memory_lines:
+            suffix.append(f"{memory_header} " + "; ".join(memory_lines))
+            remaining -= used_memory + self.estimate(memory_header, model)
+
+        selected = []
+        seen = set()
+        per_message = max(32, int(budget * self.MESSAGE_SHARE))
+        for i in range(len(past) - 1, -1, -1):
+            m = past[i]
+            text = m.get("text", "") or ""
+            key = (m.get("role"), normalize_text(text))
+            # Kisa cevaplar ("evet", "tamam") tekrar etse de sira bozulmasin diye tutulur
+            if not text.strip() or (len(text) >= self.DEDUP_MIN_CHARS and key in seen):
+                trimmed["duplicate"] += self.estimate(text, model)
+                continue
+            seen.add(key)
+            content = self._truncate(text, per_message, model)
+            cost = self.estimate(content, model) + self.MESSAGE_OVERHEAD
+            if cost > remaining:
+                # Butce doldu: bu ve daha eski mesajlar girmez
+                trimmed["history"] += sum(self.estimate(o.get("text", ""), model) for o in past[:i + 1])
+                break
+            trimmed["history"] += self.estimate(text, model) - self.estimate(content, model)
+            remaining -= cost
+            role = "user" if m.get("role") == "user" else "assistant"
+            selected.append({"role": role, "content": content})
+        selected.reverse()
+
+        if suffix:
+            prompt = "\n".join(suffix) + "\n\n" + prompt
+        messages = [{"role": "system", "content": system_prompt}] + selected + [{"role": "user", "content": prompt}]
+        estimated = self.estimate_messages(messages, model)
+        PROMPT_TOKENS.observe(estimated, agent=agent, kind="estimated")
+        for part, tokens in trimmed.items():
+            if tokens > 0:
+                CONTEXT_TRIMMED.inc(tokens, agent=agent, part=part)
+        return messages
+
+    def commander_hint(self, history, prompt, messages=3, chars=100):
+        """Komutana takip sorulari icin kisa baglam: son birkac mesaj, kirpilmis ve tekrarsiz."""
+        if not history or len(history) < 2:
+            return ""
+        past = list(history)
+        if normalize_text(past[-1].get("text", "")) == normalize_text(prompt):
+            past = past[:-1]
+        lines, seen = [], set()
+        for m in past[-messages:]:
+            text = (m.get("text", "") or "")[:chars]
+            key = normalize_text(text)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            role_label = "Kullanici" if m.get("role") == "user" else "Asistan"
+            lines.append(f"{role_label}: {text}")
+        return "\n".join(lines)
+
+    # ==================== OLCUM ====================
+
+    def record(self, agent, response, messages=None, model=None):
+        """
+        Ollama cevabindaki prompt_eval_count'u kaydet. Ollama sadece cache'te olmayan token'lari
+        degerlendirir; tahmini toplamla farki onek cache isabetidir.
+        """
+        try:
+            actual = response.get("prompt_eval_count") or 0
+        except Exception:
+            actual = getattr(response, "prompt_eval_count", 0) or 0
+        if not actual:
+            return
+        PROMPT_TOKENS.observe(actual, agent=agent, kind="actual")
+        if not messages:
+            return
+        raw = sum(self._raw_tokens(m.get("content", "")) + self.MESSAGE_OVERHEAD for m in messages)
+        with self._lock:
+            ratio = self._ratio.get(model, 1.0)
+            # Kalibrasyon sadece soguk (cache'siz) gorunen cagrilardan: cache isabeti orani dusurmesin
+            if model and raw > 0 and actual / raw >= 0.7 * ratio:
+                ratio = self._ratio[model] = 0.8 * ratio + 0.2 * (actual / raw)
+            total = max(actual, int(raw * ratio))
+            stats = self._prefill.setdefault(agent, {"calls": 0, "total": 0, "evaluated": 0})
+            stats["calls"] += 1
+            stats["total"] += total
+            stats["evaluated"] += actual
+            PREFIX_CACHE_RATIO.set(1 - stats["evaluated"] / stats["total"], agent=agent)
+        PREFILL_TOKENS.inc(total, agent=agent, kind="total")
+        PREFILL_TOKENS.inc(actual, agent=agent, kind="evaluated")
+
+    def cache_report(self):
+        """Ajan basina: cagri sayisi, tahmini toplam / degerlendirilen token, onek cache orani."""
+        with self._lock:
+            return {agent: dict(s, cached_ratio=round(1 - s["evaluated"] / s["total"], 3) if s["total"] else 0.0)
+                    for agent, s in self._prefill.items()}
+# --- END FEATURE: context_builder ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
@@ -0,0 +1,132 @@
+"""
+Fast Path — saat/tarih/gun sorulari ve tum cumlesi hesap olan mesajlar icin, komutandan once
+calisan model'siz on-yonlendirici (kaliplar tum cumleyi kapsar).
+
+config.json:
+    "fast_path": {"enabled": true}
+"""
+
+import re
+import threading
+from datetime import datetime
+
+from utils.embeddings import TURKISH_FOLD
+from utils.metrics import REGISTRY
+from engines.turkish_math import calculate, MathParseError
+
+# --- FEATURE: fast_path ---
+FAST_PATH_TOTAL = REGISTRY.counter(
+    "jarvis_fast_path_total",
+    "On-yonlendirici sonuclari (result: hit/miss, family: time/day/date/arithmetic).",
+    ("result", "family"),
+)
+
+GUNLER = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+AYLAR = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
+         "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+
+
+def date_strings(now=None):
+    """(gun adi, "18 Ekim 2026, Pazar", "14:05") — arama ajani da ayni bicimi kullanir."""
+    now = now or datetime.now()
+    gun_adi = GUNLER[now.weekday()]
+    return gun_adi, f"{now.day} {AYLAR[now.month - 1]} {now.year}, {gun_adi}", now.strftime('%H:%M')
+
+
+def _fold(text):
+    """Turkce kucuk harf + aksan katlama; rakam, operator ve ondalik isaretleri korunur."""
+    text = (text or "").replace("İ", "i").replace("I", "ı").lower().translate(TURKISH_FOLD)
+    text = re.sub(r"[?!]+|\s[.,]+$|[.,]+$", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+_TAIL = r"(?:\s+(?:acaba|jarvis|lutfen|efendim))*"
+
+
+class FastPathRouter:
+    DEFAULTS = {"enabled": True}
+
+    # Aile -> (raporlanan intent, derlenmis kalip)
+    PATTERNS = {
+        "time": ("SEARCH", re.compile(
+            r"^(?:(?:simdi|su an|su anda)\s+)?"
+            r"(?:saat\s+(?:kac|ne)(?:\s+oldu)?|saati\s+soyle(?:r\s*misin)?|saat\s+kac\s+biliyor\s+musun)"
+            + _TAIL + r"$")),
+        "day": ("SEARCH", re.compile(
+            r"^(?:bugun\s+)?(?:gunlerden\s+(?:ne|hangisi)|hangi\s+gun(?:deyiz)?|ne\s+gunu)(?:\s+bugun)?"
+            + _TAIL + r"$")),
+        "date": ("SEARCH", re.compile(
+            r"^(?:bugun(?:un)?\s+tarih(?:i)?(?:\s+(?:ne|kac|nedir))?|tarih\s+(?:ne|kac|nedir)|"
+            r"tarihi\s+soyle(?:r\s*misin)?|ayin\s+kaci|bugun\s+ayin\s+kaci)"
+            + _TAIL + r"$")),
+    }
+    ARITHMETIC_INTENT = "MATH"
+
+    def __init__(self, settings=None):
+        self.config = dict(self.DEFAULTS, **((settings.get("fast_path", {}) if settings else {}) or {}))
+        self.enabled = bool(self.config["enabled"])
+        self._stats = {"hit": 0, "miss": 0}
+        self._lock = threading.Lock()
+
+    def _answer(self, family):
+        gun_adi, tarih_str, saat_str = date_strings()
+        if family == "time":
+            return f"Şu an saat **{saat_str}**, efendim."
+        if family == "day":
+            return f"Bugün **{gun_adi}**, {tarih_str}."
+        return f"Bugün **{tarih_str}**, saat {saat_str}."
+
+    @staticmethod
+    def _arithmetic(prompt):
+        try:
+            return calculate(prompt, require_operation=True)[1]
+        except MathParseError:
+            return None
+        except ZeroDivisionError:
+            return "Sıfıra bölme tanımsız efendim."
+        except (ValueError, OverflowError) as e:
+            return f"Hesaplama Hatasi: {e}"
+
+    def _hit(self, family, intent, answer):
+        with self._lock:
+            self._stats["hit"] += 1
+            self._stats[family] = self._stats.get(family, 0) + 1
+        FAST_PATH_TOTAL.inc(result="hit", family=family)
+        return family, intent, answer
+
+    def match(self, prompt):
+        """Donus: (aile, intent, cevap) ya da None (normal yola devam)."""
+        if not self.enabled:
+            return None
+        text = _fold(prompt)
+        for family, (intent, pattern) in self.PATTERNS.items():
+            if pattern.match(text):
+                return self._hit(family, intent, self._answer(family))
+        answer = self._arithmetic(prompt)
+        if answer is not None:
+            return self._hit("arithmetic", self.ARITHMETIC_INTENT, answer)
+        with self._lock:
+            self._stats["miss"] += 1
+        FAST_PATH_TOTAL.inc(result="miss", family="none")
+        return None
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        total = stats["hit"] + stats["miss"]
+        stats["hit_ratio"] = round(stats["hit"] / total, 3) if total else 0.0
+        return stats
+# --- END FEATURE: fast_path ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
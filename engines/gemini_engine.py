@@ -1,6 +1,7 @@
 from google import genai
 from google.genai import types
 from .base import BaseEngine
+from utils.metrics import timed, timed_stream, GEMINI_FALLBACKS
 import time
 
 # --- FEATURE: gemini_engine ---
@@ -46,7 +47,8 @@ class GeminiEngine(BaseEngine):
 
         # Try Primary Model
         try:
-            return self._try_generate(self.primary_model_name, prompt, system_instruction, history, images, use_search)
+            with timed("gemini.primary", model=self.primary_model_name):
+                return self._try_generate(self.primary_model_name, prompt, system_instruction, history, images, use_search)
         except Exception as e:
             error_str = str(e)
             print(f"⚠️ Primary Model Error ({self.primary_model_name}): {error_str}")
@@ -54,15 +56,16 @@ class GeminiEngine(BaseEngine):
             # Catch 'Invalid operation' (Empty response), Quota (429), or any other crash
             # Switch to Fallback
             print(f"🔄 Switching to Fallback: {self.fallback_model_name}")
+            GEMINI_FALLBACKS.inc(model=self.fallback_model_name)
             self.current_active_model = self.fallback_model_name
             try:
-                return self._try_generate(self.fallback_model_name, prompt, system_instruction, history, images, use_search)
+                with timed("gemini.fallback", model=self.fallback_model_name):
+                    return self._try_generate(self.fallback_model_name, prompt, system_instruction, history, images, use_search)
             except Exception as e2:
                 return f"❌ All Models Failed. Error: {e2}\nPrimary: {error_str}"
 
-    def _try_generate(self, model_name, prompt, system_instruction, history, images, use_search):
-        self.current_active_model = model_name
-        
+    def _build_request(self, prompt, system_instruction, history, images, use_search):
+        """generate_content ve generate_content_stream icin ortak (contents, config) hazirlar."""
         # 1. Safety Constants (New API uses different structure)
         safety_settings = [
             types.SafetySetting(
@@ -117,6 +120,12 @@ class GeminiEngine(BaseEngine):
         current_parts.append(types.Part.from_text(text=prompt))
         contents.append(types.Content(role='user', parts=current_parts))
 
+        return contents, config
+
+    def _try_generate(self, model_name, prompt, system_instruction, history, images, use_search):
+        self.current_active_model = model_name
+        contents, config = self._build_request(prompt, system_instruction, history, images, use_search)
+
         # 5. Generate
         response = self.client.models.generate_content(
             model=model_name,
@@ -146,8 +155,61 @@ class GeminiEngine(BaseEngine):
         
         raise ValueError("No valid text in response")
 
-    def generate_stream(self, prompt, system_instruction=None, history=[], images=[]):
-        pass
+    def generate_stream(self, prompt, system_instruction=None, history=[], images=[], use_search=False):
+        """
+        Token akisi: parcalari model urettikce yield eder.
+        Primary model ilk parcadan once hata verirse fallback modele gecer.
+        """
+        if not self.api_key:
+            yield "⚠️ API Anahtarı Eksik."
+            return
+
+        yielded = False
+        try:
+            primary = self._try_stream(self.primary_model_name, prompt, system_instruction, history, images, use_search)
+            for text in timed_stream(primary, "gemini.primary", model=self.primary_model_name):
+                yielded = True
+                yield text
+            if yielded:
+                return
+            raise ValueError("Empty response from model")
+        except Exception as e:
+            error_str = str(e)
+            print(f"⚠️ Primary Model Stream Error ({self.primary_model_name}): {error_str}")
+            if yielded:
+                # Cevabin bir kismi zaten gonderildi, modeli degistirip bastan baslatamayiz
+                yield f"\n\n❌ Stream Error: {error_str}"
+                return
+
+        print(f"🔄 Switching to Fallback: {self.fallback_model_name}")
+        GEMINI_FALLBACKS.inc(model=self.fallback_model_name)
+        try:
+            fallback = self._try_stream(self.fallback_model_name, prompt, system_instruction, history, images, use_search)
+            for text in timed_stream(fallback, "gemini.fallback", model=self.fallback_model_name):
+                yield text
+        except Exception as e2:
+            yield f"❌ All Models Failed. Error: {e2}\nPrimary: {error_str}"
+
+    def _try_stream(self, model_name, prompt, system_instruction, history, images, use_search):
+        self.current_active_model = model_name
+        contents, config = self._build_request(prompt, system_instruction, history, images, use_search)
+
+        stream = self.client.models.generate_content_stream(
+            model=model_name,
+            contents=contents,
+            config=config
+        )
+        for chunk in stream:
+            # _try_generate ile ayni filtre: sadece text parcalari, thought_signature atlanir
+            if not chunk.candidates:
+                continue
+            cand = chunk.candidates[0]
+            if cand.content and cand.content.parts:
+                for part in cand.content.parts:
+                    if hasattr(part, 'text') and part.text:
+                        yield part.text
+            elif hasattr(cand, 'finish_reason') and 'SAFETY' in str(cand.finish_reason):
+                raise ValueError("Model Safety Filter Triggered")
 # --- END FEATURE: gemini_engine ---
 
 # ============================================================
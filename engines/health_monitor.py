@@ -0,0 +1,197 @@
+"""
+Health Monitor — yerel ajanlar ve Gemini icin paralel, onbellekli saglik kontrolu.
+
+config.json:
+    "health_check": {"interval": 600, "timeout": 60, "max_workers": 4,
+                     "startup_delay": 30, "max_age": 900}
+"""
+
+import math
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.metrics import REGISTRY
+
+# --- FEATURE: health_monitor ---
+AGENT_HEALTH = REGISTRY.gauge(
+    "jarvis_agent_health",
+    "Son saglik kontrolu (1 = OK/IDLE, 0 = FAIL).",
+    ("agent",),
+)
+HEALTH_CHECK_SECONDS = REGISTRY.gauge(
+    "jarvis_health_check_seconds",
+    "Son saglik taramasinin toplam suresi (saniye).",
+    ("mode",),
+)
+
+
+class HealthMonitor:
+    DEFAULTS = {
+        "interval": 600,       # Arka plan hafif kontrol araligi (0 = kapali)
+        "timeout": 60,         # Model basina (soguk yukleme dahil)
+        "max_workers": 4,
+        "startup_delay": 30,   # Acilista motorlarin isinmasina pay
+        "max_age": 900,        # Bundan eski sonuclar okunurken arka planda yenilenir
+    }
+
+    def __init__(self, manager, settings=None):
+        self.manager = manager
+        settings = settings or manager.settings
+        self.config = dict(self.DEFAULTS, **(settings.get("health_check", {}) or {}))
+        self._results = {}          # anahtar -> sonuc dict'i (+ checked_at)
+        self._lock = threading.Lock()
+        self._workers = max(1, int(self.config["max_workers"]))
+        self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="health")
+        self._refresh_thread = None
+        self._refresh_deep = False
+        self._loop_thread = None
+        self.last_run = None
+
+    # ==================== KONTROLLER ====================
+
+    def _checks(self, deep):
+        """Aktif moda gore [(anahtar, cagrilabilir)]. Baglanti kontrolu basarisizsa tek FAIL satiri."""
+        timeout = self.config["timeout"]
+        if self.manager.mode == "api":
+            def gemini():
+                res = self.manager.gemini.test_connection()
+                return {
+                    "agent": "GEMINI CLOUD",
+                    "model": res.get("model", "Unknown"),
+                    "status": res.get("status", "FAIL"),
+                    "msg": res.get("msg", ""),
+                    "time": res.get("time", ""),
+                    "response": res.get("response", ""),
+                }
+            return [("api:gemini", gemini)]
+
+        brain = self.manager.local_brain
+        try:
+            installed, resident = brain.check_connection()
+        except Exception as e:
+            from engines.ollama_client import get_ollama
+            failed = {"agent": "OLLAMA BAĞLANTISI", "model": ", ".join(get_ollama().hosts),
+                      "status": "FAIL", "msg": str(e)}
+            return [("local:ollama", lambda: failed)]
+
+        return [
+            (f"local:{role}",
+             lambda role=role, model=model: brain.check_agent(role, model, deep=deep, timeout=timeout,
+                                                              installed=installed, resident=resident))
+            for role, model in brain.health_targets()
+        ]
+
+    def _run(self, deep):
+        start = time.time()
+        mode = self.manager.mode
+        try:
+            checks = self._checks(deep)
+        except Exception as e:
+            checks = [(f"{mode}:error", lambda e=e: {"agent": "SERVER ERROR", "status": "FAIL", "msg": str(e)})]
+
+        futures = [(key, self._pool.submit(fn)) for key, fn in checks]
+        # Kuyrukta bekleyenler icin de sure: her dalga bir timeout
+        waves = math.ceil(len(futures) / self._workers) or 1
+        deadline = time.time() + self.config["timeout"] * waves + 5
+        keys = []
+        for key, future in futures:
+            try:
+                result = future.result(timeout=max(0.0, deadline - time.time()))
+            except Exception as e:
+                label = key.split(":", 1)[1].upper()
+                message = f"Zaman asimi ({self.config['timeout']}s)" if not str(e) else str(e)
+                result = {"agent": label, "model": "", "status": "FAIL", "time": "N/A", "response": message}
+            result["checked_at"] = time.time()
+            result["deep"] = deep
+            keys.append(key)
+            AGENT_HEALTH.set(0 if result.get("status") == "FAIL" else 1, agent=result.get("agent", key))
+            with self._lock:
+                self._results[key] = result
+
+        with self._lock:
+            # Kaldirilan ajanlarin eski satirlari raporda kalmasin
+            for key in [k for k in self._results if k.startswith(f"{mode}:") and k not in keys]:
+                del self._results[key]
+        self.last_run = time.time()
+        HEALTH_CHECK_SECONDS.set(self.last_run - start, mode=mode)
+        try: print(f"Saglik kontrolu ({'derin' if deep else 'hafif'}, {len(keys)} kontrol): "
+                   f"{self.last_run - start:.2f}s")
+        except: pass
+
+    # ==================== API ====================
+
+    def refresh(self, deep=False, wait=False):
+        """
+        Tarama baslat; zaten calisiyorsa ona katil. Derin istek hafif bir taramaya denk gelirse
+        o bittikten sonra derin tarama baslatilir. wait=True: bitene kadar bekle.
+        """
+        while True:
+            with self._lock:
+                thread = self._refresh_thread
+                if thread is None or not thread.is_alive():
+                    thread = threading.Thread(target=self._run, args=(deep,), name="health-refresh", daemon=True)
+                    self._refresh_thread, self._refresh_deep = thread, deep
+                    thread.start()
+                    break
+                if self._refresh_deep or not deep:
+                    break
+            thread.join()
+        if wait:
+            thread.join()
+        return thread
+
+    def is_refreshing(self):
+        thread = self._refresh_thread
+        return thread is not None and thread.is_alive()
+
+    def status(self):
+        """Aktif modun son sonuclari, aninda. Hic kontrol yoksa ya da eskiyse arka planda yenilenir."""
+        mode = self.manager.mode
+        now = time.time()
+        with self._lock:
+            results = [dict(r) for k, r in self._results.items() if k.startswith(f"{mode}:")]
+        for r in results:
+            r["age"] = round(now - r["checked_at"], 1)
+
+        stale = not results or any(r["age"] > self.config["max_age"] for r in results)
+        if stale and not self.is_refreshing():
+            self.refresh(deep=False)
+        if not results:
+            return [{"agent": "SAGLIK KONTROLU", "model": "", "status": "PENDING",
+                     "response": "Kontrol arka planda suruyor, birazdan tekrar deneyin"}]
+        return results
+
+    def start(self):
+        """Arka plan dongusu: startup_delay sonra ilk tarama, ardindan her interval saniyede bir."""
+        interval = self.config["interval"]
+        if not interval or interval <= 0 or self._loop_thread is not None:
+            return None
+
+        def _loop():
+            time.sleep(self.config["startup_delay"])
+            while True:
+                try:
+                    self.refresh(deep=False, wait=True)
+                except Exception as e:
+                    try: print(f"Saglik kontrolu hatasi: {e}")
+                    except: pass
+                time.sleep(interval)
+
+        self._loop_thread = threading.Thread(target=_loop, name="health-monitor", daemon=True)
+        self._loop_thread.start()
+        return self._loop_thread
+# --- END FEATURE: health_monitor ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
@@ -0,0 +1,224 @@
+"""
+Intent Classifier — komutan LLM'inin onunde hizli yerel niyet siniflandiricisi.
+Karakter n-gram + kelime ozellikleri uzerinde cok sinifli lojistik regresyon (saf Python).
+data/intent_examples.json'daki etiketli orneklerden egitilir; tahmin < 1 ms.
+Guven esigin altindaysa None doner ve LocalBrain komutan LLM'ine (phi4-mini) duser.
+
+Ayarlar (config.json "intent_classifier", hepsi opsiyonel):
+    enabled, threshold, context_threshold, examples, model_path,
+    epochs, learning_rate, l2
+"""
+
+import os
+import json
+import math
+import random
+import hashlib
+import threading
+
+from utils.embeddings import normalize_text
+
+# --- FEATURE: intent_classifier ---
+class IntentClassifier:
+    DEFAULTS = {
+        "enabled": True,
+        # 5-katli CV (tools/eval_intent_classifier.py): 0.85 esikte ~%37 kapsama, ~%97 dogruluk
+        "threshold": 0.85,          # Bu guvenin altinda LLM komutana sorulur
+        "context_threshold": 0.95,  # Onceki sohbet baglami varken (takip sorusu olabilir) daha siki
+        "examples": "data/intent_examples.json",
+        "model_path": "data/models/intent_classifier.json",
+        "epochs": 40,
+        "learning_rate": 2.0,
+        "l2": 0.0,
+    }
+
+    def __init__(self, settings=None, config=None):
+        cfg = dict(self.DEFAULTS)
+        if settings:
+            cfg.update(settings.get("intent_classifier", {}) or {})
+        if config:
+            cfg.update(config)
+        self.config = cfg
+        self.enabled = bool(cfg["enabled"])
+        self.threshold = float(cfg["threshold"])
+        self.context_threshold = float(cfg["context_threshold"])
+
+        self.labels = []
+        self.weights = {}   # ozellik -> [sinif agirliklari]
+        self.bias = []
+        self.ready = False
+        self._lock = threading.Lock()
+
+    # ==================== OZELLIKLER ====================
+
+    @staticmethod
+    def features(text):
+        """Kelime unigram/bigram + kelime sinirli 2-4 karakter n-gramlari. Rakamlar '0'a katlanir."""
+        norm = normalize_text(text)
+        norm = "".join("0" if ch.isdigit() else ch for ch in norm)
+        words = norm.split()
+        feats = set()
+        for i, w in enumerate(words):
+            feats.add("w:" + w)
+            if i + 1 < len(words):
+                feats.add("b:" + w + "_" + words[i + 1])
+        padded = f" {norm} "
+        for n in (2, 3, 4):
+            for i in range(len(padded) - n + 1):
+                feats.add("c:" + padded[i:i + n])
+        return feats
+
+    # ==================== EGITIM ====================
+
+    @staticmethod
+    def load_examples(path):
+        """{"INTENT": ["ornek", ...]} -> [(metin, intent), ...]"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return [(text, label) for label, texts in data.items() for text in texts]
+
+    def _fingerprint(self, examples):
+        keys = ("epochs", "learning_rate", "l2")
+        payload = json.dumps([sorted(examples), [self.config[k] for k in keys]], ensure_ascii=False)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def fit(self, examples, seed=13):
+        """Softmax regresyon, seyrek SGD (sadece ornekteki ozellikler guncellenir)."""
+        labels = sorted({label for _, label in examples})
+        index = {label: i for i, label in enumerate(labels)}
+        k = len(labels)
+        data = [(list(self.features(text)), index[label]) for text, label in examples]
+
+        weights = {}
+        bias = [0.0] * k
+        lr0 = float(self.config["learning_rate"])
+        l2 = float(self.config["l2"])
+        rng = random.Random(seed)
+        epochs = int(self.config["epochs"])
+
+        for epoch in range(epochs):
+            rng.shuffle(data)
+            lr = lr0 / (1 + epoch * 0.1)
+            for feats, y in data:
+                scale = 1.0 / math.sqrt(len(feats) or 1)
+                probs = self._softmax(self._scores(weights, bias, feats, scale, k))
+                probs[y] -= 1.0  # gradyan: p - onehot
+                for f in feats:
+                    row = weights.get(f)
+                    if row is None:
+                        row = weights[f] = [0.0] * k
+                    for c in range(k):
+                        row[c] -= lr * (probs[c] * scale + l2 * row[c])
+                for c in range(k):
+                    bias[c] -= lr * probs[c]
+
+        with self._lock:
+            self.labels, self.weights, self.bias = labels, weights, bias
+            self.ready = True
+        return self
+
+    @staticmethod
+    def _scores(weights, bias, feats, scale, k):
+        scores = list(bias)
+        for f in feats:
+            row = weights.get(f)
+            if row is not None:
+                for c in range(k):
+                    scores[c] += row[c] * scale
+        return scores
+
+    @staticmethod
+    def _softmax(scores):
+        top = max(scores)
+        exps = [math.exp(s - top) for s in scores]
+        total = sum(exps)
+        return [e / total for e in exps]
+
+    # ==================== KAYIT / YUKLEME ====================
+
+    def save(self, path, fingerprint):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "labels": self.labels,
+                       "bias": self.bias, "weights": self.weights}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def load(self, path, fingerprint):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("fingerprint") != fingerprint:
+            return False
+        with self._lock:
+            self.labels, self.bias, self.weights = data["labels"], data["bias"], data["weights"]
+            self.ready = True
+        return True
+
+    def prepare(self, background=True):
+        """Kayitli modeli yukle; ornekler/ayarlar degistiyse yeniden egit (varsayilan: arka planda)."""
+        if not self.enabled:
+            return
+
+        def _train():
+            try:
+                examples = self.load_examples(self.config["examples"])
+                fingerprint = self._fingerprint(examples)
+                if self.load(self.config["model_path"], fingerprint):
+                    return
+                self.fit(examples)
+                self.save(self.config["model_path"], fingerprint)
+                try: print(f"INTENT CLASSIFIER egitildi ({len(examples)} ornek, {len(self.labels)} sinif)")
+                except: pass
+            except Exception as e:
+                try: print(f"Intent Classifier Error: {e}")
+                except: pass
+
+        if background:
+            threading.Thread(target=_train, daemon=True).start()
+        else:
+            _train()
+
+    # ==================== TAHMIN ====================
+
+    def predict_proba(self, text):
+        with self._lock:
+            labels, weights, bias = self.labels, self.weights, self.bias
+        if not labels:
+            return {}
+        feats = self.features(text)
+        scale = 1.0 / math.sqrt(len(feats) or 1)
+        probs = self._softmax(self._scores(weights, bias, feats, scale, len(labels)))
+        return dict(zip(labels, probs))
+
+    def predict(self, text, context_hint=""):
+        """(intent, guven) veya guven esigin altindaysa (None, guven)."""
+        if not self.enabled or not self.ready:
+            return None, 0.0
+        probs = self.predict_proba(text)
+        if not probs:
+            return None, 0.0
+        intent = max(probs, key=probs.get)
+        confidence = probs[intent]
+        threshold = self.context_threshold if context_hint else self.threshold
+        if confidence < threshold:
+            return None, confidence
+        return intent, confidence
+# --- END FEATURE: intent_classifier ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
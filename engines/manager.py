@@ -1,46 +1,110 @@
-from .gemini_engine import GeminiEngine
-from .ollama_engine import OllamaEngine
-from .local_brain import LocalBrain
-from .system_tools import SystemManager, WebTools, ScreenTools
-# Image generation disabled - no longer importing ImageGenerator
-# from .image_generator import ImageGenerator
+# Agir motorlar (google.genai, PIL, pyautogui, Whisper...) ilk kullanimda yuklenir:
+# server.py import edilirken sadece ayarlar okunur, port hemen acilir.
 from utils.settings_manager import SettingsManager
-from utils.voice_manager import VoiceManager
-from engines.task_manager import TaskManager
-from PIL import Image
+from utils.service_container import ServiceContainer
 import threading
 import time
 
-from utils.memory_manager import MemoryManager
+from utils.progress_hub import emit_stage
 
 # --- FEATURE: engine_manager ---
 class EngineManager:
     def __init__(self):
         self.settings = SettingsManager()
-        self.sys_manager = SystemManager()
-        self.web_tools = WebTools()
         
+        # Internal mode state (defaults to settings, but can be overridden at runtime)
+        self.mode = self.settings.get("engine_mode")
+        
+        # Alt sistemler tembel: ilk eristikte ya da warm_up() ile arka planda kurulur.
+        # Siralama = isinma sirasi (aktif motor once).
+        self.services = ServiceContainer()
+        if self.mode == "local":
+            self.services.register("local_brain", self._build_local_brain)
+        self.services.register("memory", self._build_memory)
+        self.services.register("response_cache", self._build_response_cache)
+        self.services.register("gemini", self._build_gemini)
+        self.services.register("ollama", self._build_ollama)
+        if self.mode != "local":
+            self.services.register("local_brain", self._build_local_brain)
+        self.services.register("task_manager", self._build_task_manager)
+        self.services.register("sys_manager", self._build_sys_manager)
+        self.services.register("web_tools", self._build_web_tools)
+        # Ses kapaliysa ElevenLabs/yerel ses motoru ilk konusmaya kadar yuklenmez
+        self.services.register("voice", self._build_voice, warm=bool(self.settings.get("audio_enabled", False)))
+        self.services.register("health", self._build_health, warm=False)
+        self.services.register("research", self._build_research, warm=False)
+
+    def warm_up(self, background=True):
+        return self.services.warm_up(background=background)
+
+    # ==================== SERVIS FABRIKALARI ====================
+
+    def _build_sys_manager(self):
+        from .system_tools import SystemManager
+        return SystemManager()
+
+    def _build_web_tools(self):
+        from .system_tools import WebTools
+        return WebTools()
+
+    def _build_voice(self):
         # Audio Manager (ElevenLabs)
-        self.voice = VoiceManager()
+        from utils.voice_manager import VoiceManager
+        voice = VoiceManager()
         # Initial setting load
-        self.voice.set_enabled(self.settings.get("audio_enabled", False))
+        voice.set_enabled(self.settings.get("audio_enabled", False))
         
         saved_voice_id = self.settings.get("elevenlabs_voice_id")
         if saved_voice_id:
-            self.voice.set_voice_id(saved_voice_id)
-        
+            voice.set_voice_id(saved_voice_id)
+        return voice
+
+    def _build_research(self):
+        from .research_pipeline import ResearchPipeline
+        return ResearchPipeline(self.web_tools, self.settings)
+
+    def _build_health(self):
+        from .health_monitor import HealthMonitor
+        return HealthMonitor(self, self.settings)
+
+    def _build_task_manager(self):
         # System Engineer Task Manager
-        self.task_manager = TaskManager()
-        
-        self.memory = MemoryManager()
-        
-        # Init Engines
-        self.gemini = GeminiEngine(self.settings.get("gemini_api_key"), self.settings.get("api_mode"))
-        self.ollama = OllamaEngine(self.settings.get("local_models")["chat"])
-        self.local_brain = LocalBrain() # Multi-Agent Brain
-        
-        # Internal mode state (defaults to settings, but can be overridden at runtime)
-        self.mode = self.settings.get("engine_mode")
+        from engines.task_manager import TaskManager
+        return TaskManager()
+
+    def _build_memory(self):
+        # Paylasimli depo: yerel sohbet ajani da ayni RAM kopyasini okur
+        from utils.memory_manager import get_memory
+        return get_memory()
+
+    def _build_response_cache(self):
+        # Tekrarlanan/benzer sorular icin cevap onbellegi (exact + semantic)
+        from utils.response_cache import ResponseCache
+        return ResponseCache(self.settings)
+
+    def _build_gemini(self):
+        from .gemini_engine import GeminiEngine
+        return GeminiEngine(self.settings.get("gemini_api_key"), self.settings.get("api_mode"))
+
+    def _build_ollama(self):
+        from .ollama_engine import OllamaEngine
+        return OllamaEngine(self.settings.get("local_models")["chat"])
+
+    def _build_local_brain(self):
+        from .local_brain import LocalBrain
+        return LocalBrain() # Multi-Agent Brain
+
+    sys_manager = property(lambda self: self.services.get("sys_manager"))
+    web_tools = property(lambda self: self.services.get("web_tools"))
+    voice = property(lambda self: self.services.get("voice"))
+    task_manager = property(lambda self: self.services.get("task_manager"))
+    memory = property(lambda self: self.services.get("memory"))
+    response_cache = property(lambda self: self.services.get("response_cache"))
+    gemini = property(lambda self: self.services.get("gemini"))
+    ollama = property(lambda self: self.services.get("ollama"))
+    local_brain = property(lambda self: self.services.get("local_brain"))
+    health = property(lambda self: self.services.get("health"))
+    research = property(lambda self: self.services.get("research"))
 
     def set_execution_mode(self, mode: str):
         """Sets the execution mode (api/local) dynamically without saving to config permanently yet.
@@ -80,7 +144,20 @@ class EngineManager:
         else:
             pass # Muted
 
+    def _cache_model(self):
+        """Onbellek anahtarindaki model kimligi: mod degisince eski cevaplar eslesmez."""
+        if self.mode == "api":
+            return f"api:{self.gemini.primary_model_name}"
+        return f"local:{self.local_brain.agents.get('chat', '')}"
+
     def chat_mode(self, message, history=None, progress_callback=None):
+        return "".join(self.chat_mode_stream(message, history=history, progress_callback=progress_callback))
+
+    def chat_mode_stream(self, message, history=None, progress_callback=None):
+        """
+        chat_mode'un akis versiyonu: cevap parcalarini model urettikce yield eder.
+        Hafiza kaydi ve TTS, akis bittikten sonra tam cevap uzerinden yapilir.
+        """
         # Tum routing kararlarini KOMUTAN (LLM) verir.
         # Keyword-based interception KALDIRILDI — cunku yanlış yonlendirmelere neden oluyordu.
         # Ornek: "YouTube kac yilinda kuruldu" → BROWSER'a gidiyordu (yanlis), CHAT olmali.
@@ -88,37 +165,61 @@ class EngineManager:
         # Scan Input for Memory
         # (This is a simplified approach, ideally handled async)
         
-        # Retrieval
-        memory_context = self.memory.get_context()
+        # Retrieval (sadece bu istege en ilgili kayitlar)
+        memory_context = self.memory.get_context(message)
+        cloud_profile = self.memory.get_cloud_context(message) if self.mode != "local" else ""
+        # Cevap hafizaya bagli olabilir: hafiza degisince eski cevaplar eslesmesin
+        cache_context = f"{memory_context}\n{cloud_profile}"
+        
+        # Onbellek: ayni/benzer soru daha once cevaplandiysa komutan + model turunu atla
+        cache_model = self._cache_model()
+        cached = self.response_cache.lookup(message, history=history, model=cache_model, context=cache_context)
+        if cached:
+            emit_stage(progress_callback, "cache_hit", f"Onbellekten ({cached['tier']})")
+            response = cached["answer"]
+            yield response
+            yield f"\n\n------------\n[Onbellek: {cached['tier']}]"
+            self.memory.remember(message, response)
+            self.speak(response)
+            return
+        
         sys_context = ""
         if memory_context:
             sys_context = f"\n[HAFIZA BİLGİSİ]: {memory_context}\n"
         
-        response = ""
+        chunks = []
         
         # Use LocalBrain if mode is local
         if self.mode == "local":
             try:
                 # Hafiza bilgisi artik sadece chat ajaninda enjekte ediliyor.
                 # Komutana gereksiz hafiza bilgisi gondermek sınıflandırmayı bozuyor.
-                response = self.local_brain.process_request(message, history=history, progress_callback=progress_callback, memory_context=memory_context)
+                trace = {}
+                for chunk in self.local_brain.process_request_stream(message, history=history, progress_callback=progress_callback, memory_context=memory_context, trace=trace):
+                    if chunk:
+                        chunks.append(chunk)
+                        yield chunk
                 
                 # Check for empty response
-                if not response:
-                    response = "Üzgünüm, yerel beyinden boş cevap döndü."
+                if not chunks:
+                    chunks.append("Üzgünüm, yerel beyinden boş cevap döndü.")
+                    yield chunks[-1]
 
                 # Save
-                self.memory.remember(message, response)
+                self.memory.remember(message, "".join(chunks))
+                self.response_cache.store(message, "".join(chunks), trace.get("intent"), history=history,
+                                          model=cache_model, context=cache_context)
             except Exception as e:
                 print(f"Manager Local Error: {e}")
-                response = f"Genel Merkez Hatasi: {e}"
+                chunks.append(f"Genel Merkez Hatasi: {e}")
+                yield chunks[-1]
         else:
             # Cloud (Gemini) — Gelişmiş Kişiselleştirme
             try:
                 engine = self.get_active_engine()
+                emit_stage(progress_callback, "cloud", "Bulut modeline gonderiliyor...")
                 
-                # Gelişmiş profil context'i al
-                cloud_profile = self.memory.get_cloud_context()
+                # Gelişmiş profil context'i (yukarida alindi)
                 if cloud_profile:
                     sys_context = f"\n{cloud_profile}\n"
                 
@@ -137,7 +238,11 @@ class EngineManager:
                         role = 'user' if msg['role'] == 'user' else 'model'
                         gemini_history.append({'role': role, 'parts': [{'text': msg['text']}]})
                 
-                response = engine.generate_response(message, system_instruction=sys, history=gemini_history)
+                for chunk in engine.generate_stream(message, system_instruction=sys, history=gemini_history):
+                    if chunk:
+                        chunks.append(chunk)
+                        yield chunk
+                response = "".join(chunks)
                 
                 # Arka planda kişisel bilgi çıkarımı (cevabı geciktirmez)
                 if hasattr(engine, 'client') and engine.client:
@@ -149,19 +254,27 @@ class EngineManager:
                 
                 # Eski yerel hafıza da kaydetsin (geriye uyumluluk)
                 self.memory.remember(message, response)
+                self.response_cache.store(message, response, "CLOUD", history=history, model=cache_model,
+                                          context=cache_context)
             except Exception as e:
-                response = f"Cloud Error: {e}"
+                chunks.append(f"Cloud Error: {e}")
+                yield chunks[-1]
         
         # --- TTS INTEGRATION ---
         # Only speak if valid response
+        response = "".join(chunks)
         if response and isinstance(response, str):
+            if self.settings.get("audio_enabled", False):
+                emit_stage(progress_callback, "tts", "Seslendiriliyor...")
             self.speak(response)
-            
-        return response
 
 
 
     def research_mode(self, message):
+        return "".join(self.research_mode_stream(message))
+
+    def research_mode_stream(self, message):
+        """Yerel modda kaynaklar paralel okunur; ozetler geldikce, ardindan birlesik cevap akar."""
         engine = self.get_active_engine()
         query = message.replace("/a", "").replace("araştır", "").strip()
 
@@ -171,24 +284,17 @@ class EngineManager:
                 system_instruction="Sen bir araştırmacısın. Güncel verileri kullan.",
                 use_search=True
             )
-            return response
+            yield response
         else:
-            results = self.web_tools.search(query)
-            if not results: return "Internetten veri alinamadi."
-            
-            context = ""
-            for i, r in enumerate(results[:3]):
-                raw = self.web_tools.read_url(r['href'])
-                if raw: context += f"\nKAYNAK {i+1}: {r['title']}\n{raw[:1000]}\n"
-            
-            prompt = f"SORU: {query}\nVERİLER: {context}\n\nBu verilere göre soruyu cevapla:"
-            return engine.generate_response(prompt)
+            yield from self.research.run_stream(query, engine)
 
     def vision_mode(self, message):
         engine = self.get_active_engine()
+        from .system_tools import ScreenTools
         path = ScreenTools.take_screenshot()
         if not path: return "Ekran alınamadı."
         try:
+            from PIL import Image
             img = Image.open(path)
             return engine.generate_response(message or "Ne görüyorsun?", images=[img])
         except Exception as e:
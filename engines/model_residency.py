@@ -0,0 +1,230 @@
+"""
+Model Residency — ajan modellerinin RAM'de kalma politikasi (sabit roller, RAM butcesi, LRU bosaltma,
+seyrek rolleri yuklu modele yonlendirme). OllamaPool.chat() her cagrida prepare() cagirir.
+
+config.json:
+    "model_residency": {"enabled": true, "ram_budget_gb": 12, "pinned_roles": ["commander", "chat"],
+                        "substitutes": {"math": "chat", "analyst": "chat"}, "rare_share": 0.1}
+"""
+
+import time
+import threading
+from collections import OrderedDict, deque
+
+from utils.metrics import REGISTRY
+
+# --- FEATURE: model_residency ---
+RESIDENCY_DECISIONS = REGISTRY.counter(
+    "jarvis_model_residency_total",
+    "Model yerlesim kararlari (decision: resident/load/evict/substitute/over_budget).",
+    ("decision", "role"),
+)
+RESIDENT_MODELS = REGISTRY.gauge("jarvis_models_resident", "Ollama'da yuklu model sayisi.")
+RESIDENT_BYTES = REGISTRY.gauge("jarvis_models_resident_bytes", "Yuklu modellerin toplam RAM/VRAM boyutu.")
+
+
+def model_key(name):
+    """Etiketsiz ad Ollama'daki gibi ":latest" alir: "phi4-mini" -> "phi4-mini:latest"."""
+    return name if ":" in name else f"{name}:latest"
+
+
+class ModelResidencyManager:
+    DEFAULTS = {
+        "enabled": True,
+        "ram_budget_gb": None,      # None: toplam RAM'in %60'i
+        "pinned_roles": ["commander", "chat"],
+        # Seyrek rol -> yerine kullanilabilecek rol (vision rolleri goruntu destegi gerektirir, eslenmez)
+        "substitutes": {"math": "chat", "analyst": "chat", "lead_dev": "system_engineer",
+                        "browser_planner": "system_engineer"},
+        "rare_share": 0.1,          # Son kullanimlarin bu oranindan azsa rol "seyrek" sayilir
+        "window": 50,
+        "ps_ttl": 5,                # /api/ps sonucu bu kadar saniye onbelleklenir
+        "load_overhead": 1.2,       # Diskteki boyut -> tahmini RAM (KV cache vb.)
+    }
+
+    def __init__(self, pool, settings=None, config=None):
+        cfg = dict(self.DEFAULTS)
+        if settings:
+            cfg.update(settings.get("model_residency", {}) or {})
+        if config:
+            cfg.update(config)
+        self.config = cfg
+        self.pool = pool
+        self.enabled = bool(cfg["enabled"])
+        self.pinned_roles = set(cfg["pinned_roles"])
+        self.substitutes = dict(cfg["substitutes"] or {})
+        self.rare_share = float(cfg["rare_share"])
+        self.budget = self._budget_bytes(cfg["ram_budget_gb"])
+
+        self.role_models = dict((settings.get("local_agents", {}) if settings else {}) or {})
+        self._recent_roles = deque(maxlen=int(cfg["window"]))
+        self._lru = OrderedDict()      # model_key -> son kullanim zamani
+        self._loaded = {}              # model_key -> boyut (bayt), /api/ps
+        self._loaded_at = 0
+        self._disk_sizes = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _budget_bytes(gb):
+        if gb:
+            return int(float(gb) * 1024 ** 3)
+        try:
+            import psutil
+            return int(psutil.virtual_memory().total * 0.6)
+        except Exception:
+            return 8 * 1024 ** 3
+
+    # ==================== DURUM ====================
+
+    def pinned_models(self):
+        return {model_key(self.role_models[r]) for r in self.pinned_roles if self.role_models.get(r)}
+
+    def loaded(self, refresh=False):
+        """{model: boyut} — /api/ps, kisa sureli onbellekli. Ag cagrisi kilit disinda yapilir."""
+        with self._lock:
+            stale = refresh or time.time() - self._loaded_at > self.config["ps_ttl"]
+        if stale:
+            try:
+                response = self.pool.ps()
+                fresh = {model_key(m.model): int(m.size or 0) for m in response.models}
+            except Exception as e:
+                fresh = None
+                try: print(f"Model Residency: /api/ps okunamadi: {e}")
+                except: pass
+            with self._lock:
+                if fresh is not None:
+                    self._loaded = fresh
+                self._loaded_at = time.time()
+                for model in self._loaded:
+                    self._lru.setdefault(model, 0)
+                RESIDENT_MODELS.set(len(self._loaded))
+                RESIDENT_BYTES.set(sum(self._loaded.values()))
+        with self._lock:
+            return dict(self._loaded)
+
+    def _disk_size(self, key):
+        """Diskteki boyut (/api/tags, ilk ihtiyacta bir kez; kilit disinda)."""
+        if not self._disk_sizes:
+            try:
+                sizes = {model_key(m.model): int(m.size or 0) for m in self.pool.list().models}
+            except Exception:
+                sizes = {}
+            with self._lock:
+                self._disk_sizes.update(sizes)
+        return self._disk_sizes.get(key, 0)
+
+    def _is_rare(self, role):
+        if not self._recent_roles:
+            return False
+        share = sum(1 for r in self._recent_roles if r == role) / len(self._recent_roles)
+        return share < self.rare_share
+
+    # ==================== KARAR ====================
+
+    def keep_alive_for(self, role, model):
+        """Sabit modeller hic bosaltilmaz; digerleri havuzun rol politikasini kullanir."""
+        if role in self.pinned_roles or (model and model_key(model) in self.pinned_models()):
+            return -1
+        return None
+
+    def prepare(self, role, model):
+        """Cagri oncesi: kullanilacak modeli dondurur, gerekirse yer acar.
+        Kilit sadece karar ve durum guncellemesi icin tutulur; /api/ps, /api/tags ve bosaltma
+        istekleri kilit disinda yapilir (diger ajanlarin cagrilari bir HTTP turu beklemez)."""
+        if not self.enabled or not model:
+            return model
+        with self._lock:
+            if role:
+                self.role_models.setdefault(role, model)
+                self._recent_roles.append(role)
+        loaded = self.loaded()
+        key = model_key(model)
+        disk_size = 0 if key in loaded else self._disk_size(key)
+
+        with self._lock:
+            # Snapshot'tan bu yana baska bir cagri yuklemis / bosaltmis olabilir
+            loaded = dict(self._loaded)
+            if key in loaded:
+                self._touch(key)
+                RESIDENCY_DECISIONS.inc(decision="resident", role=role or "-")
+                return model
+
+            needed = int(disk_size * self.config["load_overhead"])
+            fits = sum(loaded.values()) + needed <= self.budget
+
+            # Butceye sigmiyor ve rol seyrek: zaten yuklu yedek modeli kullan
+            substitute = self.role_models.get(self.substitutes.get(role))
+            if not fits and substitute and model_key(substitute) in loaded and self._is_rare(role):
+                self._touch(model_key(substitute))
+                RESIDENCY_DECISIONS.inc(decision="substitute", role=role or "-")
+                try: print(f"Model Residency: {role} -> {substitute} (yuklu, {model} yuklenmedi)")
+                except: pass
+                return substitute
+
+            victims = [] if fits else self._pick_evictions(needed, loaded, role)
+            self._touch(key)
+            self._loaded[key] = needed
+            RESIDENCY_DECISIONS.inc(decision="load", role=role or "-")
+
+        for victim, size in victims:
+            if not self._unload(victim):
+                # Bosaltilamadi: bir sonraki /api/ps okumasina kadar yuklu say
+                with self._lock:
+                    self._loaded.setdefault(victim, size)
+        return model
+
+    def _touch(self, model):
+        self._lru[model] = time.time()
+        self._lru.move_to_end(model)
+
+    def _pick_evictions(self, needed, loaded, role):
+        """Sabit olmayan yuklu modelleri en eski kullanilandan baslayarak sec (kilit altinda).
+        Secilenler durumdan hemen dusulur; bosaltma istegini cagiran kilit disinda yapar."""
+        pinned = self.pinned_models()
+        used = sum(loaded.values())
+        victims = []
+        for model in sorted(loaded, key=lambda m: self._lru.get(m, 0)):
+            if used + needed <= self.budget:
+                break
+            if model in pinned:
+                continue
+            used -= loaded[model]
+            victims.append((model, loaded[model]))
+            self._loaded.pop(model, None)
+            self._lru.pop(model, None)
+            RESIDENCY_DECISIONS.inc(decision="evict", role=role or "-")
+        if used + needed > self.budget:
+            # Sabit modeller yuzunden yer acilamadi; Ollama kendi politikasiyla yukler
+            RESIDENCY_DECISIONS.inc(decision="over_budget", role=role or "-")
+        return victims
+
+    def _unload(self, model):
+        try:
+            self.pool.client().generate(model=model, keep_alive=0)
+            try: print(f"Model Residency: {model} bellekten bosaltildi")
+            except: pass
+            return True
+        except Exception as e:
+            try: print(f"Model Residency: {model} bosaltilamadi: {e}")
+            except: pass
+            return False
+
+    def stats(self):
+        loaded = self.loaded()
+        with self._lock:
+            return {"budget_bytes": self.budget, "loaded": loaded,
+                    "pinned": sorted(self.pinned_models()), "lru": list(self._lru)}
+# --- END FEATURE: model_residency ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
@@ -0,0 +1,307 @@
+"""
+Ollama Client — tum ajanlarin kullandigi ortak, havuzlu Ollama istemcisi.
+- Host basina tek httpx baglanti havuzu (keep-alive), her cagrida yeni TCP baglantisi yok
+- Ajan rolune gore timeout ve keep_alive politikasi (model bosaltma/yukleme churn'u biter)
+- Birden fazla Ollama host'u: model yakinligi + en az mesgul host, baglanti hatasinda failover
+- web_search / web_fetch icin ayri (ollama.com) istemci
+
+Ayarlar (config.json "ollama", hepsi opsiyonel):
+    "ollama": {
+        "hosts": ["http://127.0.0.1:11434", "http://192.168.1.20:11434"],
+        "timeout": {"connect": 5, "read": 300},
+        "timeouts": {"commander": {"read": 30}},
+        "keep_alive": {"default": "10m", "commander": "1h", "chat": "30m"},
+        "model_hosts": {"qwen3.5:9b": ["http://192.168.1.20:11434"]},
+        "max_connections": 8,
+        "web_host": "https://ollama.com"
+    }
+OLLAMA_HOST / OLLAMA_WEB_HOST ortam degiskenleri (ornegin tools/fake_ollama.py ile) ayari yoksa kullanilir.
+Kullanim:
+    from engines.ollama_client import get_ollama
+    get_ollama().chat(model=m, messages=msgs, role="commander")
+"""
+
+import os
+import time
+import zlib
+import socket
+import threading
+
+import httpx
+import httpcore
+import ollama
+
+# --- FEATURE: ollama_client ---
+DEFAULT_HOST = "http://127.0.0.1:11434"
+DEFAULT_WEB_HOST = "https://ollama.com"
+
+
+class CancelToken(httpcore.SyncBackend):
+    """
+    Iptal edilebilir akis: chat(stream=True, cancel=token) bu token'in ag katmaniyla ayri bir
+    baglanti acar. cancel() soketi shutdown eder; ilk parcadan once (soguk model yuklenirken)
+    bloklu okuma da aninda kesilir ve Ollama istegi iptal ederek slotu birakir.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._streams = []
+        self._lock = threading.Lock()
+
+    def connect_tcp(self, *args, **kwargs):
+        stream = super().connect_tcp(*args, **kwargs)
+        with self._lock:
+            self._streams.append(stream)
+            cancelled = self.cancelled
+        if cancelled:
+            self._shutdown(stream)
+        return stream
+
+    @staticmethod
+    def _shutdown(stream):
+        try: stream.get_extra_info("socket").shutdown(socket.SHUT_RDWR)
+        except (OSError, AttributeError): pass
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            streams = list(self._streams)
+        for stream in streams:
+            self._shutdown(stream)
+
+    def client(self, host, timeout):
+        transport = httpx.HTTPTransport()
+        # httpx ag katmanini disaridan almiyor; havuzun soket acicisi bu token olur
+        transport._pool._network_backend = self
+        return ollama.Client(host=host, timeout=httpx.Timeout(timeout[1], connect=timeout[0]), transport=transport)
+
+
+class OllamaPool:
+    """Host havuzu + rol politikalari. Thread-safe; tek ornek get_ollama() ile paylasilir."""
+
+    DEFAULT_TIMEOUT = {"connect": 5.0, "read": 300.0}
+    DEFAULT_ROLE_TIMEOUTS = {
+        "commander": {"read": 30.0},   # Tek kelimelik siniflandirma: uzun surerse LLM takilmistir
+        "web": {"read": 30.0},
+    }
+    DEFAULT_KEEP_ALIVE = {
+        "default": "10m",
+        "commander": "1h",  # Her istekte kullanilir, kucuk model: bellekte kalsin
+        "chat": "30m",
+    }
+    HOST_RETRY_AFTER = 30  # Baglanti hatasi veren host bu kadar saniye atlanir
+
+    def __init__(self, settings=None):
+        cfg = (settings.get("ollama", {}) if settings else {}) or {}
+        hosts = cfg.get("hosts") or [os.getenv("OLLAMA_HOST") or DEFAULT_HOST]
+        self.hosts = [self._normalize_host(h) for h in hosts]
+        self.timeout = dict(self.DEFAULT_TIMEOUT, **(cfg.get("timeout") or {}))
+        self.role_timeouts = dict(self.DEFAULT_ROLE_TIMEOUTS, **(cfg.get("timeouts") or {}))
+        self.keep_alive = dict(self.DEFAULT_KEEP_ALIVE, **(cfg.get("keep_alive") or {}))
+        self.model_hosts = {m: [self._normalize_host(h) for h in hs] for m, hs in (cfg.get("model_hosts") or {}).items()}
+        self.max_connections = int(cfg.get("max_connections", 8))
+        self.web_host = (cfg.get("web_host") or os.getenv("OLLAMA_WEB_HOST") or DEFAULT_WEB_HOST).rstrip("/")
+
+        self._lock = threading.Lock()
+        self._clients = {}                       # (host, timeout) -> ollama.Client
+        self._inflight = {h: 0 for h in self.hosts}
+        self._down_until = {}
+        self.residency = None                    # ModelResidencyManager (get_ollama baglar)
+
+    @staticmethod
+    def _normalize_host(host):
+        host = str(host).strip().rstrip("/")
+        if "://" not in host:
+            host = "http://" + host
+        return host
+
+    # ==================== ISTEMCILER ====================
+
+    def _timeout_for(self, role=None, override=None):
+        values = dict(self.timeout)
+        if role and role in self.role_timeouts:
+            values.update(self.role_timeouts[role])
+        if override is not None:
+            values["read"] = float(override)
+        return (float(values["connect"]), float(values["read"]))
+
+    def client(self, host=None, role=None, timeout=None):
+        """Host + timeout basina bir kez olusturulan, baglanti havuzlu ollama.Client."""
+        host = host or self.hosts[0]
+        connect, read = self._timeout_for(role, timeout)
+        key = (host, connect, read)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = ollama.Client(
+                    host=host,
+                    timeout=httpx.Timeout(read, connect=connect),
+                    limits=httpx.Limits(max_connections=self.max_connections,
+                                        max_keepalive_connections=self.max_connections),
+                )
+                self._clients[key] = client
+            return client
+
+    def keep_alive_for(self, role=None):
+        return self.keep_alive.get(role or "default", self.keep_alive.get("default"))
+
+    # ==================== HOST SECIMI ====================
+
+    def _candidates(self, model=None):
+        """Modelin atandigi host'lar (yoksa hepsi): ayakta olanlar, en az mesgul + model yakinligi."""
+        hosts = self.model_hosts.get(model) or self.hosts
+        now = time.time()
+        alive = [h for h in hosts if self._down_until.get(h, 0) <= now] or list(hosts)
+        # Ayni model mumkunse hep ayni host'a gitsin (her host'ta ayri kopya yuklenmesin)
+        home = zlib.crc32((model or "").encode("utf-8")) % len(alive)
+        ordered = alive[home:] + alive[:home]
+        with self._lock:
+            return sorted(ordered, key=lambda h: self._inflight.get(h, 0))
+
+    def _acquire(self, host):
+        with self._lock:
+            self._inflight[host] = self._inflight.get(host, 0) + 1
+
+    def _release(self, host):
+        with self._lock:
+            self._inflight[host] = max(0, self._inflight.get(host, 0) - 1)
+
+    def _mark_down(self, host, error):
+        self._down_until[host] = time.time() + self.HOST_RETRY_AFTER
+        try: print(f"Ollama host erisilemedi ({host}): {error}")
+        except: pass
+
+    @staticmethod
+    def _is_connection_error(error):
+        return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, ConnectionError))
+
+    def _call(self, method, model=None, role=None, timeout=None, **kwargs):
+        """Tek seferlik cagri; baglanti kurulamazsa siradaki host denenir."""
+        last_error = None
+        for host in self._candidates(model):
+            self._acquire(host)
+            try:
+                fn = getattr(self.client(host, role, timeout), method)
+                return fn(model=model, **kwargs) if model is not None else fn(**kwargs)
+            except Exception as e:
+                if not self._is_connection_error(e):
+                    raise
+                self._mark_down(host, e)
+                last_error = e
+            finally:
+                self._release(host)
+        raise last_error
+
+    def _stream(self, model, role, timeout, kwargs, cancel=None):
+        """Akis: ilk parcadan once baglanti hatasi olursa baska host; parca geldikten sonra hata yukari.
+        cancel (CancelToken): havuz yerine token'a bagli tek kullanimlik baglanti; iptalde sessizce biter."""
+        last_error = None
+        for host in self._candidates(model):
+            if cancel is not None and cancel.cancelled:
+                return
+            self._acquire(host)
+            started = False
+            client = self.client(host, role, timeout) if cancel is None else cancel.client(host, self._timeout_for(role, timeout))
+            try:
+                for chunk in client.chat(model=model, stream=True, **kwargs):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if cancel is not None and cancel.cancelled:
+                    return
+                if started or not self._is_connection_error(e):
+                    raise
+                self._mark_down(host, e)
+                last_error = e
+            finally:
+                self._release(host)
+                if cancel is not None:
+                    client.close()
+        raise last_error
+
+    # ==================== API ====================
+
+    def chat(self, model, messages, role=None, stream=False, timeout=None, cancel=None, **kwargs):
+        """ollama.chat ile ayni imza + role (keep_alive/timeout politikasi), timeout (okuma, saniye)
+        ve cancel (CancelToken, sadece stream=True)."""
+        if self.residency is not None and role:
+            # Model RAM'de yoksa yer acilir; seyrek roller yuklu bir modele yonlenebilir
+            model = self.residency.prepare(role, model)
+            pinned = self.residency.keep_alive_for(role, model)
+            if pinned is not None:
+                kwargs.setdefault("keep_alive", pinned)
+        kwargs.setdefault("keep_alive", self.keep_alive_for(role))
+        kwargs["messages"] = messages
+        if stream:
+            return self._stream(model, role, timeout, kwargs, cancel)
+        return self._call("chat", model=model, role=role, timeout=timeout, **kwargs)
+
+    def embed(self, model, input, role="embedding", timeout=None, **kwargs):
+        kwargs.setdefault("keep_alive", self.keep_alive_for(role))
+        return self._call("embed", model=model, role=role, timeout=timeout, input=input, **kwargs)
+
+    def list(self, host=None):
+        return self.client(host or self.hosts[0], role="web").list()
+
+    def ps(self, host=None):
+        return self.client(host or self.hosts[0], role="web").ps()
+
+    def pull(self, model, stream=False, host=None):
+        return self.client(host or self.hosts[0]).pull(model, stream=stream)
+
+    def web_search(self, query, max_results=3):
+        # ollama.com'a gider (OLLAMA_API_KEY); yerel host'tan bagimsiz tek havuz
+        client = self.client(DEFAULT_HOST, role="web")
+        if self.web_host == DEFAULT_WEB_HOST:
+            return client.web_search(query=query, max_results=max_results)
+        return client._request(ollama.WebSearchResponse, "POST", f"{self.web_host}/api/web_search",
+                               json={"query": query, "max_results": max_results})
+
+    def web_fetch(self, url):
+        client = self.client(DEFAULT_HOST, role="web")
+        if self.web_host == DEFAULT_WEB_HOST:
+            return client.web_fetch(url=url)
+        return client._request(ollama.WebFetchResponse, "POST", f"{self.web_host}/api/web_fetch",
+                               json={"url": url})
+
+    def stats(self):
+        with self._lock:
+            inflight = dict(self._inflight)
+        now = time.time()
+        return {h: {"inflight": inflight.get(h, 0), "down": self._down_until.get(h, 0) > now} for h in self.hosts}
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_ollama():
+    """Surec genelinde tek OllamaPool (ayarlar ilk cagrida okunur)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from utils.settings_manager import SettingsManager
+                from engines.model_residency import ModelResidencyManager
+                settings = SettingsManager()
+                pool = OllamaPool(settings)
+                # Yerlesim yonetimi tek (yerel) host icin anlamli; coklu host'ta Ollama'ya birakilir
+                if len(pool.hosts) == 1:
+                    pool.residency = ModelResidencyManager(pool, settings)
+                _pool = pool
+    return _pool
+# --- END FEATURE: ollama_client ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
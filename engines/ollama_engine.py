@@ -1,5 +1,5 @@
-import ollama
 from .base import BaseEngine
+from .ollama_client import get_ollama
 
 # --- FEATURE: ollama_engine ---
 class OllamaEngine(BaseEngine):
@@ -11,19 +11,19 @@ class OllamaEngine(BaseEngine):
 
     def check_installed(self):
         try:
-            ollama.list()
+            get_ollama().list()
             return True
         except:
             return False
 
     def list_models(self):
         try:
-            models = ollama.list()
+            models = get_ollama().list()
             return [m['name'] for m in models['models']]
         except:
             return []
 
-    def generate_response(self, prompt, system_instruction=None, history=[], images=[]):
+    def _build_messages(self, prompt, system_instruction=None, images=[]):
         messages = []
         if system_instruction:
             messages.append({'role': 'system', 'content': system_instruction})
@@ -40,9 +40,13 @@ class OllamaEngine(BaseEngine):
             msg_payload['images'] = images
 
         messages.append(msg_payload)
+        return messages
+
+    def generate_response(self, prompt, system_instruction=None, history=[], images=[]):
+        messages = self._build_messages(prompt, system_instruction, images)
 
         try:
-            response = ollama.chat(model=self.model_name, messages=messages)
+            response = get_ollama().chat(model=self.model_name, messages=messages)
         except Exception as e: 
             # Auto-pull if missing? Maybe too aggressive.
             return f"Ollama Error: {e}"
@@ -50,8 +54,16 @@ class OllamaEngine(BaseEngine):
         return response['message']['content']
 
     def generate_stream(self, prompt, system_instruction=None, history=[], images=[]):
-        # Implementation for stream if needed
-        pass
+        """Model token urettikce parcalari yield eder (ollama.chat stream=True)."""
+        messages = self._build_messages(prompt, system_instruction, images)
+
+        try:
+            for chunk in get_ollama().chat(model=self.model_name, messages=messages, stream=True):
+                content = chunk['message']['content']
+                if content:
+                    yield content
+        except Exception as e:
+            yield f"Ollama Error: {e}"
 # --- END FEATURE: ollama_engine ---
 
 # ============================================================
@@ -0,0 +1,166 @@
+"""
+Research Pipeline — yerel arastirma modu icin paralel getir-ozetle hatti (kaynaklar ayni anda
+indirilir, geldikce ozetlenir; butceyi asan kaynak icin arama snippet'i kullanilir).
+
+config.json:
+    "research": {"sources": 3, "budget": 20, "max_chars": 4000, "summarize_sources": true}
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeout
+
+from utils.metrics import REGISTRY, timed
+
+# --- FEATURE: research_pipeline ---
+RESEARCH_SOURCES = REGISTRY.counter(
+    "jarvis_research_sources_total",
+    "Arastirma kaynaklari (status: ok = sayfa okundu, snippet = butce/hata nedeniyle snippet, empty).",
+    ("status",),
+)
+
+_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")      # [metin](url) / ![resim](url) -> metin
+_URL = re.compile(r"https?://\S+")
+_SPACES = re.compile(r"[ \t\u00a0]+")
+
+
+def clean_text(raw, max_chars=4000):
+    """web_fetch ciktisindan okunur metin: linkler sadelesir, kisa menu satirlari ve tekrarlar atilir."""
+    if not raw:
+        return ""
+    text = _URL.sub("", _LINK.sub(r"\1", raw))
+    seen = set()
+    lines = []
+    total = 0
+    for line in text.splitlines():
+        line = _SPACES.sub(" ", line).strip(" #*|>-_=")
+        # Menu / buton / breadcrumb artiklari: cok kisa ya da tekrar eden satirlar
+        if len(line) < 25 or line.lower() in seen:
+            continue
+        seen.add(line.lower())
+        lines.append(line)
+        total += len(line) + 1
+        if total >= max_chars:
+            break
+    return "\n".join(lines)[:max_chars]
+
+
+class ResearchPipeline:
+    DEFAULTS = {
+        "sources": 3,               # Okunacak sayfa sayisi
+        "budget": 20,               # Tum fetch'ler icin saniye; asan kaynak snippet ile gecer
+        "max_chars": 4000,          # Kaynak basina temiz metin
+        "summary_chars": 1200,      # Birlestirmeye giren ozet uzunlugu (ozetleme kapaliysa metin)
+        "summarize_sources": True,  # False: kaynaklar ozetlenmeden tek uretimde birlestirilir
+    }
+
+    SOURCE_SYSTEM = ("Sen bir arastirma asistanisin. Sana verilen kaynak metnini SORU'ya gore "
+                     "2-4 cumleyle ozetle. Sadece metinde gecen bilgileri kullan. Turkce yaz.")
+    MERGE_SYSTEM = ("Sen bir arastirmacisin. Kaynak ozetlerini birlestirerek SORU'yu cevapla. "
+                    "Celisen bilgileri belirt, kaynak numaralarini [1] gibi goster. Turkce yaz.")
+
+    def __init__(self, web_tools, settings=None):
+        self.web_tools = web_tools
+        self.config = dict(self.DEFAULTS, **((settings.get("research", {}) if settings else {}) or {}))
+        self._pool = None
+
+    def _fetch(self, result):
+        with timed("research.fetch"):
+            return clean_text(self.web_tools.read_url(result["href"]), self.config["max_chars"])
+
+    def sources(self, results):
+        """(numara, sonuc, metin, durum) — gelis sirasiyla. Butce dolunca kalanlar snippet ile doner."""
+        results = [r for r in results if r.get("href")][:self.config["sources"]]
+        if not results:
+            return
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=max(1, self.config["sources"]),
+                                            thread_name_prefix="research")
+        futures = {self._pool.submit(self._fetch, r): i for i, r in enumerate(results)}
+        pending = set(range(len(results)))
+        try:
+            for future in as_completed(futures, timeout=self.config["budget"]):
+                pending.discard(futures[future])
+                yield from self._collect(futures[future], results[futures[future]], future)
+        except FutureTimeout:
+            # Ozetleme sirasinda bitenler de burada toplanir; sadece gercekten bitmeyenler snippet'e duser
+            by_index = {i: f for f, i in futures.items()}
+            late = [i for i in pending if not by_index[i].done()]
+            if late:
+                try: print(f"Arastirma: {len(late)} kaynak {self.config['budget']}s butcesini asti, snippet kullaniliyor")
+                except: pass
+            for i in sorted(pending):
+                future = by_index[i]
+                future.cancel()
+                yield from self._collect(i, results[i], future if future.done() else None)
+
+    def _collect(self, i, result, future):
+        text = ""
+        if future is not None:
+            try:
+                text = future.result()
+            except Exception:
+                text = ""
+        if text:
+            RESEARCH_SOURCES.inc(status="ok")
+            yield i + 1, result, text, "ok"
+        else:
+            yield from self._snippet(i, result)
+
+    def _snippet(self, i, result):
+        body = (result.get("body") or "").strip()
+        RESEARCH_SOURCES.inc(status="snippet" if body else "empty")
+        if body:
+            yield i + 1, result, body[:self.config["max_chars"]], "snippet"
+
+    def run_stream(self, query, engine):
+        """Kaynak ozetlerini geldikce, ardindan birlestirilmis cevabi yield eder."""
+        start = time.perf_counter()
+        results = self.web_tools.search(query)
+        if not results:
+            yield "Internetten veri alinamadi."
+            return
+
+        summaries = []
+        for number, result, text, status in self.sources(results):
+            if self.config["summarize_sources"]:
+                yield f"**[{number}] {result['title']}**\n"
+                parts = []
+                prompt = f"SORU: {query}\nKAYNAK: {result['title']}\n{text}"
+                with timed("research.summary"):
+                    for chunk in engine.generate_stream(prompt, system_instruction=self.SOURCE_SYSTEM):
+                        parts.append(chunk)
+                        yield chunk
+                yield "\n\n"
+                summary = "".join(parts).strip()
+            else:
+                summary = text
+            summaries.append((number, result, summary[:self.config["summary_chars"]]))
+
+        if not summaries:
+            yield "Kaynaklar okunamadi."
+            return
+
+        summaries.sort(key=lambda s: s[0])
+        context = "\n".join(f"[{n}] {r['title']}: {s}" for n, r, s in summaries)
+        if self.config["summarize_sources"]:
+            yield "**Sonuc:**\n"
+        with timed("research.merge"):
+            yield from engine.generate_stream(f"SORU: {query}\nKAYNAKLAR:\n{context}\n\nBu kaynaklara gore soruyu cevapla:",
+                                              system_instruction=self.MERGE_SYSTEM)
+        try: print(f"Arastirma tamamlandi: {len(summaries)} kaynak, {time.perf_counter() - start:.2f}s")
+        except: pass
+# --- END FEATURE: research_pipeline ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
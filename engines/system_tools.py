@@ -4,7 +4,7 @@ import subprocess
 import pyautogui
 import requests
 import re
-import ollama
+from engines.ollama_client import get_ollama
 from datetime import datetime
 
 # --- FEATURE: system_manager ---
@@ -53,7 +53,7 @@ class WebTools:
     def read_url(self, url):
         """Ollama web_fetch ile sayfa icerigini oku."""
         try:
-            result = ollama.web_fetch(url)
+            result = get_ollama().web_fetch(url)
             content = result.get('content', '') if isinstance(result, dict) else getattr(result, 'content', '')
             return content[:5000] if content else ""
         except Exception as e:
@@ -64,7 +64,7 @@ class WebTools:
         """Ollama web_search ile arama yap. Sonuclari eski formata uyumlu dondurur."""
         results = []
         try:
-            response = ollama.web_search(query)
+            response = get_ollama().web_search(query)
             # response.results veya response['results'] olabilir
             raw_results = []
             if isinstance(response, dict):
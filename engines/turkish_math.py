@@ -0,0 +1,505 @@
+"""
+Turkish Math — Turkce hesap ifadeleri icin kural tabanli ayristirici + guvenli degerlendirici.
+"500 carpi 5", "iki yuz elli arti 3 bucuk", "100'un karekoku", "500'un yuzde 20'si",
+"2 uzeri 10", "5 km kac metre" gibi ifadeler model cagrisi olmadan mikro saniyelerde hesaplanir.
+Ayristirilamayan cumleler MathParseError firlatir; matematik ajani o zaman LLM cevirisine duser.
+
+- Sozluk: sayi kelimeleri (sifir..milyar, bucuk, virgul), operatorler (arti, eksi, carpi, kere,
+  bolu, ussu/uzeri, mod, yuzde), fonksiyonlar (karekok, kup kok, karesi, kupu, faktoriyel,
+  sinus/kosinus/tanjant (derece), logaritma, dogal logaritma, mutlak deger, yuvarla), pi ve e
+- Yuzde: "A'nin yuzde B'si", "A arti/eksi yuzde B" (KDV gibi), "A'nin yuzde kaci B", "%B"
+- Birim: uzunluk, agirlik, hacim, sure, veri ("X birim kac birim", "X birimi birime cevir")
+- safe_eval: Python ifadesini ast ile, sadece izinli dugumler ve math fonksiyonlariyla hesaplar
+  (LLM cevirisi de artik eval yerine bununla calisir)
+"""
+
+import re
+import ast
+import math
+import operator
+
+from utils.embeddings import TURKISH_FOLD
+
+# --- FEATURE: turkish_math ---
+class MathParseError(ValueError):
+    """Metin yerel olarak ayristirilamadi (LLM cevirisine dusulur)."""
+
+
+# ==================== GUVENLI DEGERLENDIRICI ====================
+
+MAX_EXPONENT_DIGITS = 1000      # Sonucu 10^1000'den buyuk olacak us alma reddedilir
+MAX_FACTORIAL = 1000
+
+_BINARY = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+_MATH_NAMES = {
+    "sqrt", "cbrt", "exp", "log", "log10", "log2", "sin", "cos", "tan", "asin", "acos", "atan",
+    "radians", "degrees", "floor", "ceil", "fabs", "factorial", "hypot", "pi", "e", "tau",
+}
+_BUILTINS = {"abs": abs, "round": round, "min": min, "max": max, "pow": pow}
+
+
+def _check_pow(base, exponent):
+    if isinstance(exponent, (int, float)) and abs(exponent) > 1 and isinstance(base, (int, float)) and abs(base) > 1:
+        if abs(exponent) * math.log10(abs(base)) > MAX_EXPONENT_DIGITS:
+            raise ValueError("Sonuc cok buyuk")
+
+
+def _resolve(node):
+    """math.X ya da izinli yerlesik isim -> nesne."""
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "math":
+        if node.attr in _MATH_NAMES and hasattr(math, node.attr):
+            return getattr(math, node.attr)
+    if isinstance(node, ast.Name) and node.id in _BUILTINS:
+        return _BUILTINS[node.id]
+    raise ValueError(f"Izin verilmeyen ifade: {ast.dump(node)[:40]}")
+
+
+def _eval(node):
+    if isinstance(node, ast.Expression):
+        return _eval(node.body)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+        left, right = _eval(node.left), _eval(node.right)
+        if isinstance(node.op, ast.Pow):
+            _check_pow(left, right)
+        return _BINARY[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+        return _UNARY[type(node.op)](_eval(node.operand))
+    if isinstance(node, ast.Call) and not node.keywords:
+        fn = _resolve(node.func)
+        args = [_eval(a) for a in node.args]
+        if fn is math.factorial and (not args or args[0] > MAX_FACTORIAL):
+            raise ValueError("Faktoriyel cok buyuk")
+        if fn is pow and len(args) >= 2:
+            _check_pow(args[0], args[1])
+        return fn(*args)
+    if isinstance(node, (ast.Attribute, ast.Name)):
+        value = _resolve(node)
+        if isinstance(value, float):
+            return value
+    raise ValueError("Izin verilmeyen ifade")
+
+
+def safe_eval(expression):
+    """Sadece sayilar, aritmetik ve math fonksiyonlari. eval() kullanilmaz."""
+    return _eval(ast.parse(expression.strip(), mode="eval"))
+
+
+def format_number(value):
+    """Kayan nokta gurultusunu temizle: 0.49999999999999994 -> 0.5, 7.0 -> 7."""
+    if isinstance(value, float):
+        if math.isfinite(value):
+            value = round(value, 10)
+            if value.is_integer() and abs(value) < 1e15:
+                return f"{int(value)}"
+        return f"{value}"
+    return f"{value}"
+
+
+# ==================== SOZLUK ====================
+
+ONES = {"sifir": 0, "bir": 1, "iki": 2, "uc": 3, "dort": 4, "bes": 5, "alti": 6, "yedi": 7,
+        "sekiz": 8, "dokuz": 9}
+TENS = {"on": 10, "yirmi": 20, "otuz": 30, "kirk": 40, "elli": 50, "altmis": 60, "yetmis": 70,
+        "seksen": 80, "doksan": 90}
+SCALES = {"bin": 10 ** 3, "milyon": 10 ** 6, "milyar": 10 ** 9, "trilyon": 10 ** 12}
+
+BINARY_WORDS = {
+    "+": "+", "arti": "+", "topla": "+",
+    "-": "-", "eksi": "-",
+    "*": "*", "x": "*", "×": "*", "carpi": "*", "kere": "*", "defa": "*",
+    "/": "/", "÷": "/", ":": "/", "bolu": "/",
+    "^": "**", "**": "**", "ussu": "**", "uzeri": "**",
+    "mod": "%", "modu": "%",
+}
+# Hem onek ("karekok 144") hem sonek ("144'un karekoku") olabilen fonksiyonlar; sira onemli (uzun kok once)
+FUNCTION_STEMS = [
+    ("karekok", "math.sqrt({})"), ("kupkok", "({}) ** (1/3)"),
+    ("kosinus", "math.cos(math.radians({}))"), ("cos", "math.cos(math.radians({}))"),
+    ("sinus", "math.sin(math.radians({}))"), ("sin", "math.sin(math.radians({}))"),
+    ("tanjant", "math.tan(math.radians({}))"), ("tan", "math.tan(math.radians({}))"),
+    ("logaritma", "math.log10({})"), ("log", "math.log10({})"), ("ln", "math.log({})"),
+    ("faktoriyel", "math.factorial({})"), ("mutlak", "abs({})"), ("yuvarla", "round({})"),
+]
+# Sadece sonek: "5'in karesi", "3'un kupu"
+POSTFIX_STEMS = [("kare", "({}) ** 2"), ("kup", "({}) ** 3")]
+CONSTANTS = {"pi": "math.pi", "π": "math.pi", "e": "math.e"}
+FILLER = {"kac", "eder", "nedir", "ne", "hesapla", "sonucu", "sonuc", "=", "acaba", "lutfen", "yapar",
+          "olur", "sayisi", "derece", "degeri", "degerini", "islemi", "bana", "soyle", "jarvis",
+          "efendim", "bul", "hesabi", "esittir", "kactir", "dir", "dur",
+          "tl", "lira", "kdv", "kdvli", "toplam", "sonucunu"}
+
+UNITS = {
+    # birim: (boyut, temel birime carpan)
+    "mm": ("uzunluk", 0.001), "milimetre": ("uzunluk", 0.001), "cm": ("uzunluk", 0.01),
+    "santim": ("uzunluk", 0.01), "santimetre": ("uzunluk", 0.01), "m": ("uzunluk", 1.0),
+    "metre": ("uzunluk", 1.0), "km": ("uzunluk", 1000.0), "kilometre": ("uzunluk", 1000.0),
+    "mil": ("uzunluk", 1609.344), "inc": ("uzunluk", 0.0254), "ayak": ("uzunluk", 0.3048),
+    "mg": ("agirlik", 0.001), "miligram": ("agirlik", 0.001), "g": ("agirlik", 1.0),
+    "gr": ("agirlik", 1.0), "gram": ("agirlik", 1.0), "kg": ("agirlik", 1000.0),
+    "kilo": ("agirlik", 1000.0), "kilogram": ("agirlik", 1000.0), "ton": ("agirlik", 10 ** 6),
+    "ml": ("hacim", 0.001), "mililitre": ("hacim", 0.001), "lt": ("hacim", 1.0), "l": ("hacim", 1.0),
+    "litre": ("hacim", 1.0),
+    "saniye": ("sure", 1.0), "sn": ("sure", 1.0), "dakika": ("sure", 60.0), "dk": ("sure", 60.0),
+    "saat": ("sure", 3600.0), "gun": ("sure", 86400.0), "hafta": ("sure", 604800.0),
+    "kb": ("veri", 1024.0), "mb": ("veri", 1024.0 ** 2), "gb": ("veri", 1024.0 ** 3), "tb": ("veri", 1024.0 ** 4),
+}
+_UNIT_NAMES = "|".join(sorted(UNITS, key=len, reverse=True))
+# Birim ekleri: "km'yi", "metreye", "saati", "dakikaya"
+_UNIT = r"(" + _UNIT_NAMES + r")(?:'?(?:y?[iu]|y?[ea]|n?[iu]n|ye|ya|de|da|den|dan|ta|te))?"
+_UNIT_QUERY = [
+    re.compile(r"^(?P<value>.+?)\s+" + _UNIT + r"\s+(?:kac|ne\s+kadar|=|kac\s+tane)\s+" + _UNIT
+               + r"(?:\s+(?:eder|yapar|olur|dir|eder mi))?$"),
+    re.compile(r"^(?P<value>.+?)\s+" + _UNIT + r"\s+" + _UNIT + r"\s+(?:cevir|donustur|hesapla)$"),
+]
+
+# Iki yani bosluklu isaret operatoru: "3 : 30" hesap, "3:30" saat / "1-0" skor olabilir
+_SPACED_OPERATOR = re.compile(r"\S\s+(?:\*\*|[-+*/×÷^:%])\s+\S")
+_TOKEN = re.compile(r"(\d+(?:[.,]\d+)*)|([a-zπ]+)|(\*\*|[-+*/×÷^()%:=])|(['’])|(\s+)|(.)")
+_NUMBER_SUFFIX = re.compile(r"^(?:[iuea]|n?[iu]n|[iu]n|y[iu]|y[ea]|d[ea]|d[ea]n|t[ea]|t[ea]n|s[iu]|ler|lar|nci|inci|uncu)$")
+
+
+def _fold(text):
+    return (text or "").replace("İ", "i").replace("I", "ı").lower().translate(TURKISH_FOLD).strip()
+
+
+def _digits(text):
+    # "1.000.000" binlik ayrac; "3,5" / "3.5" ondalik
+    if re.fullmatch(r"\d{1,3}(?:\.\d{3})+", text):
+        return text.replace(".", "")
+    text = text.replace(",", ".")
+    return text if not re.fullmatch(r"\d+\.\d+(?:\.\d+)+", text) else None
+
+
+def tokenize(text):
+    """Katlanmis metin -> [(tur, deger)]: num, word, sym. Sayiya yapisik ekler ('in, 'si, 5.) atilir."""
+    tokens = []
+    after_number = False
+    skip_suffix = False
+    for number, word, sym, apostrophe, space, other in _TOKEN.findall(text):
+        if space:
+            after_number = skip_suffix = False
+            continue
+        if apostrophe:
+            skip_suffix = True
+            continue
+        if number:
+            value = _digits(number)
+            if value is None:
+                raise MathParseError(f"Sayi okunamadi: {number}")
+            tokens.append(("num", value))
+            after_number = True
+            continue
+        if word:
+            # "5'in", "100un", "20'si" -> ek atilir; "5x5" gibi durumlarda x operatordur
+            if skip_suffix or (after_number and word != "x" and _NUMBER_SUFFIX.match(word)):
+                skip_suffix = False
+                continue
+            tokens.append(("word", word))
+            after_number = False
+            continue
+        if other == "." and after_number:
+            continue  # "5. kuvveti" siralama noktasi
+        if sym:
+            tokens.append(("sym", sym))
+            after_number = False
+            continue
+        raise MathParseError(f"Beklenmeyen karakter: {other}")
+    return tokens
+
+
+# ==================== AYRISTIRICI ====================
+
+class _Parser:
+    """Oncelik: toplama < carpma/bolme/mod/yuzde < us < onek/sonek fonksiyonlar < sayi/parantez."""
+
+    def __init__(self, tokens):
+        self.tokens = [t for t in tokens if not (t[0] == "word" and t[1] in FILLER) and t != ("sym", "=")]
+        self.i = 0
+        self.operations = 0
+        self.ambiguous = 0   # Tek basina hesap sayilmayan islemler: isaretle yazilanlar ("3:30", "1-0"), "yuzde yuz"
+
+    def peek(self, offset=0):
+        j = self.i + offset
+        return self.tokens[j] if j < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.i += 1
+        return token
+
+    def take_operator(self):
+        kind, _ = self.take()
+        self.operations += 1
+        if kind == "sym":
+            self.ambiguous += 1
+
+    def parse(self):
+        if not self.tokens:
+            raise MathParseError("Bos ifade")
+        expr = self.expr()
+        if self.i != len(self.tokens):
+            raise MathParseError(f"Anlasilmayan kisim: {self.peek()[1]}")
+        return expr
+
+    def _binary(self, accepted):
+        kind, value = self.peek()
+        if kind in ("sym", "word") and BINARY_WORDS.get(value) in accepted:
+            return BINARY_WORDS[value]
+        return None
+
+    def _is_percent(self, offset=0):
+        kind, value = self.peek(offset)
+        return (kind == "word" and value == "yuzde") or (kind == "sym" and value == "%")
+
+    def expr(self):
+        left = self.term()
+        while True:
+            op = self._binary({"+", "-"})
+            if op is None:
+                return left
+            self.take_operator()
+            if self._is_percent():
+                # "100 arti yuzde 18" -> 100 * (1 + 18/100)
+                self.take()
+                rate = self.power()
+                left = f"({left}) * (1 {op} ({rate}) / 100)"
+            else:
+                left = f"{left} {op} {self.term()}"
+
+    def term(self):
+        left = self.power()
+        while True:
+            if self._is_percent():
+                self.take()
+                self.operations += 1
+                if self.peek() == ("word", "kaci"):
+                    # "200'un yuzde kaci 50" -> (50 / 200) * 100
+                    self.take()
+                    left = f"(({self.power()}) / ({left}) * 100)"
+                else:
+                    # "500'un yuzde 20'si" -> 500 * 20 / 100
+                    left = f"({left}) * ({self.power()}) / 100"
+                continue
+            op = self._binary({"*", "/", "%"})
+            if op is None:
+                return left
+            self.take_operator()
+            left = f"{left} {op} {self.power()}"
+
+    def power(self):
+        base = self.unary()
+        if self._binary({"**"}):
+            self.take_operator()
+            return f"({base}) ** ({self.power()})"
+        return base
+
+    def unary(self):
+        if self._binary({"-"}):
+            self.take()
+            if self.peek()[0] == "num":
+                # "-15'in mutlak degeri" -> abs(-15): eksi isareti sayiya baglanir
+                return self.postfix(f"(-{self.number()})")
+            return f"-({self.unary()})"
+        if self._binary({"+"}):
+            self.take()
+            return self.unary()
+        return self.postfix(self.prefix())
+
+    @staticmethod
+    def _function(word):
+        for stem, template in FUNCTION_STEMS:
+            if word.startswith(stem):
+                return template
+        return None
+
+    def prefix(self):
+        kind, value = self.peek()
+        if self._is_percent():
+            # Tek basina "yuzde 20" / "%20" -> 0.2 ("yuzde yuz" = "kesinlikle" deyimi de olabilir)
+            self.take()
+            self.operations += 1
+            self.ambiguous += 1
+            return f"(({self.unary()}) / 100)"
+        if kind == "word":
+            template = self._function_at_cursor()
+            if template:
+                self.operations += 1
+                return template.format(self.unary())
+        return self.primary()
+
+    def _function_at_cursor(self):
+        """Imlecteki fonksiyon kelimesini tuket: "kup kok", "dogal logaritma", "mutlak deger" birlesikleri dahil."""
+        kind, value = self.peek()
+        if value == "dogal" and self.peek(1)[0] == "word" and self.peek(1)[1].startswith("log"):
+            self.i += 2
+            return "math.log({})"
+        if value.startswith("kup") and self.peek(1)[0] == "word" and self.peek(1)[1].startswith("kok"):
+            self.i += 2
+            return "({}) ** (1/3)"
+        template = self._function(value)
+        if template:
+            self.i += 1
+            if value.startswith("mutlak") and self.peek()[1] and self.peek()[1].startswith("deger"):
+                self.i += 1
+            return template
+        return None
+
+    def postfix(self, operand):
+        while True:
+            kind, value = self.peek()
+            if kind == "num" and self.peek(1)[0] == "word" and self.peek(1)[1].startswith("kuvvet"):
+                # "4'un 5. kuvveti" -> 4 ** 5
+                exponent = self.take()[1]
+                self.take()
+                operand = f"({operand}) ** {exponent}"
+                self.operations += 1
+                continue
+            if kind != "word":
+                return operand
+            template = None
+            for stem, postfix in POSTFIX_STEMS:
+                if value.startswith(stem) and not value.startswith("karekok") and not (
+                        stem == "kup" and self.peek(1)[1] and str(self.peek(1)[1]).startswith("kok")):
+                    template = postfix
+                    self.i += 1
+                    break
+            if template is None:
+                template = self._function_at_cursor()
+            if template is None:
+                return operand
+            self.operations += 1
+            operand = template.format(operand)
+
+    def primary(self):
+        kind, value = self.peek()
+        if (kind, value) == ("sym", "(") or (kind, value) == ("word", "parantez"):
+            # "(5 + 3)", "parantez ac 5 arti 3 parantez kapat", "parantez 5 arti 3 parantez kapat"
+            self.take()
+            if self.peek() == ("word", "ac"):
+                self.take()
+            inner = self.expr()
+            if self.peek() == ("sym", ")"):
+                self.take()
+            elif self.peek() == ("word", "parantez") and self.peek(1) == ("word", "kapat"):
+                self.i += 2
+            else:
+                raise MathParseError("Parantez kapanmadi")
+            return f"({inner})"
+        if kind == "word" and value in CONSTANTS:
+            self.take()
+            return CONSTANTS[value]
+        if kind == "num" or (kind == "word" and (value in ONES or value in TENS or value in SCALES or value == "yuz")):
+            return self.number()
+        raise MathParseError(f"Sayi bekleniyordu: {value}")
+
+    def number(self):
+        """Rakam ve sayi kelimeleri: "iki yuz elli", "5 bin", "3 bucuk", "3 virgul 25"."""
+        total, current, seen, text = 0, 0, False, None
+        while True:
+            kind, value = self.peek()
+            if kind == "num":
+                if seen:
+                    break
+                text = value
+                current = float(value) if "." in value else int(value)
+                seen = True
+            elif kind == "word" and value in ONES:
+                current += ONES[value]
+            elif kind == "word" and value in TENS:
+                current += TENS[value]
+            elif kind == "word" and value == "yuz":
+                current = (current or 1) * 100
+            elif kind == "word" and value in SCALES:
+                total += (current or 1) * SCALES[value]
+                current = 0
+            else:
+                break
+            seen = True
+            self.take()
+        value = total + current
+        kind, word = self.peek()
+        if kind == "word" and word == "bucuk":
+            self.take()
+            value += 0.5
+        elif kind == "word" and word == "virgul":
+            self.take()
+            fraction = ""
+            while True:
+                kind, token = self.peek()
+                if kind == "num" and not fraction and "." not in token:
+                    fraction = token
+                    self.take()
+                    break
+                if kind == "word" and token in ONES:
+                    fraction += str(ONES[token])
+                    self.take()
+                    continue
+                break
+            if not fraction:
+                raise MathParseError("Virgulden sonra sayi bekleniyordu")
+            value = float(f"{int(value)}.{fraction}")
+        if text is not None and value == (float(text) if "." in text else int(text)):
+            return text
+        return format_number(float(value)) if isinstance(value, float) else str(value)
+
+
+# ==================== API ====================
+
+def parse(text, require_operation=False):
+    """Turkce ifade -> Python ifadesi (math.* ile). require_operation: en az bir operator kelimesi
+    ("arti", "karekoku", "yuzde 20'si") ya da iki yani bosluklu isaret operatoru ("5 + 3") gerekir;
+    tek sayi/sabit, "3:30", "16:9", "1-0" ve tek basina "yuzde yuz" kabul edilmez."""
+    folded = _fold(text).rstrip("?!. ")
+    parser = _Parser(tokenize(folded))
+    expression = parser.parse()
+    if require_operation:
+        spaced = parser.ambiguous and _SPACED_OPERATOR.search(folded)
+        if parser.operations <= parser.ambiguous and not spaced:
+            raise MathParseError("Islem yok")
+    return expression
+
+
+def convert_units(text):
+    """ "5 km kac metre" -> ("(5) * 1000.0 / 1.0", "metre"). Birim sorusu degilse None."""
+    folded = re.sub(r"\s+", " ", _fold(text).rstrip("?!. "))
+    for pattern in _UNIT_QUERY:
+        found = pattern.match(folded)
+        if not found:
+            continue
+        source, target = found.group(2), found.group(3)
+        (dim_a, factor_a), (dim_b, factor_b) = UNITS[source], UNITS[target]
+        if dim_a != dim_b:
+            raise MathParseError(f"Birimler uyumsuz: {source} / {target}")
+        return f"({parse(found.group('value'))}) * {factor_a!r} / {factor_b!r}", target
+    return None
+
+
+def calculate(text, require_operation=False):
+    """Donus: (ifade, sonuc metni). Ayristirilamazsa MathParseError; hesap hatalari (sifira bolme) aynen firlar."""
+    units = convert_units(text)
+    if units is not None:
+        expression, unit = units
+        return expression, f"{format_number(float(safe_eval(expression)))} {unit}"
+    expression = parse(text, require_operation=require_operation)
+    return expression, format_number(safe_eval(expression))
+# --- END FEATURE: turkish_math ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
@@ -43,12 +43,16 @@ EXCLUDE_PATTERNS = [
     "old\\",
     "data/chat_history.json",
     "data\\chat_history.json",
+    "data/chat_history.jsonl",
+    "data\\chat_history.jsonl",
     "data/long_memory.json",
     "data\\long_memory.json",
     "data/user_profile.json",
     "data\\user_profile.json",
     "data/archives/",
     "data\\archives\\",
+    "data/archive_catalog.db",
+    "data\\archive_catalog.db",
     ".git/",
     ".git\\",
     "desktop.ini",
@@ -451,9 +455,11 @@ def publish():
             "__pycache__/",
             "old/",
             "data/chat_history.json",
+            "data/chat_history.jsonl",
             "data/long_memory.json",
             "data/user_profile.json",
             "data/archives/",
+            "data/archive_catalog.db",
         ],
     }
 
@@ -14,6 +14,11 @@ from fastapi.responses import HTMLResponse, StreamingResponse, FileResponse, JSO
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles # Added
 from engines.manager import EngineManager
+from utils.request_executor import RequestExecutor, ExecutorBusyError
+from utils.history_store import HistoryStore
+from utils.archive_catalog import ArchiveCatalog
+from utils.progress_hub import ProgressHub
+from utils.metrics import timed, render_metrics, REGISTRY
 
 import sys
 # Force UTF-8 for console output to support all languages/emojis
@@ -24,55 +29,53 @@ import glob
 import json
 import glob
 import threading
+import time
+import asyncio
 from datetime import datetime
 
 app = FastAPI()
 beyin = EngineManager()
+# Bloklayan motor isleri icin sinirli worker havuzlari (event loop serbest kalir)
+executor = RequestExecutor(beyin.settings)
 
-HISTORY_FILE = "data/chat_history.json"
+HISTORY_FILE = "data/chat_history.jsonl"
+LEGACY_HISTORY_FILE = "data/chat_history.json"
+
+# Append-only gecmis: yazmalar tek satir, okumalar bellekteki son 50 mesajdan
+history_store = HistoryStore(HISTORY_FILE, legacy_path=LEGACY_HISTORY_FILE, window=50)
+
+# Arsiv katalogu: listeleme ve tam metin arama dizin taramadan SQLite'tan
+archive_catalog = ArchiveCatalog("data/archives", db_path="data/archive_catalog.db")
 
 # --- FEATURE: load_history ---
 def load_history():
-    if os.path.exists(HISTORY_FILE):
-        try:
-            with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except: return []
-    return []
+    return history_store.load()
 
+@timed("history.save_message")
 def save_message(role, text):
-    history = load_history()
-    history.append({
-        "role": role,
-        "text": text,
-        "timestamp": datetime.now().isoformat()
-    })
-    # Keep last 50 messages
-    if len(history) > 50: history = history[-50:]
-    
-    with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-        json.dump(history, f, ensure_ascii=False, indent=2)
+    history_store.append(role, text)
 
 def archive_current_chat():
-    if not os.path.exists(HISTORY_FILE): return
     try:
-        with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if not data: return # Empty
-            
-            # Create summary or title from first message
-            summary = "New Chat"
-            if len(data) > 0:
-                summary = data[0].get("text", "")[:20].replace(" ", "_").replace(":", "")
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"data/archives/chat_{timestamp}_{summary}.json"
-            
-            # Ensure archives dir exists
-            if not os.path.exists("data/archives"): os.makedirs("data/archives")
-            
-            with open(filename, "w", encoding="utf-8") as f_out:
-                json.dump(data, f_out, ensure_ascii=False, indent=2)
+        data = history_store.load()
+        if not data: return # Empty
+        
+        # Create summary or title from first message
+        summary = "New Chat"
+        if len(data) > 0:
+            summary = data[0].get("text", "")[:20].replace(" ", "_").replace(":", "")
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"data/archives/chat_{timestamp}_{summary}.json"
+        
+        # Ensure archives dir exists
+        if not os.path.exists("data/archives"): os.makedirs("data/archives")
+        
+        with open(filename, "w", encoding="utf-8") as f_out:
+            json.dump(data, f_out, ensure_ascii=False, indent=2)
+        
+        # Katalogu artimli guncelle (mesajlar zaten bellekte, dosya tekrar okunmaz)
+        archive_catalog.add(os.path.basename(filename), data)
     except Exception as e:
         print(f"Archive Error: {e}")
 # --- END FEATURE: load_history ---
@@ -93,6 +96,59 @@ if not os.path.exists("templates"):
 
 templates = Jinja2Templates(directory="templates")
 
+# --- FEATURE: execution_lanes ---
+def llm_lane():
+    """Aktif motora gore lane: yerel Ollama sirali calisir, Gemini API daha paralel."""
+    return executor.lane("local_llm" if beyin.mode == "local" else "cloud_llm")
+
+def busy_response(error, payload):
+    """Kuyruk dolu: 503 + Retry-After ile geri bas (backpressure)."""
+    print(f"Kuyruk Dolu: {error}")
+    return JSONResponse(payload, status_code=503, headers={"Retry-After": "5"})
+
+@app.get("/system/queue")
+async def queue_status():
+    return executor.stats()
+# --- END FEATURE: execution_lanes ---
+
+# --- FEATURE: metrics_endpoint ---
+LANE_PENDING = REGISTRY.gauge("jarvis_lane_pending", "Lane'de calisan + bekleyen is sayisi.", ("lane",))
+LANE_WORKERS = REGISTRY.gauge("jarvis_lane_workers", "Lane worker sayisi.", ("lane",))
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text formatinda asama sureleri ve kuyruk durumu."""
+    from fastapi.responses import PlainTextResponse
+    for name, stats in executor.stats().items():
+        LANE_PENDING.set(stats["pending"], lane=name)
+        LANE_WORKERS.set(stats["workers"], lane=name)
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+# --- END FEATURE: metrics_endpoint ---
+
+# --- FEATURE: readiness ---
+@app.on_event("startup")
+async def start_warm_up():
+    # Motorlar arka planda kurulur; uvicorn portu beklemeden acar
+    beyin.warm_up()
+    # Ajan saglik kontrolleri arka planda periyodik yenilenir
+    beyin.health.start()
+
+@app.on_event("shutdown")
+def flush_memory():
+    # Bekleyen profil cikarimlari islenir, gecikmeli hafiza yazmalari kapanmadan diske iner
+    beyin.memory.close()
+
+@app.get("/ready")
+async def readiness():
+    """Masaustu kabugu (app.py) pencereyi acmadan once bunu bekler. Hazir degilse 503."""
+    payload = {
+        "ready": beyin.services.ready(),
+        "uptime": round(time.time() - beyin.services.created, 3),
+        "services": beyin.services.status(),
+    }
+    return JSONResponse(payload, status_code=200 if payload["ready"] else 503)
+# --- END FEATURE: readiness ---
+
 # --- FEATURE: get_ip ---
 def get_ip():
     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -119,30 +175,29 @@ async def get_history():
     return load_history()
 
 @app.get("/get_archives")
-async def get_archives():
+async def get_archives(limit: int = None, offset: int = 0):
+    # Katalogdan, en yeni once: [{filename, path, title, created, message_count}]
     try:
-        if not os.path.exists("data/archives"): return []
-        files = glob.glob("data/archives/*.json")
-        # specific sort by date?
-        files.sort(key=os.path.getmtime, reverse=True)
-        # return list of {filename, title}
-        results = []
-        for f in files:
-            # chat_20260211_220000_Hello_World.json
-            basename = os.path.basename(f)
-            # title is usually the part after timestamp
-            # simple parsing
-            results.append({"filename": basename, "path": f})
-        return results
-    except: return []
+        return archive_catalog.list_archives(limit=limit, offset=offset)
+    except Exception as e:
+        print(f"Archive List Error: {e}")
+        return []
+
+@app.get("/search_archives")
+async def search_archives(q: str = "", page: int = 1, page_size: int = 20):
+    """Arsivlenmis sohbetlerde tam metin arama (sayfali)."""
+    try:
+        return archive_catalog.search(q, page=page, page_size=page_size)
+    except Exception as e:
+        print(f"Archive Search Error: {e}")
+        return {"query": q, "page": page, "page_size": page_size, "total": 0, "results": []}
 
 @app.post("/new_chat")
 async def new_chat():
     # Archive first
     archive_current_chat()
     # Clear
-    with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-        json.dump([], f)
+    history_store.clear()
     return {"status": "ok"}
 
 @app.post("/load_chat")
@@ -157,8 +212,8 @@ async def load_chat(filename: str = Form(...)):
             data = json.load(f)
         
         # Overwrite active history
-        with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        history_store.replace(data)
+        archive_catalog.mark_opened(filename)
         return {"status": "loaded"}
     return {"status": "error"}
 
@@ -168,15 +223,17 @@ async def delete_chat(filename: str = Form(...)):
         target_path = os.path.join("data/archives", filename)
         if os.path.exists(target_path):
             os.remove(target_path)
+            archive_catalog.remove(filename)
             return {"status": "deleted"}
+        archive_catalog.remove(filename)
         return {"status": "not_found"}
     except Exception as e:
         return {"status": f"error: {e}"}
 
 @app.get("/get_settings")
 async def get_settings():
-    from utils.settings_manager import SettingsManager
-    sm = SettingsManager()
+    # Surec genelindeki ayar deposu: diskten sadece dosya degistiyse okunur
+    sm = beyin.settings
     # Config + api keys merged response
     result = dict(sm.config)
     # Inject voice_id from api_keys.json so frontend can restore it
@@ -192,19 +249,23 @@ async def save_settings(
     voice_id: str = Form(""), # New: Voice ID
     voice_mode: str = Form("api") # api vs local (Kokoro)
 ):
-    from utils.settings_manager import SettingsManager
-    sm = SettingsManager()
-    sm.set("theme", theme)
-    sm.set("language", language)
-    sm.set("engine_mode", model)
-    sm.set("voice_mode", voice_mode)
+    sm = beyin.settings
     
     # Parse voice boolean
     voice_bool = (voice.lower() == 'true')
-    sm.set("audio_enabled", voice_bool)
     
+    changes = {
+        "theme": theme,
+        "language": language,
+        "engine_mode": model,
+        "voice_mode": voice_mode,
+        "audio_enabled": voice_bool,
+    }
     if voice_id:
-        sm.set("elevenlabs_voice_id", voice_id)
+        changes["elevenlabs_voice_id"] = voice_id
+    
+    # Tek islem: her dosya en fazla bir kez, atomik olarak yazilir
+    sm.update(changes)
     
     # Apply changes immediately where possible
     beyin.set_execution_mode(model)
@@ -217,20 +278,42 @@ async def save_settings(
     return {"status": "saved"}
 # --- END FEATURE: get_ip ---
 
-# Global Progress State
+# Global Progress State (eski istemciler icin; yeni istemciler /progress_stream kullanir)
 CURRENT_PROGRESS = {"status": "idle", "percent": 0, "message": ""}
 
+# Istek bazli ilerleme kanallari (request_id -> SSE olaylari)
+progress_hub = ProgressHub()
+
 # --- FEATURE: update_progress_callback ---
-def update_progress_callback(percent, message=""):
+def update_progress_callback(percent, message="", stage=None):
     global CURRENT_PROGRESS
+    if percent is None:
+        # Asama olayi (komutan, arac cagrisi...) — eski tek-durumlu API'de sadece mesaj
+        if message: CURRENT_PROGRESS["message"] = message
+        return
     CURRENT_PROGRESS["status"] = "generating" if percent < 100 else "idle"
     CURRENT_PROGRESS["percent"] = percent
     CURRENT_PROGRESS["message"] = message
 
+def request_progress(request_id):
+    """Istege ozel progress_callback: olaylari kanala yayinlar, eski global durumu da gunceller."""
+    return progress_hub.callback(request_id, also=update_progress_callback)
+
 @app.get("/get_progress")
 async def get_progress():
     return CURRENT_PROGRESS
 
+@app.get("/progress_stream/{request_id}")
+async def progress_stream(request_id: str):
+    """SSE: tek bir istegin ilerleme/asama olaylari. 'done' olayiyla kapanir."""
+    async def events():
+        async for event in progress_hub.subscribe(request_id):
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @app.post("/save_generated_image")
 async def save_gen_image(image_url: str = Form(...)):
     """Opens a save dialog on the server side (Desktop App) to save the image."""
@@ -274,12 +357,22 @@ async def save_gen_image(image_url: str = Form(...)):
         return {"status": "error", "message": str(e)}
 
 @app.post("/chat")
-async def chat_yap(mesaj: str = Form(...), mod: str = Form(...)):
+async def chat_yap(mesaj: str = Form(...), mod: str = Form(...), request_id: str = Form(None)):
     try:
         print(f"Mobil: {mesaj} | Mod: {mod}")
     except:
         print(f"Mobil: {mesaj.encode('utf-8', 'ignore')} | Mod: {mod}")
-        
+    
+    request_id = request_id or progress_hub.new_request_id()
+    try:
+        cevap = await llm_lane().run(_chat_sync, mesaj, mod, request_id)
+    except ExecutorBusyError as e:
+        progress_hub.close(request_id, status="busy")
+        return busy_response(e, {"cevap": "Sistem şu an meşgul, lütfen birazdan tekrar deneyin.", "status": "busy", "request_id": request_id})
+    return {"cevap": cevap, "request_id": request_id}
+
+def _chat_sync(mesaj, mod, request_id=None):
+    """/chat isinin bloklayan kismi (dosya I/O + model cagrisi), worker thread'inde calisir."""
     save_message("user", mesaj)
     
     # Konuşma geçmişini yükle (son user mesajı dahil)
@@ -289,13 +382,14 @@ async def chat_yap(mesaj: str = Form(...), mod: str = Form(...)):
     global CURRENT_PROGRESS
     CURRENT_PROGRESS = {"status": "idle", "percent": 0, "message": "İşleniyor..."}
     
+    progress = request_progress(request_id)
     try:
         if mod == "sohbet": 
             # Pass callback if supported
-            cevap = beyin.chat_mode(mesaj, history=history, progress_callback=update_progress_callback)
+            cevap = beyin.chat_mode(mesaj, history=history, progress_callback=progress)
         elif mod == "is": cevap = beyin.work_mode(mesaj)
         elif mod == "arastirma": cevap = beyin.research_mode(mesaj)
-        else: cevap = beyin.chat_mode(mesaj, history=history, progress_callback=update_progress_callback)
+        else: cevap = beyin.chat_mode(mesaj, history=history, progress_callback=progress)
         
         # FINAL SAFETY CHECK
         if cevap is None: cevap = "Üzgünüm, boş cevap döndü."
@@ -304,59 +398,75 @@ async def chat_yap(mesaj: str = Form(...), mod: str = Form(...)):
     except Exception as e:
         print(f"Server Chat Error: {e}")
         cevap = f"Teknik bir hata oluştu: {e}"
+    finally:
+        progress_hub.close(request_id)
         
     save_message("ai", cevap)
-    return {"cevap": cevap}
+    return cevap
 # --- END FEATURE: update_progress_callback ---
 
 
 @app.post("/chat_stream")
 # --- FEATURE: chat_stream ---
-async def chat_stream(mesaj: str = Form(...), mod: str = Form(...)):
-    """SSE streaming endpoint - cevabi kelime kelime gonderir."""
+async def chat_stream(mesaj: str = Form(...), mod: str = Form(...), request_id: str = Form(None)):
+    """SSE streaming endpoint - model urettikce token parcalarini aninda gonderir."""
     try:
         print(f"Stream: {mesaj} | Mod: {mod}")
     except:
         print(f"Stream: {mesaj.encode('utf-8', 'ignore')} | Mod: {mod}")
 
-    save_message("user", mesaj)
-    history = load_history()
+    request_id = request_id or progress_hub.new_request_id()
+    progress = request_progress(request_id)
 
-    global CURRENT_PROGRESS
-    CURRENT_PROGRESS = {"status": "idle", "percent": 0, "message": "Isleniyor..."}
+    def answer_chunks():
+        save_message("user", mesaj)
+        history = load_history()
 
-    try:
-        if mod == "sohbet":
-            cevap = beyin.chat_mode(mesaj, history=history, progress_callback=update_progress_callback)
-        elif mod == "is":
-            cevap = beyin.work_mode(mesaj)
+        global CURRENT_PROGRESS
+        CURRENT_PROGRESS = {"status": "idle", "percent": 0, "message": "Isleniyor..."}
+
+        # Is modu tek parca cevap uretir; arastirma kaynak ozetlerini geldikce, sohbet token token akitir
+        if mod == "is":
+            yield beyin.work_mode(mesaj)
         elif mod == "arastirma":
-            cevap = beyin.research_mode(mesaj)
+            yield from beyin.research_mode_stream(mesaj)
         else:
-            cevap = beyin.chat_mode(mesaj, history=history, progress_callback=update_progress_callback)
-
-        if cevap is None:
-            cevap = "Uzgunum, bos cevap dondu."
-        if not isinstance(cevap, str):
-            cevap = str(cevap)
-    except Exception as e:
-        print(f"Server Stream Error: {e}")
-        cevap = f"Teknik bir hata olustu: {e}"
-
-    save_message("ai", cevap)
-
-    import time as _time
+            yield from beyin.chat_mode_stream(mesaj, history=history, progress_callback=progress)
 
     def generate():
-        words = cevap.split(" ")
-        for i, word in enumerate(words):
-            # SSE format: data: <content>\n\n
-            chunk = word if i == 0 else " " + word
-            yield f"data: {json.dumps({'text': chunk, 'done': False}, ensure_ascii=False)}\n\n"
-            _time.sleep(0.03)
+        # Senkron generator: LLM lane'inde tek is olarak tuketilir, event loop bloklanmaz
+        chunks = []
+        try:
+            for chunk in answer_chunks():
+                if chunk is None:
+                    continue
+                if not isinstance(chunk, str):
+                    chunk = str(chunk)
+                if not chunk:
+                    continue
+                chunks.append(chunk)
+                # SSE format: data: <content>\n\n
+                yield f"data: {json.dumps({'text': chunk, 'done': False}, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            print(f"Server Stream Error: {e}")
+            chunks.append(f"Teknik bir hata olustu: {e}")
+            yield f"data: {json.dumps({'text': chunks[-1], 'done': False}, ensure_ascii=False)}\n\n"
+        finally:
+            progress_hub.close(request_id)
+
+        if not chunks:
+            chunks.append("Uzgunum, bos cevap dondu.")
+            yield f"data: {json.dumps({'text': chunks[-1], 'done': False}, ensure_ascii=False)}\n\n"
+
+        save_message("ai", "".join(chunks))
         yield f"data: {json.dumps({'text': '', 'done': True}, ensure_ascii=False)}\n\n"
 
-    return StreamingResponse(generate(), media_type="text/event-stream")
+    try:
+        body = llm_lane().open_stream(generate())
+    except ExecutorBusyError as e:
+        progress_hub.close(request_id, status="busy")
+        return busy_response(e, {"cevap": "Sistem şu an meşgul, lütfen birazdan tekrar deneyin.", "status": "busy", "request_id": request_id})
+    return StreamingResponse(body, media_type="text/event-stream", headers={"X-Request-Id": request_id})
 # --- END FEATURE: chat_stream ---
 
 
@@ -365,30 +475,36 @@ async def chat_stream(mesaj: str = Form(...), mod: str = Form(...)):
 # --- FEATURE: speech_to_text ---
 async def speech_to_text(audio: UploadFile = File(...)):
     """Ses dosyasini metne cevir (Faster-Whisper)."""
-    import tempfile
     try:
-        # Dosyayi gecici olarak kaydet
         suffix = ".webm" if "webm" in (audio.content_type or "") else ".wav"
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir="data/temp_audio") as tmp:
-            content = await audio.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        
-        # STT ile metne cevir
-        from utils.local_voice_manager import LocalVoiceManager
-        if not hasattr(speech_to_text, '_stt'):
-            speech_to_text._stt = LocalVoiceManager()
-        
-        text = speech_to_text._stt.transcribe(tmp_path)
-        
-        # Temp dosyayi temizle
-        try: os.remove(tmp_path)
-        except: pass
-        
+        content = await audio.read()
+        text = await executor.lane("speech").run(_transcribe_sync, content, suffix)
         return JSONResponse({"text": text, "status": "ok"})
+    except ExecutorBusyError as e:
+        return busy_response(e, {"text": "", "status": "busy", "message": "Ses motoru meşgul"})
     except Exception as e:
         print(f"STT Error: {e}")
         return JSONResponse({"text": "", "status": "error", "message": str(e)})
+
+def _transcribe_sync(content, suffix):
+    """Temp dosya yazma + Whisper transkripsiyonu (speech lane'inde calisir)."""
+    import tempfile
+    # Dosyayi gecici olarak kaydet
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir="data/temp_audio") as tmp:
+        tmp.write(content)
+        tmp_path = tmp.name
+    
+    # STT ile metne cevir
+    from utils.local_voice_manager import LocalVoiceManager
+    if not hasattr(speech_to_text, '_stt'):
+        speech_to_text._stt = LocalVoiceManager()
+    
+    try:
+        return speech_to_text._stt.transcribe(tmp_path)
+    finally:
+        # Temp dosyayi temizle
+        try: os.remove(tmp_path)
+        except: pass
 # --- END FEATURE: speech_to_text ---
 
 # ==================== TEXT-TO-SPEECH (TTS) ====================
@@ -397,18 +513,22 @@ async def speech_to_text(audio: UploadFile = File(...)):
 async def text_to_speech(text: str = Form(...)):
     """Metni ses dosyasina cevir (Kokoro-ONNX)."""
     try:
-        from utils.local_voice_manager import LocalVoiceManager
-        if not hasattr(text_to_speech, '_tts'):
-            text_to_speech._tts = LocalVoiceManager()
-        
-        filepath = text_to_speech._tts.speak(text)
+        filepath = await executor.lane("speech").run(_speak_sync, text)
         if filepath and os.path.exists(filepath):
             return FileResponse(filepath, media_type="audio/wav", filename="speech.wav")
         else:
             return JSONResponse({"status": "error", "message": "Ses uretilemedi"})
+    except ExecutorBusyError as e:
+        return busy_response(e, {"status": "busy", "message": "Ses motoru meşgul"})
     except Exception as e:
         print(f"TTS Error: {e}")
         return JSONResponse({"status": "error", "message": str(e)})
+
+def _speak_sync(text):
+    from utils.local_voice_manager import LocalVoiceManager
+    if not hasattr(text_to_speech, '_tts'):
+        text_to_speech._tts = LocalVoiceManager()
+    return text_to_speech._tts.speak(text)
 # --- END FEATURE: text_to_speech ---
 
 # ==================== BROWSER CONTROL ====================
@@ -421,6 +541,13 @@ async def browser_control(mesaj: str = Form(...)):
     except:
         print(f"Browser: {mesaj.encode('utf-8', 'ignore')}")
     
+    try:
+        cevap = await executor.lane("browser").run(_browser_sync, mesaj)
+    except ExecutorBusyError as e:
+        return busy_response(e, {"cevap": "Tarayıcı şu an başka bir görevle meşgul.", "status": "busy"})
+    return {"cevap": cevap}
+
+def _browser_sync(mesaj):
     save_message("user", mesaj)
     
     try:
@@ -432,30 +559,18 @@ async def browser_control(mesaj: str = Form(...)):
         cevap = f"Tarayici hatasi: {e}"
     
     save_message("ai", cevap)
-    return {"cevap": cevap}
+    return cevap
 # --- END FEATURE: browser_control ---
 
 
 @app.get("/system/test_agents")
 # --- FEATURE: test_agents_endpoint ---
-async def test_agents_endpoint():
+async def test_agents_endpoint(refresh: bool = False):
+    """Son saglik durumu (onbellekten, aninda). ?refresh=1: tum modeller paralel ve derin denenir."""
     try:
-        # Check Mode
-        if beyin.mode == "api":
-             res = beyin.gemini.test_connection()
-             return [{
-                 "agent": "GEMINI CLOUD",
-                 "model": res.get("model", "Unknown"),
-                 "status": res.get("status", "FAIL"),
-                 "msg": res.get("msg", ""),
-                 "time": res.get("time", ""),
-                 "response": res.get("response", "")
-             }]
-        else:
-            # Local Mode
-            report = beyin.local_brain.test_agents()
-            return report
-            
+        if refresh:
+            await asyncio.to_thread(beyin.health.refresh, True, True)
+        return beyin.health.status()
     except Exception as e:
         return [{"agent": "SERVER ERROR", "status": "FAIL", "msg": str(e)}]
 # --- END FEATURE: test_agents_endpoint ---
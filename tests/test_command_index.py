@@ -0,0 +1,63 @@
+import sys
+import os
+
+# Update path to include parent directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engines.command_index import CommandIndex
+
+PATHS = {"home": "C:\\Users\\test", "desktop": "C:\\Users\\test\\Desktop",
+         "documents": "C:\\Users\\test\\Documents", "downloads": "C:\\Users\\test\\Downloads"}
+
+def test_intent_examples_match_templates():
+    index = CommandIndex(PATHS)
+    cases = [
+        ("Spotify'ı aç", "Start-Process spotify"),
+        ("Chrome'u kapat", 'Stop-Process -Name "chrome" -Force -ErrorAction SilentlyContinue'),
+        ("Sesi kıs lütfen", "(New-Object -ComObject WScript.Shell).SendKeys([char]174)"),
+        ("Temp temizle", 'Remove-Item -Path "$env:TEMP\\*" -Recurse -Force -ErrorAction SilentlyContinue'),
+        ("Bilgisayarı kapat", "Stop-Computer -Force"),
+    ]
+    for prompt, command in cases:
+        assert index.match(prompt).command == command, prompt
+
+def test_slots_keep_original_text():
+    index = CommandIndex(PATHS)
+    folder = index.match("Masaüstüne Proje Notları klasörü oluştur")
+    assert folder.command == 'New-Item -Path "C:\\Users\\test\\Desktop\\Proje Notları" -ItemType Directory -Force'
+    search = index.match("YouTube'da lofi müzik ara")
+    assert search.command == 'Start-Process "https://www.youtube.com/results?search_query=lofi+m%C3%BCzik"'
+
+def test_fuzzy_only_for_safe_commands():
+    index = CommandIndex(PATHS)
+    assert index.match("Chorme'u kapat").id == "close:chrome"
+    assert index.match("bilgisyarı kapat") is None
+    for prompt in ["../Windows klasörünü sil", "bana bir şiir yaz", "kapıyı kapat"]:
+        assert index.match(prompt) is None, prompt
+
+def test_exact_verb_object_beats_fuzzy_phrase():
+    index = CommandIndex(PATHS)
+    assert index.match("sesi kapat").id == "volume:mute"
+
+def test_negated_commands_go_to_llm():
+    index = CommandIndex(PATHS)
+    for prompt in ["ekranı kilitleme", "sesi açma", "ip adresimi gösterme", "Chrome'u kapatma lütfen"]:
+        assert index.match(prompt) is None, prompt
+
+def test_quantified_deletes_go_to_llm():
+    index = CommandIndex(PATHS)
+    for prompt in ["masaüstündeki tüm dosyaları sil", "tüm klasörleri sil", "bütün klasörü sil", "hepsini dosya sil"]:
+        assert index.match(prompt) is None, prompt
+    assert index.match("Ödevler klasörünü sil").id == "delete:folder"
+
+def test_questions_never_run_irreversible_templates():
+    index = CommandIndex(PATHS)
+    for prompt in ["bilgisayarı kapatır mı", "Bilgisayarı kapatır mısın?", "temp temizler misin", "yeniden başlat mı"]:
+        assert index.match(prompt) is None, prompt
+    assert index.match("Chrome'u kapatır mısın").id == "close:chrome"
+
+def test_unsafe_delete_names_go_to_llm():
+    index = CommandIndex(PATHS)
+    assert index.match("Proje dosyasını sil") is None
+    assert index.match('"evil"; rm klasörünü sil') is None
+    assert index.match("rapor.docx dosyasını sil").command == 'Remove-Item -Path "C:\\Users\\test\\Desktop\\rapor.docx" -Force'
@@ -0,0 +1,121 @@
+import sys
+import os
+import time
+
+# Update path to include parent directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'tools')))
+
+from fake_ollama import FakeOllama, LatencyProfile, start_server
+from engines.ollama_client import OllamaPool
+
+class _Settings:
+    def __init__(self, url):
+        self.values = {"ollama": {"hosts": [url], "web_host": url}}
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+def _pool():
+    # Gecikmeler 1000x hizli: test saniyeler degil milisaniyeler surer
+    fake = FakeOllama(LatencyProfile(speed=1000, seed=1))
+    server, url = start_server(0, fake)
+    return server, fake, OllamaPool(_Settings(url))
+
+def test_chat_stream_reports_ollama_stats():
+    server, fake, pool = _pool()
+    try:
+        chunks = list(pool.chat("qwen3.5:9b", [{"role": "user", "content": "Merhaba"}], role="chat", stream=True))
+        text = "".join(c.message.content for c in chunks)
+        assert text.startswith("Elbette efendim")
+        last = chunks[-1]
+        assert last.done and last.eval_count > 0 and last.eval_duration > 0 and last.load_duration > 0
+    finally:
+        server.shutdown()
+
+def test_keep_alive_and_unload_reflected_in_ps():
+    server, fake, pool = _pool()
+    try:
+        pool.chat("phi4-mini", [{"role": "user", "content": "hi"}], role="commander")
+        assert [m.model for m in pool.ps().models] == ["phi4-mini:latest"]
+        # Ikinci cagri yuklu modele gider: yukleme suresi yok
+        res = pool.chat("phi4-mini", [{"role": "user", "content": "hi"}], role="commander")
+        assert res.load_duration == 0
+        pool.client().generate(model="phi4-mini", keep_alive=0)
+        assert pool.ps().models == []
+    finally:
+        server.shutdown()
+
+def test_web_search_routed_to_configured_host():
+    server, fake, pool = _pool()
+    try:
+        res = pool.web_search("dolar kac tl", max_results=2)
+        assert len(res.results) == 2 and "dolar kac tl" in res.results[0].content
+    finally:
+        server.shutdown()
+
+def test_residency_keeps_untagged_pinned_model():
+    # config "phi4-mini", /api/ps "phi4-mini:latest": sabit model bosaltilmamali
+    from engines.model_residency import ModelResidencyManager
+    server, fake, pool = _pool()
+    try:
+        pool.chat("phi4-mini", [{"role": "user", "content": "hi"}], role="commander")
+        pool.chat("qwen3.5:9b", [{"role": "user", "content": "hi"}], role="chat")
+        loaded = {m.model: m.size for m in pool.ps().models}
+        assert set(loaded) == {"phi4-mini:latest", "qwen3.5:9b"}
+        residency = ModelResidencyManager(pool, config={"ram_budget_gb": sum(loaded.values()) / 1024 ** 3})
+        residency.role_models = {"commander": "phi4-mini", "chat": "qwen3.5:9b"}
+        assert residency.prepare("commander", "phi4-mini") == "phi4-mini"
+        assert residency.keep_alive_for("vision", "phi4-mini") == -1
+        assert {m.model for m in pool.ps().models} == set(loaded)
+        # Butce asilsa bile sabit modeller yerinde kalir, sadece sabit olmayan bosaltilir
+        pool.chat("moondream", [{"role": "user", "content": "hi"}], role="vision")
+        residency.prepare("analyst", "llama3.1:8b")
+        assert "phi4-mini:latest" in {m.model for m in pool.ps().models}
+    finally:
+        server.shutdown()
+
+def test_residency_does_not_hold_lock_during_network_calls():
+    # Yavas /api/ps: diger ajanlarin prepare() kararlari onun arkasinda beklememeli
+    import threading
+    from types import SimpleNamespace
+    from engines.model_residency import ModelResidencyManager
+    release = threading.Event()
+
+    class SlowPool:
+        def ps(self):
+            release.wait(5)
+            return SimpleNamespace(models=[])
+        def list(self):
+            return SimpleNamespace(models=[])
+
+    residency = ModelResidencyManager(SlowPool(), config={"ram_budget_gb": 1})
+    worker = threading.Thread(target=residency.prepare, args=("chat", "qwen3.5:9b"))
+    worker.start()
+    try:
+        time.sleep(0.1)
+        assert residency._lock.acquire(timeout=0.5)
+        residency._lock.release()
+    finally:
+        release.set()
+        worker.join()
+
+def test_cancel_interrupts_stream_before_first_chunk():
+    # Soguk model yuklenirken (ilk parcadan once) iptal: HTTP akisi hemen kesilmeli
+    from engines.ollama_client import CancelToken
+    from utils.speculative import BackgroundStream
+    fake = FakeOllama(LatencyProfile(overrides={"yavas:1b": {"load": 3}}, jitter=0, seed=1))
+    server, url = start_server(0, fake)
+    pool = OllamaPool(_Settings(url))
+    try:
+        cancel = CancelToken()
+        stream = BackgroundStream(pool.chat("yavas:1b", [{"role": "user", "content": "hi"}], stream=True, cancel=cancel),
+                                  on_cancel=cancel.cancel)
+        time.sleep(0.3)
+        started = time.time()
+        stream.cancel()
+        stream._thread.join(2)
+        assert not stream._thread.is_alive() and time.time() - started < 1
+        assert stream.chunks == 0
+    finally:
+        server.shutdown()
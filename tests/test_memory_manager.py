@@ -0,0 +1,169 @@
+import sys
+import os
+import json
+import threading
+
+import pytest
+
+# Update path to include parent directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.memory_manager import MemoryManager
+
+def test_reads_from_ram_and_writes_are_coalesced(tmp_path):
+    memory = MemoryManager(directory=str(tmp_path), settings={"memory": {"flush_delay": 60}})
+    memory.remember("Benim adım Ahmet", "Memnun oldum")
+    memory.remember("Galatasaray'ı severim", "Harika")
+    # Henuz diske yazilmadi, okumalar RAM'den
+    with open(memory.memory_file, encoding="utf-8") as f:
+        assert json.load(f)["facts"] == []
+    assert "Ahmet" in memory.get_context()
+
+    memory.flush()
+    with open(memory.memory_file, encoding="utf-8") as f:
+        assert len(json.load(f)["facts"]) == 2
+    assert not os.path.exists(memory.memory_file + ".tmp")
+    assert "Ahmet" in MemoryManager(directory=str(tmp_path)).get_context()
+
+def test_profile_copy_is_isolated(tmp_path):
+    memory = MemoryManager(directory=str(tmp_path), settings={"memory": {"flush_delay": 0.01}})
+    profile = memory.get_user_profile()
+    profile["identity"]["name"] = "Ayşe"
+    assert memory.get_cloud_context() == ""
+    memory.save_user_profile(profile)
+    timer = memory._timer
+    assert "Ayşe" in memory.get_cloud_context()
+    timer.join()
+    with open(memory.profile_file, encoding="utf-8") as f:
+        assert json.load(f)["identity"]["name"] == "Ayşe"
+
+def test_context_is_top_k_relevant_facts(tmp_path):
+    settings = {"memory": {"flush_delay": 60, "top_k": 2}}
+    memory = MemoryManager(directory=str(tmp_path), settings=settings)
+    for i in range(40):
+        memory.remember(f"Proje {i} için toplantı notu", "")
+    memory.remember("Galatasaray'ı severim", "")
+    memory.remember("Telefonum Samsung Galaxy", "")
+    context = json.loads(memory.get_context("Hangi takımı severim, Galatasaray mı?"))
+    assert len(context) <= 2 and context[0] == "Galatasaray'ı severim"
+    assert len(json.loads(memory.get_context())) == 42
+
+    # Dizin diske yazilir, yeniden acilista tekrar gomulmeden yuklenir
+    memory.flush()
+    reopened = MemoryManager(directory=str(tmp_path), settings=settings)
+    assert len(reopened.fact_index) == 42 and not reopened.fact_index.dirty
+    assert json.loads(reopened.get_context("telefonum ne"))[0] == "Telefonum Samsung Galaxy"
+
+def test_profile_updates_skip_known_values(tmp_path):
+    memory = MemoryManager(directory=str(tmp_path), settings={"memory": {"flush_delay": 60}})
+    first = memory.apply_profile_update({"identity": {"name": "Ahmet"}, "notes": ["Kedisi var"]})
+    assert first == {"identity": {"name": "Ahmet"}, "notes": ["Kedisi var"]}
+    # Ayni bilgi tekrar gelirse profil yazilmaz
+    assert memory.apply_profile_update({"identity": {"name": "Ahmet"}, "notes": ["Kedisi var"]}) == {}
+    assert memory.apply_profile_update({"identity": {"name": "Ahmet", "age": "30"}}) == {"identity": {"age": "30"}}
+    assert memory.get_user_profile()["notes"] == ["Kedisi var"]
+
+def test_profile_update_embeds_outside_lock(tmp_path):
+    # Profil dizini gomme yaparken (Ollama cagrisi) okuyucular kilitte beklememeli
+    memory = MemoryManager(directory=str(tmp_path), settings={"memory": {"flush_delay": 60}})
+    release, entered = threading.Event(), threading.Event()
+    sync = memory.profile_index.sync
+
+    def slow_sync(items):
+        entered.set()
+        release.wait(5)
+        sync(items)
+    memory.profile_index.sync = slow_sync
+    worker = threading.Thread(target=memory.apply_profile_update, args=({"identity": {"name": "Ahmet"}},))
+    worker.start()
+    try:
+        assert entered.wait(2)
+        assert memory._lock.acquire(timeout=0.5)
+        memory._lock.release()
+        assert "Ahmet" in memory.get_cloud_context()
+    finally:
+        release.set()
+        worker.join()
+
+def test_cloud_context_falls_back_to_recent_items(tmp_path):
+    memory = MemoryManager(directory=str(tmp_path), settings={"memory": {"flush_delay": 60, "top_k": 2}})
+    memory.apply_profile_update({"identity": {"name": "Ahmet"}, "preferences": {"fav_team": "Galatasaray"},
+                                 "notes": ["Kedisi var", "Sabah kosuya cikar", "Python ile calisir"]})
+    # Sorguyla hic ilgili kayit yok: sadece kimlik degil, en yeni kayitlar da gelmeli
+    context = memory.get_cloud_context("zzzz qqqq")
+    assert "Ahmet" in context and "Python ile calisir" in context
+    assert "Galatasaray" not in context
+
+def _cloud_memory(tmp_path, **config):
+    settings = {"memory": dict({"flush_delay": 60, "extract_window": 0}, **config)}
+    return MemoryManager(directory=str(tmp_path), settings=settings)
+
+def _record_batches(memory, block=None):
+    batches, entered = [], threading.Event()
+
+    def extract(messages, gemini_client, model_name):
+        batches.append([msg for msg, _ in messages])
+        entered.set()
+        if block is not None:
+            block.wait(5)
+    memory._extract_personal_info = extract
+    return batches, entered
+
+MESSAGES = ["Benim adım Ahmet", "Galatasaray tutuyorum", "İstanbul'da yaşıyorum",
+            "Telefonum Samsung", "Mühendis olarak çalışıyorum"]
+
+def test_cloud_extraction_batches_messages(tmp_path):
+    memory = _cloud_memory(tmp_path, extract_batch=3, extract_window=1.0)
+    batches, _ = _record_batches(memory)
+    for msg in MESSAGES:
+        memory.remember_cloud(msg, "Tamam", None, "gemini")
+    memory.remember_cloud("merhaba", "Selam", None, "gemini")   # On-filtre: kuyruga girmez
+    memory.close(timeout=3)
+    assert [len(b) for b in batches] == [3, 2]
+    assert sum(batches, []) == MESSAGES
+
+def test_cloud_extraction_drops_oldest_when_full(tmp_path):
+    memory = _cloud_memory(tmp_path, extract_queue=2)
+    release = threading.Event()
+    batches, entered = _record_batches(memory, block=release)
+    memory.remember_cloud(MESSAGES[0], "", None, "gemini")
+    assert entered.wait(2)   # Isci ilk isi aldi ve mesgul
+    for msg in MESSAGES[1:4]:
+        memory.remember_cloud(msg, "", None, "gemini")
+    release.set()
+    memory.close(timeout=3)
+    # Kuyruk 2: MESSAGES[1] yerini daha yeni mesajlara birakti
+    assert sum(batches, []) == [MESSAGES[0], MESSAGES[2], MESSAGES[3]]
+
+def test_close_drains_queue_and_writes_profile(tmp_path):
+    memory = _cloud_memory(tmp_path, extract_window=5.0)
+
+    def extract(messages, gemini_client, model_name):
+        memory.apply_profile_update({"notes": [msg for msg, _ in messages]})
+    memory._extract_personal_info = extract
+    memory.remember_cloud(MESSAGES[0], "", None, "gemini")
+    memory.remember_cloud(MESSAGES[1], "", None, "gemini")
+    # Grup penceresi (5 sn) beklenmeden islenir ve diske yazilir
+    memory.close(timeout=2)
+    with open(memory.profile_file, encoding="utf-8") as f:
+        assert json.load(f)["notes"] == MESSAGES[:2]
+
+def test_cloud_extraction_uses_one_gemini_call_per_batch(tmp_path):
+    pytest.importorskip("google.genai")
+    from types import SimpleNamespace
+    calls = []
+
+    class Models:
+        def generate_content(self, model, contents, config):
+            calls.append(contents)
+            part = SimpleNamespace(text='```json\n{"identity": {"name": "Ahmet"}, "preferences": {"fav_team": "Galatasaray"}}\n```')
+            return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+    memory = _cloud_memory(tmp_path, extract_batch=4, extract_window=1.0)
+    client = SimpleNamespace(models=Models())
+    memory.remember_cloud(MESSAGES[0], "Memnun oldum", client, "gemini")
+    memory.remember_cloud(MESSAGES[1], "Harika", client, "gemini")
+    memory.close(timeout=3)
+    assert len(calls) == 1 and MESSAGES[0] in calls[0] and MESSAGES[1] in calls[0]
+    profile = memory.get_user_profile()
+    assert profile["identity"]["name"] == "Ahmet" and profile["preferences"]["fav_team"] == "Galatasaray"
@@ -0,0 +1,32 @@
+import sys
+import os
+import asyncio
+
+# Update path to include parent directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.progress_hub import ProgressHub
+
+def test_subscription_to_unpublished_request_expires():
+    # Hic yayinlanmayan request_id: keepalive'larla sonsuza dek acik kalmamali
+    hub = ProgressHub()
+    hub.IDLE_TTL = 0.05
+
+    async def consume():
+        return [event async for event in hub.subscribe("yok", keepalive=0.02)]
+
+    events = asyncio.run(asyncio.wait_for(consume(), timeout=2))
+    assert events[-1]["type"] == "done"
+    assert events[-1]["status"] == "expired"
+
+def test_subscription_ends_on_close():
+    hub = ProgressHub()
+    hub.publish("r1", 50, "yariya geldi")
+    hub.close("r1")
+
+    async def consume():
+        return [event async for event in hub.subscribe("r1")]
+
+    events = asyncio.run(consume())
+    assert [e["type"] for e in events] == ["progress", "done"]
+    assert events[-1]["status"] == "done"
@@ -0,0 +1,35 @@
+import sys
+import os
+import gc
+import asyncio
+
+# Update path to include parent directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.request_executor import WorkerLane
+
+def _words():
+    yield "merhaba"
+    yield "dunya"
+
+def test_stream_releases_slot_after_consumption():
+    lane = WorkerLane("test", workers=1, max_queue=2)
+
+    async def consume():
+        return [chunk async for chunk in lane.open_stream(_words())]
+
+    assert asyncio.run(consume()) == ["merhaba", "dunya"]
+    assert lane.stats()["pending"] == 0
+
+def test_unconsumed_stream_does_not_leak_slot():
+    # Istemci yanit baslamadan koptu: govde hic iterate edilmedi
+    lane = WorkerLane("test", workers=1, max_queue=2)
+    stream = lane.open_stream(_words())
+    assert lane.stats()["pending"] == 1
+    asyncio.run(stream.aclose())
+    assert lane.stats()["pending"] == 0
+
+    lane.open_stream(_words())
+    lane.open_stream(_words())
+    gc.collect()
+    assert lane.stats()["pending"] == 0
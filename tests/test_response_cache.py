@@ -0,0 +1,38 @@
+import sys
+import os
+
+# Update path to include parent directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.response_cache import ResponseCache
+
+class _Settings:
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+def test_no_semantic_hits_without_dense_embedding_model():
+    cache = ResponseCache(_Settings({"response_cache": {}}))
+    cache.store("Bana yapay zekanın tarihçesini detaylı bir şekilde anlatır mısın", "Tarihçe...", "CHAT")
+    assert cache.lookup("Bana yapay zekanın geleceğini detaylı bir şekilde anlatır mısın") is None
+    # Noktalama/harf farki exact katmanda yine eslesir
+    hit = cache.lookup("bana yapay zekanin tarihcesini detayli bir sekilde anlatir misin?")
+    assert hit["tier"] == "exact"
+
+def test_exact_key_keeps_meaningful_symbols():
+    cache = ResponseCache(_Settings({"response_cache": {}}))
+    cache.store("C++ nedir", "C++ bir programlama dilidir.", "CHAT")
+    assert cache.lookup("C# nedir") is None
+    assert cache.lookup("C nedir") is None
+    assert cache.lookup("c++ nedir?")["answer"] == "C++ bir programlama dilidir."
+
+def test_memory_state_and_cloud_answers():
+    cache = ResponseCache(_Settings({"response_cache": {}}))
+    assert not cache.store("saat kaç", "Saat 14:05", "CLOUD")
+    cache.store("adım ne", "Adınız Ahmet efendim.", "CHAT", context='["Benim adım Ahmet"]')
+    assert cache.lookup("adım ne", context='["Benim adım Ahmet"]')["answer"] == "Adınız Ahmet efendim."
+    # Hafiza degisti: eski cevap tekrar oynatilmaz
+    assert cache.lookup("adım ne", context='["Benim adım Mehmet"]') is None
+    assert cache.lookup("adım ne") is None
@@ -0,0 +1,39 @@
+import sys
+import os
+import time
+import threading
+from types import SimpleNamespace
+
+# Update path to include parent directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engines.local_brain import LocalBrain
+
+def _brain(timeout=0.2):
+    return SimpleNamespace(settings={"search_tools": {"max_workers": 2, "timeout": timeout}},
+                           _format_search_results=lambda result, query: str(result))
+
+def _call(name, **args):
+    return SimpleNamespace(function=SimpleNamespace(name=name, arguments=args))
+
+def test_hung_tool_does_not_block_next_batch():
+    release = threading.Event()
+    tools = {"web_fetch": lambda url: release.wait(5) and "geç", "web_search": lambda query: "sonuc"}
+    try:
+        first = LocalBrain._run_tool_calls(_brain(), [_call("web_fetch", url="a"), _call("web_fetch", url="b")], tools)
+        assert all("basarisiz" in m["content"] for m in first)
+        # Askidaki iki fetch hala calisiyor; yeni aramalar onlarin arkasinda beklememeli
+        start = time.time()
+        second = LocalBrain._run_tool_calls(_brain(), [_call("web_search", query="y"), _call("web_search", query="z")], tools)
+        assert [m["content"] for m in second] == ["sonuc", "sonuc"]
+        assert time.time() - start < 0.2
+    finally:
+        release.set()
+
+def test_all_failures_are_reported_together():
+    def broken(query):
+        raise RuntimeError(f"{query} kirik")
+    messages = LocalBrain._run_tool_calls(_brain(), [_call("web_search", query="a"), _call("web_search", query="b")],
+                                          {"web_search": broken})
+    assert len(messages) == 2
+    assert "a kirik" in messages[-1]["content"] and "b kirik" in messages[-1]["content"]
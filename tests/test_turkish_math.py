@@ -0,0 +1,69 @@
+import sys
+import os
+
+# Update path to include parent directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from engines.turkish_math import calculate, safe_eval, MathParseError
+from engines.fast_path import FastPathRouter
+
+def test_math_agent_prompt_examples():
+    # local_brain._agent_math sistem prompt'undaki ornekler (LLM gerektirmez)
+    cases = [
+        ("500 çarpı 5", "2500"),
+        ("100 bölü 4", "25"),
+        ("5'in karesi", "25"),
+        ("2 üzeri 10", "1024"),
+        ("4'ün 5. kuvveti", "1024"),
+        ("100'ün karekökü", "10"),
+        ("karekök 144", "12"),
+        ("27'nin küp kökü", "3"),
+        ("500'ün yüzde 20'si", "100"),
+        ("200'ün yüzde kaçı 50", "25"),
+        ("sinus 30", "0.5"),
+        ("-15'in mutlak değeri", "15"),
+        ("10 faktöriyel", "3628800"),
+        ("5 artı 3 çarpı 2", "11"),
+        ("parantez 5 artı 3 parantez kapat çarpı 2", "16"),
+        ("bin çarpı bin", "1000000"),
+        ("iki yüz elli artı üç buçuk", "253.5"),
+    ]
+    for prompt, expected in cases:
+        assert calculate(prompt)[1] == expected, prompt
+
+def test_percent_and_units():
+    assert calculate("100 artı yüzde 18")[1] == "118"
+    assert calculate("5 km kaç metre")[1] == "5000 metre"
+    assert calculate("90 dakika kaç saat")[1] == "1.5 saat"
+    with pytest.raises(MathParseError):
+        calculate("5 km kaç kg")
+
+def test_unparseable_falls_back_to_llm():
+    for prompt in ["Einstein kimdir", "üç kere geldi", "pi'yi 4 basamağa yuvarla"]:
+        with pytest.raises(MathParseError):
+            calculate(prompt)
+
+def test_safe_eval_rejects_code_and_huge_numbers():
+    assert safe_eval("math.sqrt(16) + abs(-2)") == 6
+    for expr in ["__import__('os')", "().__class__", "open('x')", "9 ** 9 ** 9"]:
+        with pytest.raises(ValueError):
+            safe_eval(expr)
+
+def test_fast_path_requires_an_operation():
+    router = FastPathRouter()
+    assert router.match("500 artı 200")[2] == "700"
+    assert router.match("10 bölü 0")[2] == "Sıfıra bölme tanımsız efendim."
+    assert router.match("on iki") is None
+    assert router.match("maç saat kaçta başlıyor") is None
+    assert router.match("Saat kaç?")[0] == "time"
+
+def test_fast_path_leaves_bare_symbol_tokens_to_normal_route():
+    # Saat, oran, skor ve deyimler hesap degil
+    router = FastPathRouter()
+    for prompt in ["3:30", "16:9", "1-0", "yüzde yüz", "%20"]:
+        assert router.match(prompt) is None, prompt
+    assert router.match("5 + 3")[2] == "8"
+    assert router.match("500'ün yüzde 20'si")[2] == "100"
+    assert router.match("144'ün karekökü")[2] == "12"
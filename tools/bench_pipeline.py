@@ -0,0 +1,231 @@
+"""
+Pipeline benchmark — LocalBrain / EngineManager hattini sahte Ollama'ya karsi olcer.
+tools/fake_ollama.py'yi ayni surecte baslatir, tum Ollama trafigini ona yonlendirir ve
+intent yolu bazinda ilk parca (TTFC) ve toplam sure icin p50/p95/p99 + throughput yazar.
+
+Kullanici verisi (hafiza, gecmis, onbellek) etkilenmesin diye is gecici bir calisma
+dizininde yapilir: config.json ve intent ornekleri oraya kopyalanir.
+
+Kullanim:
+    python tools/bench_pipeline.py [--target brain|manager] [--requests 100] [--concurrency 1]
+                                   [--intents CHAT,SEARCH,CODING,MATH,SYSTEM_REPORT]
+                                   [--speed 20] [--recordings data/bench/recordings.jsonl] [--json]
+SYSTEM / BROWSER / VISION / IMAGE varsayilan olarak disaridadir (gercek komut/tarayici calistirirlar).
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+from collections import defaultdict
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fake_ollama import FakeOllama, LatencyProfile, Recordings, start_server
+
+# --- FEATURE: bench_pipeline ---
+SAFE_INTENTS = ["CHAT", "SEARCH", "CODING", "MATH", "SYSTEM_REPORT"]
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * q / 100.0
+    low = int(index)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (index - low)
+
+
+def build_workload(intents, total, seed=3):
+    """Etiketli orneklerden intent basina esit dagilimli istek listesi: [(beklenen_intent, prompt)]."""
+    with open(os.path.join(ROOT, "data", "intent_examples.json"), "r", encoding="utf-8") as f:
+        examples = json.load(f)
+    rng = random.Random(seed)
+    workload = []
+    for i in range(total):
+        intent = intents[i % len(intents)]
+        workload.append((intent, rng.choice(examples[intent])))
+    rng.shuffle(workload)
+    return workload
+
+
+def prepare_workdir(path=None):
+    """Gecici calisma dizini: ayarlar ve ornekler kopyalanir, kullanici data/ dosyalarina dokunulmaz."""
+    workdir = path or tempfile.mkdtemp(prefix="jarvis_bench_")
+    os.makedirs(os.path.join(workdir, "data"), exist_ok=True)
+    shutil.copy(os.path.join(ROOT, "config.json"), os.path.join(workdir, "config.json"))
+    shutil.copy(os.path.join(ROOT, "data", "intent_examples.json"),
+                os.path.join(workdir, "data", "intent_examples.json"))
+    return workdir
+
+
+def make_runner(target):
+    """Donus: (run(prompt) -> (intent yolu, ttfc, toplam sure), cache_report() -> onek cache ozeti)."""
+    if target == "manager":
+        from engines.manager import EngineManager
+        manager = EngineManager()
+        manager.set_execution_mode("local")
+
+        def run(prompt):
+            start = time.perf_counter()
+            ttfc = None
+            for _ in manager.chat_mode_stream(prompt, history=[]):
+                if ttfc is None:
+                    ttfc = time.perf_counter() - start
+            # EngineManager intent'i disari vermez; tum istekler tek yol olarak raporlanir
+            return "manager", ttfc, time.perf_counter() - start
+        def cache_report():
+            if not manager.services.is_built("local_brain"):
+                return {}
+            return manager.local_brain.context.cache_report()
+        return run, cache_report
+
+    from engines.local_brain import LocalBrain
+    brain = LocalBrain()
+
+    def run(prompt):
+        trace = {}
+        start = time.perf_counter()
+        ttfc = None
+        for _ in brain.process_request_stream(prompt, trace=trace):
+            if ttfc is None:
+                ttfc = time.perf_counter() - start
+        return trace.get("intent", "?"), ttfc, time.perf_counter() - start
+    return run, brain.context.cache_report
+
+
+def run_bench(run, workload, concurrency, warmup):
+    for _, prompt in workload[:warmup]:
+        run(prompt)
+
+    results = []
+    lock = threading.Lock()
+    queue = list(workload[warmup:])
+
+    def worker():
+        while True:
+            with lock:
+                if not queue:
+                    return
+                expected, prompt = queue.pop()
+            try:
+                path, ttfc, total = run(prompt)
+                error = None
+            except Exception as e:
+                path, ttfc, total, error = "ERROR", None, 0.0, str(e)
+            with lock:
+                results.append({"expected": expected, "path": path, "ttfc": ttfc, "total": total, "error": error})
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return results, time.perf_counter() - start
+
+
+def summarize(results, wall):
+    groups = defaultdict(list)
+    for r in results:
+        groups[r["path"]].append(r)
+    groups["TOPLAM"] = list(results)
+    summary = {}
+    for path, items in groups.items():
+        totals = [r["total"] for r in items if not r["error"]]
+        ttfcs = [r["ttfc"] for r in items if r["ttfc"] is not None]
+        summary[path] = {
+            "n": len(items),
+            "errors": sum(1 for r in items if r["error"]),
+            "ttfc_p50": percentile(ttfcs, 50), "ttfc_p95": percentile(ttfcs, 95),
+            "p50": percentile(totals, 50), "p95": percentile(totals, 95), "p99": percentile(totals, 99),
+            "throughput": len(totals) / wall if wall > 0 else 0.0,
+        }
+    routed = [r for r in results if r["path"] not in ("manager", "ERROR")]
+    accuracy = sum(1 for r in routed if r["path"] == r["expected"]) / len(routed) if routed else None
+    return summary, accuracy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sahte Ollama ile pipeline benchmark")
+    parser.add_argument("--target", choices=("brain", "manager"), default="brain")
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--intents", default=",".join(SAFE_INTENTS))
+    parser.add_argument("--speed", type=float, default=20.0, help="Sahte gecikmeleri bu katsayiya bol")
+    parser.add_argument("--jitter", type=float, default=0.15)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--recordings", default=None)
+    parser.add_argument("--workdir", default=None)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    recordings = os.path.abspath(args.recordings) if args.recordings else None
+    fake = FakeOllama(LatencyProfile(speed=args.speed, jitter=args.jitter, seed=args.seed), Recordings(recordings))
+    server, url = start_server(0, fake)
+    os.environ["OLLAMA_HOST"] = url
+    os.environ["OLLAMA_WEB_HOST"] = url
+    os.environ.setdefault("OLLAMA_API_KEY", "fake-bench-key")
+
+    workdir = prepare_workdir(args.workdir)
+    os.chdir(workdir)
+
+    intents = [i.strip().upper() for i in args.intents.split(",") if i.strip()]
+    workload = build_workload(intents, args.requests + args.warmup, seed=args.seed)
+    run, cache_report = make_runner(args.target)
+    results, wall = run_bench(run, workload, args.concurrency, args.warmup)
+    summary, accuracy = summarize(results, wall)
+    cache = cache_report()
+    server.shutdown()
+
+    if args.json:
+        print(json.dumps({"target": args.target, "speed": args.speed, "wall": wall,
+                          "routing_accuracy": accuracy, "paths": summary, "prefix_cache": cache}, indent=2))
+        return
+
+    scale = args.speed  # Sureler gercek (yavaslatilmamis) Ollama'ya gore olceklenir
+    print("=" * 78)
+    print(f" PIPELINE BENCHMARK — {args.target}, {len(results)} istek, eszamanlilik {args.concurrency}, "
+          f"hiz x{args.speed:g}")
+    print(" (sureler x{:g} ile olceklenip gercek donanim esdegerine cevrildi)".format(scale))
+    print("=" * 78)
+    print(f" {'yol':<14}{'n':>5}{'hata':>6}{'ttfc50':>9}{'ttfc95':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>9}")
+    for path, s in sorted(summary.items(), key=lambda kv: (kv[0] == "TOPLAM", kv[0])):
+        print(f" {path:<14}{s['n']:>5}{s['errors']:>6}"
+              f"{s['ttfc_p50'] * scale:>9.2f}{s['ttfc_p95'] * scale:>9.2f}"
+              f"{s['p50'] * scale:>9.2f}{s['p95'] * scale:>9.2f}{s['p99'] * scale:>9.2f}"
+              f"{s['throughput'] / scale:>9.3f}")
+    print("-" * 78)
+    if accuracy is not None:
+        print(f" Yonlendirme dogrulugu (beklenen intent): %{100 * accuracy:.1f}")
+    print(f" Sahte Ollama istek sayisi: {fake.requests}")
+    if cache:
+        print(" Onek cache (ajan: cagri, tahmini / degerlendirilen token, cache orani):")
+        for agent, c in sorted(cache.items()):
+            print(f"   {agent:<16}{c['calls']:>5}{c['total']:>9}{c['evaluated']:>9}   %{100 * c['cached_ratio']:.1f}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
+# --- END FEATURE: bench_pipeline ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
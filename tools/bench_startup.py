@@ -0,0 +1,181 @@
+"""
+Sunucu acilis suresi olcum araci.
+Her turda temiz bir Python sureci baslatir ve sunlari olcer:
+  import  : `import server` suresi (EngineManager kurulumu dahil)
+  port    : surec baslangicindan portun baglanti kabul etmesine kadar
+  ready   : /ready 200 donene kadar (arka plan motor isinmasi dahil)
+Ayrica -X importtime ciktisindan en pahali ust seviye paketleri listeler.
+Butce asilirsa cikis kodu 1 (regresyonlari CI/elle kontrolde yakalamak icin).
+Sunucu gecici bir calisma dizininde baslar: kullanicinin data/ dosyalarina
+(hafiza, profil, gecmis) dokunulmaz, yenileri de olusturulmaz.
+
+Kullanim:
+    python tools/bench_startup.py [--runs 3] [--port 8765]
+                                  [--max-import 2.0] [--max-port 3.0] [--max-ready 60]
+"""
+
+import os
+import sys
+import time
+import json
+import socket
+import argparse
+import shutil
+import tempfile
+import statistics
+import subprocess
+import urllib.request
+import urllib.error
+from collections import defaultdict
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# --- FEATURE: bench_startup ---
+def prepare_workdir():
+    """Gecici calisma dizini: ayarlar, ornekler ve arayuz dosyalari kopyalanir."""
+    workdir = tempfile.mkdtemp(prefix="jarvis_startup_")
+    os.makedirs(os.path.join(workdir, "data"))
+    shutil.copy(os.path.join(ROOT, "config.json"), os.path.join(workdir, "config.json"))
+    shutil.copy(os.path.join(ROOT, "data", "intent_examples.json"),
+                os.path.join(workdir, "data", "intent_examples.json"))
+    for folder in ("templates", "web"):
+        if os.path.isdir(os.path.join(ROOT, folder)):
+            shutil.copytree(os.path.join(ROOT, folder), os.path.join(workdir, folder))
+    return workdir
+
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def measure_import(workdir):
+    """Temiz surecte `import server` suresi + paket bazli importtime dagilimi."""
+    code = "import time; t=time.perf_counter(); import server; print(time.perf_counter()-t)"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=workdir, env=_env(),
+                          capture_output=True, text=True, encoding="utf-8", errors="replace")
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import server basarisiz")
+    seconds = float(proc.stdout.strip().splitlines()[-1])
+
+    # "import time: self | cumulative | paket" satirlari; sadece ust seviye (girintisiz) paketler
+    packages = defaultdict(int)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line.split("|")
+        name = parts[2]
+        if name.startswith("  ") or not parts[1].strip().isdigit():
+            continue
+        packages[name.strip().split(".")[0]] += int(parts[1])
+    return seconds, packages
+
+
+def measure_server(workdir, port, timeout=120):
+    """Sunucuyu ayri surecte baslat; port ve /ready surelerini dondur."""
+    code = (f"import uvicorn, server; "
+            f"uvicorn.run(server.app, host='127.0.0.1', port={port}, log_level='error')")
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", code], cwd=workdir, env=_env(),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    port_s = ready_s = None
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"Sunucu sureci kapandi (kod {proc.returncode})")
+            if port_s is None:
+                try:
+                    with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                        port_s = time.perf_counter() - start
+                except OSError:
+                    time.sleep(0.02)
+                    continue
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=2) as res:
+                    if res.status == 200:
+                        ready_s = time.perf_counter() - start
+                        break
+            except (urllib.error.URLError, OSError):
+                pass
+            time.sleep(0.05)
+    finally:
+        proc.terminate()
+        try: proc.wait(timeout=10)
+        except subprocess.TimeoutExpired: proc.kill()
+    return port_s, ready_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sunucu acilis suresi olcumu")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-import", type=float, default=None, help="import server butcesi (s)")
+    parser.add_argument("--max-port", type=float, default=None, help="port acilma butcesi (s)")
+    parser.add_argument("--max-ready", type=float, default=None, help="/ready butcesi (s)")
+    parser.add_argument("--json", action="store_true", help="Sonucu JSON olarak yaz")
+    args = parser.parse_args()
+
+    imports, ports, readies = [], [], []
+    packages = {}
+    workdir = prepare_workdir()
+    try:
+        for i in range(args.runs):
+            seconds, packages = measure_import(workdir)
+            imports.append(seconds)
+            port_s, ready_s = measure_server(workdir, args.port)
+            if port_s is not None: ports.append(port_s)
+            if ready_s is not None: readies.append(ready_s)
+            print(f" Tur {i + 1}: import {seconds:.3f}s | port {port_s or float('nan'):.3f}s "
+                  f"| ready {ready_s or float('nan'):.3f}s")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    result = {
+        "import": statistics.median(imports),
+        "port": statistics.median(ports) if ports else None,
+        "ready": statistics.median(readies) if readies else None,
+        "top_imports_ms": {k: round(v / 1000, 1) for k, v in
+                           sorted(packages.items(), key=lambda kv: -kv[1])[:10]},
+    }
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print("=" * 60)
+        print(f" ACILIS SURESI (medyan, {args.runs} tur)")
+        print("=" * 60)
+        for key in ("import", "port", "ready"):
+            value = result[key]
+            print(f" {key:<8} {value:.3f}s" if value is not None else f" {key:<8} -")
+        print("-" * 60)
+        print(" En pahali importlar (ms):")
+        for name, ms in result["top_imports_ms"].items():
+            print(f"   {name:<24} {ms:8.1f}")
+        print("=" * 60)
+
+    failed = False
+    for key, budget in (("import", args.max_import), ("port", args.max_port), ("ready", args.max_ready)):
+        value = result[key]
+        if budget is not None and (value is None or value > budget):
+            print(f" BUTCE ASILDI: {key} {value} > {budget}s")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
+# --- END FEATURE: bench_startup ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
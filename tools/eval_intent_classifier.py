@@ -0,0 +1,108 @@
+"""
+Intent classifier degerlendirme araci.
+Etiketli ornekler uzerinde k-katli capraz dogrulama yapar; her esik icin
+kapsama (LLM'e dusmeden cevaplanan oran) ve kapsanan kisimdaki dogrulugu yazar.
+
+Kullanim:
+    python tools/eval_intent_classifier.py [--folds 5] [--examples data/intent_examples.json]
+                                           [--thresholds 0.5,0.6,0.7,0.75,0.8,0.9] [--train]
+--train: tum orneklerle egitip data/models/ altindaki modeli yeniler.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from collections import defaultdict
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engines.intent_classifier import IntentClassifier
+
+# --- FEATURE: eval_intent_classifier ---
+def stratified_folds(examples, folds, seed=7):
+    by_label = defaultdict(list)
+    for ex in examples:
+        by_label[ex[1]].append(ex)
+    rng = random.Random(seed)
+    buckets = [[] for _ in range(folds)]
+    for items in by_label.values():
+        rng.shuffle(items)
+        for i, ex in enumerate(items):
+            buckets[i % folds].append(ex)
+    return buckets
+
+
+def evaluate(examples_path, folds, thresholds):
+    examples = IntentClassifier.load_examples(examples_path)
+    buckets = stratified_folds(examples, folds)
+    predictions = []  # (beklenen, tahmin, guven)
+    predict_times = []
+
+    for i in range(folds):
+        train = [ex for j, b in enumerate(buckets) if j != i for ex in b]
+        clf = IntentClassifier(config={"examples": examples_path}).fit(train)
+        for text, label in buckets[i]:
+            start = time.perf_counter()
+            probs = clf.predict_proba(text)
+            predict_times.append(time.perf_counter() - start)
+            intent = max(probs, key=probs.get)
+            predictions.append((label, intent, probs[intent]))
+
+    total = len(predictions)
+    correct = sum(1 for exp, got, _ in predictions if exp == got)
+    print("=" * 60)
+    print(f" INTENT CLASSIFIER — {folds}-katli capraz dogrulama ({total} ornek)")
+    print("=" * 60)
+    print(f" Esiksiz dogruluk: {correct}/{total} (%{100 * correct / total:.1f})")
+    avg_ms = 1000 * sum(predict_times) / len(predict_times)
+    print(f" Ortalama tahmin suresi: {avg_ms:.3f} ms (max {1000 * max(predict_times):.3f} ms)")
+    print("-" * 60)
+    print(" Esik   Kapsama   Kapsanan dogruluk")
+    for t in thresholds:
+        covered = [(e, g) for e, g, c in predictions if c >= t]
+        acc = sum(1 for e, g in covered if e == g) / len(covered) if covered else 0.0
+        print(f" {t:.2f}   %{100 * len(covered) / total:5.1f}    %{100 * acc:5.1f}")
+    print("-" * 60)
+
+    errors = defaultdict(int)
+    for exp, got, _ in predictions:
+        if exp != got:
+            errors[(exp, got)] += 1
+    if errors:
+        print(" En sik karisan siniflar:")
+        for (exp, got), n in sorted(errors.items(), key=lambda kv: -kv[1])[:10]:
+            print(f"   {exp:<14} -> {got:<14} x{n}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Intent classifier capraz dogrulama")
+    parser.add_argument("--examples", default=IntentClassifier.DEFAULTS["examples"])
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--thresholds", default="0.5,0.6,0.7,0.75,0.8,0.9")
+    parser.add_argument("--train", action="store_true")
+    args = parser.parse_args()
+
+    evaluate(args.examples, args.folds, [float(t) for t in args.thresholds.split(",")])
+
+    if args.train:
+        clf = IntentClassifier(config={"examples": args.examples})
+        examples = clf.load_examples(args.examples)
+        clf.fit(examples).save(clf.config["model_path"], clf._fingerprint(examples))
+        print(f" Model kaydedildi: {clf.config['model_path']}")
+# --- END FEATURE: eval_intent_classifier ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
@@ -0,0 +1,499 @@
+"""
+Fake Ollama — benchmark ve testler icin cevrimdisi Ollama yerine gecen HTTP sunucusu.
+GPU, model veya internet olmadan LocalBrain / EngineManager hattini olcmeyi saglar.
+
+Uc noktalar: /api/chat (stream + tool calling), /api/generate (keep_alive=0 ile bosaltma),
+/api/ps, /api/tags, /api/embed, /api/version, /api/web_search, /api/web_fetch
+
+Gecikme modeli (model bazli, gercekci dagilim):
+  load        : model bellekte degilse yukleme suresi (keep_alive dolunca bosaltilir)
+  prompt_eval : prompt token sayisi / prompt_tps; model yukluyken bir onceki istekle ortak onek
+                (KV-cache) tekrar degerlendirilmez, prompt_eval_count sadece kalan kismi sayar
+  eval        : uretilen token sayisi / eval_tps (stream'de token token beklenir)
+Her sureye log-normal jitter eklenir; --speed tum bekleme surelerini boler (10 = 10x hizli).
+
+Cevaplar:
+  1) --recordings dosyasinda (JSONL) model + mesaj hash'i eslesen kayit varsa aynen tekrar oynatilir
+  2) Yoksa role gore sentetik cevap: komutan -> intent siniflandiricisinin tahmini,
+     matematik -> Python ifadesi, arama ajani -> once web_search tool call, digerleri -> metin
+--record-from http://gercek-ollama:11434 verilirse istekler gercek sunucuya iletilip kaydedilir.
+
+Kullanim:
+    python tools/fake_ollama.py [--port 11535] [--speed 1] [--recordings data/bench/recordings.jsonl]
+    OLLAMA_HOST=http://127.0.0.1:11535 OLLAMA_WEB_HOST=http://127.0.0.1:11535 python server.py
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+# --- FEATURE: fake_ollama ---
+def _param_billions(model):
+    """'qwen3.5:9b' -> 9.0; bilinmiyorsa 4."""
+    match = re.search(r"(\d+(?:\.\d+)?)b\b", model.lower())
+    return float(match.group(1)) if match else 4.0
+
+
+def _tokens(text):
+    return max(1, len(text or "") // 4)
+
+
+def _tagged(model):
+    """Gercek Ollama gibi: /api/ps ve /api/tags etiketli ad dondurur ("phi4-mini" -> "phi4-mini:latest")."""
+    return model if not model or ":" in model else f"{model}:latest"
+
+
+def _keep_alive_seconds(value, default=300):
+    """Ollama keep_alive: -1/negatif = sonsuz, 0 = hemen bosalt, '10m' / '1h' / saniye."""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float("inf") if value < 0 else float(value)
+    match = re.fullmatch(r"\s*(-?\d+(?:\.\d+)?)\s*([smh]?)\s*", str(value))
+    if not match:
+        return default
+    number = float(match.group(1))
+    if number < 0:
+        return float("inf")
+    return number * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+class LatencyProfile:
+    """CPU-only makine varsayilanlari; --profiles JSON ile model bazli ezilebilir."""
+
+    def __init__(self, overrides=None, speed=1.0, jitter=0.15, seed=None):
+        self.overrides = overrides or {}
+        self.speed = max(float(speed), 1e-6)
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def for_model(self, model):
+        b = _param_billions(model)
+        profile = {
+            "load": 0.6 * b,                # saniye
+            "prompt_tps": 400.0 / b,        # token/s
+            "eval_tps": 50.0 / b,           # token/s
+            "size": int(b * 0.6 * 1024 ** 3),
+        }
+        profile.update(self.overrides.get(model, {}))
+        return profile
+
+    def sample(self, seconds):
+        with self._lock:
+            factor = self.rng.lognormvariate(0, self.jitter) if self.jitter else 1.0
+        return seconds * factor
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds / self.speed)
+
+
+class Recordings:
+    """JSONL: {"model", "key", "content", "tool_calls", "load", "prompt_eval", "eval", "eval_count", ...}"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        entry = json.loads(line)
+                        self.entries[(entry["model"], entry["key"])] = entry
+
+    @staticmethod
+    def key(messages):
+        payload = json.dumps([(m.get("role"), m.get("content")) for m in messages], ensure_ascii=False)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def get(self, model, messages):
+        return self.entries.get((model, self.key(messages)))
+
+    def add(self, entry):
+        with self._lock:
+            self.entries[(entry["model"], entry["key"])] = entry
+            if self.path:
+                directory = os.path.dirname(self.path)
+                if directory and not os.path.exists(directory):
+                    os.makedirs(directory)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class FakeOllama:
+    """Sunucu durumu: yuklu modeller, cevap uretimi, kayit/tekrar."""
+
+    FILLER = ("Elbette efendim. Bu konuda kisaca sunlari soyleyebilirim: temel fikir basit, "
+              "ama ayrintilar baglama gore degisir. Isterseniz daha fazla detay verebilirim. ")
+
+    def __init__(self, profile=None, recordings=None, record_from=None, reply_tokens=80):
+        self.profile = profile or LatencyProfile()
+        self.recordings = recordings or Recordings()
+        self.record_from = record_from.rstrip("/") if record_from else None
+        self.reply_tokens = reply_tokens
+        self.loaded = {}            # model -> son kullanma zamani (epoch)
+        self.last_prompt = {}       # model -> son islenen prompt metni (KV-cache onegi)
+        self._lock = threading.Lock()
+        self._classifier = None
+        self.requests = 0
+
+    # ==================== MODEL YASAM DONGUSU ====================
+
+    def _expire(self):
+        now = time.time()
+        for model in [m for m, exp in self.loaded.items() if exp <= now]:
+            del self.loaded[model]
+
+    def touch(self, model, keep_alive):
+        """Model yuklu degilse yukleme suresini dondurur; keep_alive'a gore son kullanmayi yeniler."""
+        model = _tagged(model)
+        seconds = _keep_alive_seconds(keep_alive)
+        with self._lock:
+            self._expire()
+            load = 0.0 if model in self.loaded else self.profile.sample(self.profile.for_model(model)["load"])
+            if seconds == 0:
+                self.loaded.pop(model, None)
+            else:
+                self.loaded[model] = time.time() + min(seconds, 10 ** 9)
+        return load
+
+    def ps(self):
+        with self._lock:
+            self._expire()
+            loaded = dict(self.loaded)
+        models = []
+        for model, expires in loaded.items():
+            info = self._model_info(model)
+            info["expires_at"] = datetime.fromtimestamp(min(expires, 4 * 10 ** 9), timezone.utc).isoformat()
+            info["size_vram"] = 0
+            models.append(info)
+        return {"models": models}
+
+    def _model_info(self, model):
+        size = int(self.profile.for_model(model)["size"])
+        return {
+            "name": model, "model": model, "size": size,
+            "digest": hashlib.sha256(model.encode("utf-8")).hexdigest(),
+            "modified_at": (datetime.now(timezone.utc) - timedelta(days=1)).isoformat(),
+            "details": {"format": "gguf", "family": model.split(":")[0], "families": None,
+                        "parameter_size": f"{_param_billions(model):g}B", "quantization_level": "Q4_K_M"},
+        }
+
+    def tags(self):
+        models = set(self.loaded)
+        try:
+            with open(os.path.join(ROOT, "config.json"), "r", encoding="utf-8") as f:
+                models.update(_tagged(m) for m in (json.load(f).get("local_agents") or {}).values() if m)
+        except (OSError, ValueError):
+            pass
+        return {"models": [self._model_info(m) for m in sorted(models)]}
+
+    # ==================== CEVAP URETIMI ====================
+
+    def _classify(self, text):
+        if self._classifier is None:
+            from engines.intent_classifier import IntentClassifier
+            clf = IntentClassifier(config={"examples": os.path.join(ROOT, "data", "intent_examples.json")})
+            clf.fit(clf.load_examples(clf.config["examples"]))
+            self._classifier = clf
+        probs = self._classifier.predict_proba(text)
+        return max(probs, key=probs.get) if probs else "CHAT"
+
+    def synthesize(self, body):
+        """Kayit yoksa istegin turune gore makul bir cevap: (content, tool_calls)."""
+        messages = body.get("messages") or []
+        system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+        user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        user = user.split("[YENI MESAJ]:")[-1].strip()
+
+        if "Gecerli ciktilar" in system:
+            return self._classify(user), None
+        if "Python ifadesi" in system:
+            expr = user.lower()
+            for word, op in (("artı", "+"), ("arti", "+"), ("eksi", "-"), ("çarpı", "*"), ("carpi", "*"),
+                             ("kere", "*"), ("bölü", "/"), ("bolu", "/")):
+                expr = expr.replace(word, op)
+            expr = re.sub(r"[^0-9+\-*/(). ]", " ", expr)
+            expr = " ".join(expr.split()) or "0"
+            return expr, None
+        if body.get("tools") and not any(m.get("role") == "tool" for m in messages):
+            return "", [{"function": {"name": "web_search", "arguments": {"query": user[:100], "max_results": 3}}}]
+        if "powershell" in system.lower():
+            return "Islemi yapiyorum efendim.\n```powershell\nWrite-Output 'fake-ollama'\n```", None
+
+        words = self.FILLER.split()
+        target = self.reply_tokens
+        out = []
+        while _tokens(" ".join(out)) < target:
+            out.extend(words)
+        return " ".join(out), None
+
+    def respond(self, body):
+        """Donus: (kayit, yukleme suresi). Kayit content/tool_calls/sureleri tasir."""
+        model = body.get("model", "")
+        messages = body.get("messages") or []
+        self.requests += 1
+        load = self.touch(model, body.get("keep_alive"))
+
+        entry = self.recordings.get(model, messages)
+        if entry is None and self.record_from:
+            entry = self._record(body)
+        if entry is None:
+            content, tool_calls = self.synthesize(body)
+            profile = self.profile.for_model(model)
+            prompt_tokens = self._uncached_tokens(model, messages, load > 0)
+            eval_tokens = _tokens(content) + (10 if tool_calls else 0)
+            entry = {
+                "content": content, "tool_calls": tool_calls,
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval": self.profile.sample(prompt_tokens / profile["prompt_tps"]),
+                "eval_count": eval_tokens,
+                "eval": self.profile.sample(eval_tokens / profile["eval_tps"]),
+            }
+        else:
+            # Kayitli yukleme suresi yerine bizim residency durumumuz gecerli
+            entry = dict(entry)
+        return entry, load
+
+    def _uncached_tokens(self, model, messages, cold):
+        """Ollama gibi: ayni modelin son prompt'uyla ortak onek cache'ten gelir (soguk yuklemede sifirlanir)."""
+        text = "".join(f"<{m.get('role', '')}>{m.get('content', '')}" for m in messages)
+        with self._lock:
+            previous = "" if cold else self.last_prompt.get(model, "")
+            self.last_prompt[model] = text
+        common = 0
+        for a, b in zip(previous, text):
+            if a != b:
+                break
+            common += 1
+        return max(1, _tokens(text[common:]))
+
+    def _record(self, body):
+        import urllib.request
+        payload = dict(body, stream=False)
+        req = urllib.request.Request(f"{self.record_from}/api/chat", data=json.dumps(payload).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=600) as res:
+            data = json.loads(res.read().decode("utf-8"))
+        message = data.get("message") or {}
+        entry = {
+            "model": body.get("model", ""), "key": Recordings.key(body.get("messages") or []),
+            "content": message.get("content", ""), "tool_calls": message.get("tool_calls"),
+            "prompt_eval_count": data.get("prompt_eval_count", 0),
+            "prompt_eval": (data.get("prompt_eval_duration") or 0) / 1e9,
+            "eval_count": data.get("eval_count", 0),
+            "eval": (data.get("eval_duration") or 0) / 1e9,
+            "load": (data.get("load_duration") or 0) / 1e9,
+        }
+        self.recordings.add(entry)
+        return entry
+
+    def embed(self, body):
+        from utils.embeddings import hashed_ngrams
+        inputs = body.get("input") or ""
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        dim = 256
+        vectors = []
+        for text in inputs:
+            vec = [0.0] * dim
+            for index, value in hashed_ngrams(text).items():
+                vec[index % dim] += value
+            vectors.append(vec)
+        model = body.get("model", "")
+        load = self.touch(model, body.get("keep_alive"))
+        self.profile.sleep(load + self.profile.sample(0.005 * len(inputs)))
+        return {"model": model, "embeddings": vectors}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    fake = None  # FakeOllama, sunucu kurulurken atanir
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, payload, status=200):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length).decode("utf-8")) if length else {}
+
+    def do_GET(self):
+        if self.path == "/api/ps":
+            return self._json(self.fake.ps())
+        if self.path == "/api/tags":
+            return self._json(self.fake.tags())
+        if self.path == "/api/version":
+            return self._json({"version": "0.0.0-fake"})
+        if self.path == "/":
+            return self._json({"status": "Ollama is running (fake)"})
+        self._json({"error": "not found"}, 404)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        body = self._body()
+        path = self.path
+        if path == "/api/chat":
+            return self._chat(body)
+        if path == "/api/generate":
+            # Bos prompt + keep_alive: model yukle/bosalt
+            model = body.get("model", "")
+            load = self.fake.touch(model, body.get("keep_alive"))
+            if _keep_alive_seconds(body.get("keep_alive")) != 0:
+                self.fake.profile.sleep(load)
+            return self._json({"model": model, "created_at": self._now(), "response": "",
+                               "done": True, "done_reason": "unload" if body.get("keep_alive") == 0 else "load"})
+        if path == "/api/embed":
+            return self._json(self.fake.embed(body))
+        if path == "/api/web_search":
+            query = body.get("query", "")
+            n = int(body.get("max_results") or 3)
+            self.fake.profile.sleep(self.fake.profile.sample(0.4))
+            return self._json({"results": [
+                {"title": f"{query} - sonuc {i + 1}", "url": f"https://example.com/{i + 1}",
+                 "content": f"{query} hakkinda ornek icerik {i + 1}. " * 5} for i in range(n)]})
+        if path == "/api/web_fetch":
+            url = body.get("url", "")
+            self.fake.profile.sleep(self.fake.profile.sample(0.6))
+            return self._json({"title": "Ornek sayfa", "content": f"{url} sayfasinin ornek icerigi. " * 20,
+                               "links": [f"{url}/link{i}" for i in range(3)]})
+        self._json({"error": "not found"}, 404)
+
+    @staticmethod
+    def _now():
+        return datetime.now(timezone.utc).isoformat()
+
+    def _chat(self, body):
+        fake = self.fake
+        profile = fake.profile
+        entry, load = fake.respond(body)
+        model = body.get("model", "")
+        content = entry.get("content") or ""
+        tool_calls = entry.get("tool_calls")
+        prompt_eval, eval_s = entry.get("prompt_eval", 0.0), entry.get("eval", 0.0)
+        stats = {
+            "total_duration": int((load + prompt_eval + eval_s) * 1e9),
+            "load_duration": int(load * 1e9),
+            "prompt_eval_count": entry.get("prompt_eval_count", 0),
+            "prompt_eval_duration": int(prompt_eval * 1e9),
+            "eval_count": entry.get("eval_count", 0),
+            "eval_duration": int(eval_s * 1e9),
+        }
+        final_message = {"role": "assistant", "content": ""}
+
+        if not body.get("stream", True):
+            profile.sleep(load + prompt_eval + eval_s)
+            message = {"role": "assistant", "content": content}
+            if tool_calls:
+                message["tool_calls"] = tool_calls
+            return self._json(dict(stats, model=model, created_at=self._now(), message=message,
+                                   done=True, done_reason="stop"))
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send(obj):
+            data = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        try:
+            profile.sleep(load + prompt_eval)
+            pieces = re.findall(r"\S+\s*", content) or ([""] if tool_calls else [])
+            per_piece = eval_s / max(1, len(pieces))
+            for piece in pieces:
+                profile.sleep(per_piece)
+                if piece:
+                    send({"model": model, "created_at": self._now(),
+                          "message": {"role": "assistant", "content": piece}, "done": False})
+            if tool_calls:
+                send({"model": model, "created_at": self._now(),
+                      "message": {"role": "assistant", "content": "", "tool_calls": tool_calls}, "done": False})
+            send(dict(stats, model=model, created_at=self._now(), message=final_message,
+                      done=True, done_reason="stop"))
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Istemci akisi iptal etti (spekulatif uretim vb.)
+
+
+def start_server(port=0, fake=None, host="127.0.0.1"):
+    """Arka plan thread'inde sunucu baslatir. Donus: (server, "http://host:port")."""
+    handler = type("FakeOllamaHandler", (_Handler,), {"fake": fake or FakeOllama()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-ollama", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cevrimdisi sahte Ollama sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11535)
+    parser.add_argument("--speed", type=float, default=1.0, help="Tum gecikmeleri bu katsayiya boler")
+    parser.add_argument("--jitter", type=float, default=0.15, help="Log-normal jitter sigmasi")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--profiles", default=None, help='{"model": {"load": s, "prompt_tps": n, "eval_tps": n}}')
+    parser.add_argument("--recordings", default=None, help="Tekrar oynatilacak/kaydedilecek JSONL dosyasi")
+    parser.add_argument("--record-from", default=None, help="Gercek Ollama adresi (kayit modu)")
+    parser.add_argument("--reply-tokens", type=int, default=80)
+    args = parser.parse_args()
+
+    overrides = {}
+    if args.profiles:
+        with open(args.profiles, "r", encoding="utf-8") as f:
+            overrides = json.load(f)
+    fake = FakeOllama(LatencyProfile(overrides, args.speed, args.jitter, args.seed),
+                      Recordings(args.recordings), args.record_from, args.reply_tokens)
+    server, url = start_server(args.port, fake, args.host)
+    print(f"Fake Ollama: {url} (speed x{args.speed}, kayit: {len(fake.recordings.entries)})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
+# --- END FEATURE: fake_ollama ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
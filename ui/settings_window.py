@@ -1,6 +1,6 @@
 import customtkinter as ctk
 import threading
-import ollama
+from engines.ollama_client import get_ollama
 from ui.components import NASAProgressBar, ModernButton
 from ui.styles import *
 from utils.settings_manager import SettingsManager
@@ -124,7 +124,7 @@ class SettingsWindow(ctk.CTkToplevel):
 
     def check_ollama(self):
         try:
-            ollama.list()
+            get_ollama().list()
             self.lbl_ollama_status.configure(text="Status: ✅ Ollama Online", text_color="#2ecc71")
         except:
             self.lbl_ollama_status.configure(text="Status: ❌ Offline / Not Installed", text_color="#e74c3c")
@@ -140,7 +140,7 @@ class SettingsWindow(ctk.CTkToplevel):
         
     def _pull_worker(self, model_name):
         try:
-            for progress in ollama.pull(model_name, stream=True):
+            for progress in get_ollama().pull(model_name, stream=True):
                 status = progress.get('status', '')
                 # Ollama returns explicit total/completed for download, but sometimes just status
                 total = progress.get('total', 0)
@@ -169,15 +169,17 @@ class SettingsWindow(ctk.CTkToplevel):
         new_audio = self.var_audio.get()
         new_model = self.entry_model.get().strip()
         
-        self.settings.set("gemini_api_key", new_key)
-        self.settings.set("language", new_lang)
-        self.settings.set("engine_mode", new_engine)
-        self.settings.set("audio_enabled", new_audio)
-        
-        current_models = self.settings.get("local_models")
-        if not current_models: current_models = {}
-        current_models["chat"] = new_model
-        self.settings.set("local_models", current_models)
+        # Tek islem: config.json ve api_keys.json birer kez (atomik) yazilir
+        with self.settings.batch():
+            self.settings.set("gemini_api_key", new_key)
+            self.settings.set("language", new_lang)
+            self.settings.set("engine_mode", new_engine)
+            self.settings.set("audio_enabled", new_audio)
+            
+            current_models = self.settings.get("local_models")
+            if not current_models: current_models = {}
+            current_models["chat"] = new_model
+            self.settings.set("local_models", current_models)
         
         self.destroy()
 # --- END FEATURE: settings_window ---
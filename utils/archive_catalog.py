@@ -0,0 +1,225 @@
+"""
+Archive Catalog — arsivlenmis sohbetler icin kalici SQLite katalogu.
+Her arsiv icin id (dosya adi), baslik, olusturma zamani ve mesaj sayisi tutulur;
+mesaj metinleri FTS5 tam metin indeksine yazilir. Katalog archive_current_chat,
+/load_chat ve /delete_chat tarafindan artimli guncellenir, listeleme ve arama
+her cagrida dizini taramak yerine indeksten doner.
+"""
+
+import os
+import re
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+# --- FEATURE: archive_catalog ---
+class ArchiveCatalog:
+    """data/archives/*.json icin SQLite katalog + FTS5 arama indeksi."""
+
+    FILENAME_PATTERN = re.compile(r"^chat_(\d{8})_(\d{6})_?(.*)\.json$")
+    # unicode61 'ı/İ' harflerini aksanli 'i' saymaz; indeks ve sorguda ayni katlama
+    TURKISH_FOLD = str.maketrans("ıİ", "iI")
+
+    def __init__(self, archive_dir="data/archives", db_path="data/archive_catalog.db"):
+        self.archive_dir = archive_dir
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        if not os.path.exists(archive_dir):
+            os.makedirs(archive_dir)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self.fts_enabled = self._create_schema()
+
+        # Katalog disinda eklenmis/silinmis dosyalari tek seferde esitle
+        self.sync()
+
+    def _create_schema(self):
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS archives ("
+                " filename TEXT PRIMARY KEY,"
+                " title TEXT,"
+                " created TEXT,"
+                " message_count INTEGER,"
+                " last_opened TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_archives_created ON archives(created)")
+            try:
+                # remove_diacritics: 'calisma' aramasi 'çalışma' ile de eslesir
+                self._conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS archive_fts USING fts5("
+                    " filename UNINDEXED, title, body,"
+                    " tokenize='unicode61 remove_diacritics 2')"
+                )
+                return True
+            except sqlite3.OperationalError:
+                # FTS5 derlenmemis SQLite: duz tablo + LIKE ile yedek arama
+                self._conn.execute("CREATE TABLE IF NOT EXISTS archive_text (filename TEXT PRIMARY KEY, title TEXT, body TEXT)")
+                return False
+
+    # ==================== YARDIMCI ====================
+
+    def _parse_filename(self, filename):
+        """chat_20260211_220000_Hello_World.json -> (baslik, ISO zaman)."""
+        match = self.FILENAME_PATTERN.match(filename)
+        if match:
+            date_part, time_part, title_part = match.groups()
+            try:
+                created = datetime.strptime(date_part + time_part, "%Y%m%d%H%M%S").isoformat()
+            except ValueError:
+                created = None
+            return title_part.replace("_", " ").strip(), created
+        return filename.replace(".json", ""), None
+
+    def _read_messages(self, filename):
+        try:
+            with open(os.path.join(self.archive_dir, filename), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, list) else []
+        except Exception as e:
+            print(f"Catalog Read Error ({filename}): {e}")
+            return []
+
+    def _index(self, filename, messages):
+        title, created = self._parse_filename(filename)
+        if not created:
+            try:
+                created = datetime.fromtimestamp(os.path.getmtime(os.path.join(self.archive_dir, filename))).isoformat()
+            except OSError:
+                created = datetime.now().isoformat()
+        body = "\n".join(str(m.get("text", "")) for m in messages if isinstance(m, dict))
+        body = body.translate(self.TURKISH_FOLD)
+        text_table = "archive_fts" if self.fts_enabled else "archive_text"
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO archives (filename, title, created, message_count, last_opened)"
+            " VALUES (?, ?, ?, ?, (SELECT last_opened FROM archives WHERE filename = ?))",
+            (filename, title or "Adsiz Sohbet", created, len(messages), filename)
+        )
+        self._conn.execute(f"DELETE FROM {text_table} WHERE filename = ?", (filename,))
+        self._conn.execute(f"INSERT INTO {text_table} (filename, title, body) VALUES (?, ?, ?)", (filename, title.translate(self.TURKISH_FOLD), body))
+
+    def _delete(self, filename):
+        text_table = "archive_fts" if self.fts_enabled else "archive_text"
+        self._conn.execute("DELETE FROM archives WHERE filename = ?", (filename,))
+        self._conn.execute(f"DELETE FROM {text_table} WHERE filename = ?", (filename,))
+
+    def _row(self, row):
+        return {
+            "filename": row["filename"],
+            "path": os.path.join(self.archive_dir, row["filename"]),
+            "title": row["title"],
+            "created": row["created"],
+            "message_count": row["message_count"],
+        }
+
+    # ==================== GUNCELLEME ====================
+
+    def sync(self):
+        """Dizin ile katalogu esitle: eksikleri indeksle, silinenleri kaldir."""
+        try:
+            on_disk = {f for f in os.listdir(self.archive_dir) if f.endswith(".json")}
+        except OSError:
+            on_disk = set()
+        with self._lock, self._conn:
+            indexed = {row[0] for row in self._conn.execute("SELECT filename FROM archives")}
+            for filename in on_disk - indexed:
+                self._index(filename, self._read_messages(filename))
+            for filename in indexed - on_disk:
+                self._delete(filename)
+
+    def add(self, filename, messages=None):
+        """Yeni arsivi indeksle. messages verilirse dosya tekrar okunmaz."""
+        if messages is None:
+            messages = self._read_messages(filename)
+        with self._lock, self._conn:
+            self._index(filename, messages)
+
+    def mark_opened(self, filename):
+        """/load_chat: arsiv acildi. Katalogda yoksa (elle kopyalanmis) once indeksle."""
+        with self._lock, self._conn:
+            exists = self._conn.execute("SELECT 1 FROM archives WHERE filename = ?", (filename,)).fetchone()
+            if not exists:
+                self._index(filename, self._read_messages(filename))
+            self._conn.execute("UPDATE archives SET last_opened = ? WHERE filename = ?", (datetime.now().isoformat(), filename))
+
+    def remove(self, filename):
+        with self._lock, self._conn:
+            self._delete(filename)
+
+    # ==================== SORGULAR ====================
+
+    def list_archives(self, limit=None, offset=0):
+        sql = "SELECT * FROM archives ORDER BY created DESC"
+        params = []
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = [int(limit), int(offset)]
+        with self._lock:
+            return [self._row(r) for r in self._conn.execute(sql, params)]
+
+    def _fts_query(self, query):
+        """Kullanici metnini guvenli FTS5 sorgusuna cevir: her kelime tirnakli on-ek eslesmesi."""
+        words = re.findall(r"\w+", query.translate(self.TURKISH_FOLD), flags=re.UNICODE)
+        return " ".join(f'"{w}"*' for w in words)
+
+    def search(self, query, page=1, page_size=20):
+        """Tam metin arama. Donus: {"total", "page", "page_size", "results": [... + snippet]}"""
+        page = max(1, int(page))
+        page_size = max(1, min(100, int(page_size)))
+        offset = (page - 1) * page_size
+        result = {"query": query, "page": page, "page_size": page_size, "total": 0, "results": []}
+
+        if self.fts_enabled:
+            match = self._fts_query(query)
+            if not match:
+                return result
+            with self._lock:
+                result["total"] = self._conn.execute(
+                    "SELECT COUNT(*) FROM archive_fts WHERE archive_fts MATCH ?", (match,)
+                ).fetchone()[0]
+                rows = self._conn.execute(
+                    "SELECT a.*, snippet(archive_fts, 2, '**', '**', '...', 12) AS snippet"
+                    " FROM archive_fts JOIN archives a ON a.filename = archive_fts.filename"
+                    " WHERE archive_fts MATCH ? ORDER BY bm25(archive_fts) LIMIT ? OFFSET ?",
+                    (match, page_size, offset)
+                ).fetchall()
+        else:
+            like = f"%{query.strip()}%"
+            if like == "%%":
+                return result
+            with self._lock:
+                result["total"] = self._conn.execute(
+                    "SELECT COUNT(*) FROM archive_text WHERE body LIKE ? OR title LIKE ?", (like, like)
+                ).fetchone()[0]
+                rows = self._conn.execute(
+                    "SELECT a.*, substr(t.body, 1, 120) AS snippet FROM archive_text t"
+                    " JOIN archives a ON a.filename = t.filename"
+                    " WHERE t.body LIKE ? OR t.title LIKE ? ORDER BY a.created DESC LIMIT ? OFFSET ?",
+                    (like, like, page_size, offset)
+                ).fetchall()
+
+        for r in rows:
+            item = self._row(r)
+            item["snippet"] = r["snippet"]
+            result["results"].append(item)
+        return result
+# --- END FEATURE: archive_catalog ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
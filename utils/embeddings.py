@@ -0,0 +1,102 @@
+"""
+Embeddings — yerel metin vektorleri.
+Ayarlarda bir Ollama embedding modeli (ornek: nomic-embed-text) tanimliysa onu kullanir;
+model yoksa / Ollama kapaliysa bagimliliksiz hashed karakter 3-gram vektorune duser.
+Farkli turdeki vektorler birbiriyle karsilastirilmaz (cosine 0 doner).
+"""
+
+import re
+import math
+import time
+import zlib
+import threading
+
+# --- FEATURE: embeddings ---
+HASHED_DIM = 4096
+
+
+# Turkce klavyesiz yazimla ayni anahtara dussun: "artı" == "arti", "çiz" == "ciz"
+TURKISH_FOLD = str.maketrans("çşğöüıâîû", "csgouiaiu")
+
+
+def normalize_text(text, keep=""):
+    """Turkce harf duyarli kucuk harf + aksan katlama + noktalama temizligi + tek bosluk.
+    keep: anlam tasiyan ve korunacak isaretler (ornek "+#": "C++" ile "C#" ayri kalir)."""
+    text = (text or "").replace("İ", "i").replace("I", "ı").lower().translate(TURKISH_FOLD)
+    text = re.sub(rf"[^\w\s{re.escape(keep)}]" if keep else r"[^\w\s]", " ", text, flags=re.UNICODE)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def hashed_ngrams(text, n=3, dim=HASHED_DIM):
+    """Karakter n-gram sayilarini sabit boyutlu seyrek vektore (dict) hash'ler, L2 normalize."""
+    padded = f" {normalize_text(text)} "
+    vec = {}
+    for i in range(max(1, len(padded) - n + 1)):
+        idx = zlib.crc32(padded[i:i + n].encode("utf-8")) % dim
+        vec[idx] = vec.get(idx, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+    return {k: v / norm for k, v in vec.items()}
+
+
+def cosine(a, b):
+    """(kind, vektor) ciftleri arasinda cosine benzerligi. Vektorler zaten normalize."""
+    kind_a, vec_a = a
+    kind_b, vec_b = b
+    if kind_a != kind_b or not vec_a or not vec_b:
+        return 0.0
+    if kind_a == "hashed":
+        if len(vec_a) > len(vec_b):
+            vec_a, vec_b = vec_b, vec_a
+        return sum(v * vec_b.get(k, 0.0) for k, v in vec_a.items())
+    if len(vec_a) != len(vec_b):
+        return 0.0
+    return sum(x * y for x, y in zip(vec_a, vec_b))
+
+
+class EmbeddingProvider:
+    """
+    embed(text) -> ("dense:<model>", [float...]) veya ("hashed", {idx: w}).
+    Ollama hatasindan sonra retry_after saniye boyunca dogrudan hashed'e duser,
+    boylece Ollama kapaliyken her istekte baglanti denemesi yapilmaz.
+    """
+
+    def __init__(self, model=None, retry_after=300):
+        self.model = model
+        self.retry_after = retry_after
+        self._disabled_until = 0
+        self._lock = threading.Lock()
+
+    @property
+    def kind(self):
+        if self.model and time.time() >= self._disabled_until:
+            return f"dense:{self.model}"
+        return "hashed"
+
+    def embed(self, text):
+        if self.model and time.time() >= self._disabled_until:
+            try:
+                from engines.ollama_client import get_ollama
+                res = get_ollama().embed(model=self.model, input=normalize_text(text) or " ")
+                vec = list(res["embeddings"][0])
+                norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+                return (f"dense:{self.model}", [v / norm for v in vec])
+            except Exception as e:
+                with self._lock:
+                    self._disabled_until = time.time() + self.retry_after
+                try: print(f"Embedding Error ({self.model}), hashed vektore geciliyor: {e}")
+                except: pass
+        return ("hashed", hashed_ngrams(text))
+# --- END FEATURE: embeddings ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
@@ -0,0 +1,137 @@
+"""
+History Store — aktif sohbet gecmisi icin append-only JSONL deposu.
+Her mesaj dosyaya tek satir olarak eklenir (O(1) yazma), son pencere RAM'de tutulur
+ve load() her zaman cache'ten doner. Dosya pencerenin birkac katina buyuyunce
+atomik rename ile sikistirilir.
+"""
+
+import os
+import json
+import threading
+from collections import deque
+from datetime import datetime
+
+# --- FEATURE: history_store ---
+class HistoryStore:
+    """Thread-safe sohbet gecmisi: append-only JSONL + bellek ici son-N penceresi."""
+
+    def __init__(self, path="data/chat_history.jsonl", legacy_path="data/chat_history.json", window=50, compact_factor=4):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.window = window
+        self.compact_factor = compact_factor
+
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=window)
+        self._line_count = 0
+        self._fh = None
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._load()
+
+    # ==================== YUKLEME ====================
+
+    def _load(self):
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        self._recent.append(json.loads(line))
+                        self._line_count += 1
+                    except json.JSONDecodeError:
+                        # Yarim kalmis son satir (cokme aninda) — atla
+                        pass
+        elif self.legacy_path and os.path.exists(self.legacy_path):
+            # Eski chat_history.json'dan tek seferlik gecis
+            try:
+                with open(self.legacy_path, "r", encoding="utf-8") as f:
+                    legacy = json.load(f)
+                if isinstance(legacy, list):
+                    self._recent.extend(legacy)
+            except Exception as e:
+                print(f"History Migration Error: {e}")
+            self._rewrite()
+
+    def _open(self):
+        if self._fh is None:
+            self._fh = open(self.path, "a", encoding="utf-8")
+        return self._fh
+
+    def _close(self):
+        if self._fh is not None:
+            try: self._fh.close()
+            except: pass
+            self._fh = None
+
+    def _rewrite(self):
+        """Dosyayi sadece bellek penceresiyle yeniden yaz (tmp + os.replace, atomik)."""
+        self._close()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in self._recent:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._line_count = len(self._recent)
+
+    # ==================== API ====================
+
+    def append(self, role, text):
+        record = {
+            "role": role,
+            "text": text,
+            "timestamp": datetime.now().isoformat()
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+
+        with self._lock:
+            fh = self._open()
+            fh.write(line)
+            fh.flush()
+            self._recent.append(record)
+            self._line_count += 1
+
+            # Dosya pencerenin katlarina ulasinca sikistir (amortize O(1))
+            if self._line_count > self.window * self.compact_factor:
+                self._rewrite()
+        return record
+
+    def load(self):
+        """Son pencereyi dondurur (kopya liste, disk I/O yok)."""
+        with self._lock:
+            return list(self._recent)
+
+    def replace(self, messages):
+        """Aktif gecmisi verilen mesajlarla degistir (arsivden yukleme)."""
+        with self._lock:
+            self._recent.clear()
+            self._recent.extend(messages or [])
+            self._rewrite()
+
+    def clear(self):
+        self.replace([])
+
+    def close(self):
+        with self._lock:
+            self._close()
+# --- END FEATURE: history_store ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
@@ -9,6 +9,7 @@ import time
 import asyncio
 import threading
 import soundfile as sf
+from utils.metrics import timed
 
 # --- FEATURE: local_voice_manager ---
 class LocalVoiceManager:
@@ -38,6 +39,7 @@ class LocalVoiceManager:
     
     # ==================== TTS (Edge-TTS) ====================
     
+    @timed("tts.speak", model="edge-tts")
     def speak(self, text: str) -> str:
         """
         TTS: Metni ses dosyasina cevir (Edge-TTS, Turkce).
@@ -157,6 +159,7 @@ class LocalVoiceManager:
         finally:
             self._stt_loading = False
     
+    @timed("stt.transcribe", model="faster-whisper")
     def transcribe(self, audio_path: str) -> str:
         """
         STT: Ses dosyasini metne cevir (Turkce).
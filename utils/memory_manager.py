@@ -1,16 +1,72 @@
+"""
+Memory Manager — uzun sureli hafiza ve kullanici profili: surec genelinde tek depo (get_memory()),
+okumalar RAM'den, yazmalar flush_delay sonra atomik; prompt'a en ilgili top_k kayit girer.
+
+config.json:
+    "memory": {"flush_delay": 2.0, "top_k": 5, "min_score": 0.1, "max_facts": 5000,
+               "max_notes": 200, "embedding_model": null,
+               "extract_queue": 32, "extract_batch": 4, "extract_window": 3.0, "extract_drain": 5.0}
+"""
+
+import atexit
+import copy
 import json
 import os
 import re
+import queue
 import threading
+import time
+from utils.metrics import REGISTRY, timed
+from utils.embeddings import EmbeddingProvider
+from utils.vector_memory import VectorIndex
 
 # --- FEATURE: memory_manager ---
+EXTRACT_TOTAL = REGISTRY.counter(
+    "jarvis_memory_extract_total",
+    "Cloud kisisel bilgi cikarimi (result: skipped/queued/dropped/applied/empty/error).",
+    ("result",),
+)
+
+
 class MemoryManager:
-    def __init__(self, directory="data"):
+    DEFAULTS = {
+        "flush_delay": 2.0,       # Saniye; yazmalar bu sure icinde birlestirilir
+        "top_k": 5,               # Prompt'a giren en ilgili gercek / profil kaydi sayisi
+        "min_score": 0.1,         # Bunun altindaki benzerlikler ilgisiz sayilir
+        "max_facts": 5000,
+        "max_notes": 200,
+        "embedding_model": None,  # Ornek: "nomic-embed-text"; yoksa hashed 3-gram
+        "extract_queue": 32,      # Bekleyen cloud cikarim isi; dolunca en eskisi atilir
+        "extract_batch": 4,       # Tek Gemini cagrisinda islenen mesaj sayisi
+        "extract_window": 3.0,    # Saniye; ilk mesajdan sonra gruba katilmak icin beklenen sure
+        "extract_drain": 5.0,     # Saniye; kapanista kuyrukta kalan cikarimlar icin azami bekleme
+    }
+    # Profil kategorileri (kimlik haric) ve context etiketleri
+    PROFILE_LABELS = [("preferences", "TERCİHLER"), ("work", "İŞ"), ("tech", "TEKNOLOJİ"),
+                      ("location", "KONUM"), ("personality", "KİŞİLİK")]
+
+    def __init__(self, directory="data", settings=None):
         self.directory = directory
         self.memory_file = os.path.join(directory, "long_memory.json")
         self.profile_file = os.path.join(directory, "user_profile.json")
         self.context_file = os.path.join(directory, "session_context.json")
+        self.config = dict(self.DEFAULTS, **((settings.get("memory", {}) if settings else {}) or {}))
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()   # Ayni dosyaya iki flush ayni anda yazmasin
+        self._dirty = set()
+        self._timer = None
+        self._context_text = None             # get_context() sonucu, degisene kadar
+        self._extract_queue = queue.Queue(maxsize=max(1, int(self.config["extract_queue"])))
+        self._extract_worker = None           # Ilk remember_cloud'da baslar
+        self._closing = threading.Event()     # close(): grup penceresi beklenmez, kuyruk hemen islenir
         self.ensure_files()
+        self._memory = self._load(self.memory_file, lambda: {"facts": [], "summaries": []})
+        self._profile = self._load(self.profile_file, self._empty_profile)
+        embedder = EmbeddingProvider(self.config["embedding_model"])
+        self.fact_index = VectorIndex(os.path.join(directory, "memory_facts.npz"), embedder, name="facts")
+        self.profile_index = VectorIndex(os.path.join(directory, "memory_profile.npz"), embedder, name="profile")
+        self.fact_index.sync(self._memory.get("facts", []))
+        self.profile_index.sync(self._profile_items(self._profile))
         
     def ensure_files(self):
         if not os.path.exists(self.directory): os.makedirs(self.directory)
@@ -31,35 +87,92 @@ class MemoryManager:
             "notes": []          # serbest notlar
         }
 
+    # =====================================================
+    # DEPO (RAM + GECIKMELI YAZMA)
+    # =====================================================
+
+    def _load(self, path, default):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            try: print(f"Memory Load Error ({os.path.basename(path)}): {e}")
+            except: pass
+            return default()
+
+    def _mark_dirty(self, path):
+        """Cagiran self._lock'u tutar. Yazma flush_delay sonra arka planda yapilir."""
+        self._dirty.add(path)
+        if self._timer is None:
+            self._timer = threading.Timer(self.config["flush_delay"], self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    @timed("memory.flush")
+    def flush(self):
+        """Bekleyen degisiklikleri atomik olarak diske yazar (kapanista da cagrilir)."""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending = {}
+                if self.memory_file in self._dirty:
+                    pending[self.memory_file] = json.dumps(self._memory, ensure_ascii=False, indent=2)
+                if self.profile_file in self._dirty:
+                    pending[self.profile_file] = json.dumps(self._profile, ensure_ascii=False, indent=2)
+                self._dirty.clear()
+            self.fact_index.save()
+            self.profile_index.save()
+            for path, text in pending.items():
+                tmp = path + ".tmp"
+                try:
+                    with open(tmp, "w", encoding="utf-8") as f:
+                        f.write(text)
+                    os.replace(tmp, path)
+                except Exception as e:
+                    print(f"Memory Flush Error ({os.path.basename(path)}): {e}")
+                    with self._lock:
+                        self._dirty.add(path)   # Bir sonraki flush tekrar denesin
+
     # =====================================================
     # ESKI YEREL SİSTEM (Geriye Uyumluluk)
     # =====================================================
 
+    @timed("memory.save_important_detail")
     def save_important_detail(self, text):
         """Eski keyword-based kayit (yerel mod icin)"""
         keywords = ["adım", "ismim", "yasım", "severim", "nefret", "adres", "telefon", "proje"]
         if any(k in text.lower() for k in keywords):
-            try:
-                with open(self.memory_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                
-                if text not in data["facts"]:
-                    data["facts"].append(text)
-                    if len(data["facts"]) > 50: data["facts"].pop(0)
-                
-                with open(self.memory_file, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-            except Exception as e:
-                print(f"Memory Save Error: {e}")
+            with self._lock:
+                facts = self._memory.setdefault("facts", [])
+                if text in facts:
+                    return
+                facts.append(text)
+                dropped = facts.pop(0) if len(facts) > self.config["max_facts"] else None
+                self._context_text = None
+                self._mark_dirty(self.memory_file)
+            # Gomme kilit disinda: Ollama cagrisi okuyuculari bekletmesin
+            self.fact_index.add(text)
+            if dropped is not None:
+                self.fact_index.remove(dropped)
 
-    def get_context(self):
-        """Eski yerel hafiza context (geriye uyumlu)"""
-        try:
-            with open(self.memory_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return json.dumps(data["facts"], ensure_ascii=False)
-        except: return ""
+    @timed("memory.get_context")
+    def get_context(self, query=None):
+        """Yerel hafiza context'i: query verilirse en ilgili top_k gercek (JSON liste)"""
+        top_k = self.config["top_k"]
+        with self._lock:
+            facts = self._memory.get("facts", [])
+            if query is None or len(facts) <= top_k:
+                if self._context_text is None:
+                    self._context_text = json.dumps(facts, ensure_ascii=False)
+                return self._context_text
+            recent = facts[-top_k:]
+        hits = [text for text, _ in self.fact_index.search(query, top_k, self.config["min_score"])]
+        # Ilgili kayit yoksa / dizin kullanilamiyorsa en yeni kayitlar
+        return json.dumps(hits or recent, ensure_ascii=False)
 
+    @timed("memory.remember")
     def remember(self, user_msg, ai_reply):
         """Eski yerel kayit"""
         self.save_important_detail(user_msg)
@@ -68,32 +181,49 @@ class MemoryManager:
     # YENİ CLOUD KİŞİSELLEŞTİRME SİSTEMİ
     # =====================================================
 
+    @timed("memory.get_user_profile")
     def get_user_profile(self):
-        """user_profile.json'u oku ve dondur"""
-        try:
-            with open(self.profile_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except:
-            return self._empty_profile()
+        """Profilin kopyasi (cagiran degistirip save_user_profile ile geri verir)"""
+        with self._lock:
+            return copy.deepcopy(self._profile)
 
+    @timed("memory.save_user_profile")
     def save_user_profile(self, profile):
-        """user_profile.json'a kaydet"""
-        try:
-            with open(self.profile_file, "w", encoding="utf-8") as f:
-                json.dump(profile, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Profile Save Error: {e}")
+        """Profili RAM'de gunceller; diske gecikmeli yazilir"""
+        with self._lock:
+            items = self._set_profile_locked(copy.deepcopy(profile))
+        self.profile_index.sync(items)
 
-    def get_cloud_context(self):
+    def _set_profile_locked(self, profile):
+        """Cagiran self._lock'u tutar. Dizinlenecek kayitlari dondurur: sync (gomme) kilit disinda yapilir."""
+        self._profile = profile
+        self._mark_dirty(self.profile_file)
+        return self._profile_items(profile)
+
+    def _profile_items(self, profile):
+        """Dizinlenen profil kayitlari: {"fav_team: Galatasaray": "TERCİHLER", "not...": "NOTLAR"}"""
+        items = {}
+        for category, label in self.PROFILE_LABELS:
+            values = profile.get(category, {})
+            if isinstance(values, dict):
+                for k, v in values.items():
+                    if v: items[f"{k}: {v}"] = label
+        for note in profile.get("notes", []):
+            if note: items[note] = "NOTLAR"
+        return items
+
+    @timed("memory.get_cloud_context")
+    def get_cloud_context(self, query=None):
         """
         Cloud system prompt'a enjekte edilecek kisisellestirilmis context.
-        user_profile.json'dan dogal dilde ozet olusturur.
+        user_profile.json'dan dogal dilde ozet olusturur (query verilirse ilgili kayitlarla).
         """
-        profile = self.get_user_profile()
+        with self._lock:
+            profile = self._profile
         
         parts = []
         
-        # Identity
+        # Identity (her zaman)
         identity = profile.get("identity", {})
         if identity:
             id_parts = []
@@ -103,110 +233,145 @@ class MemoryManager:
             if identity.get("gender"): id_parts.append(f"Cinsiyet: {identity['gender']}")
             if id_parts: parts.append("KİMLİK: " + ", ".join(id_parts))
         
-        # Preferences
-        prefs = profile.get("preferences", {})
-        if prefs:
-            pref_items = [f"{k}: {v}" for k, v in prefs.items() if v]
-            if pref_items: parts.append("TERCİHLER: " + ", ".join(pref_items))
-        
-        # Work
-        work = profile.get("work", {})
-        if work:
-            work_items = [f"{k}: {v}" for k, v in work.items() if v]
-            if work_items: parts.append("İŞ: " + ", ".join(work_items))
-        
-        # Tech
-        tech = profile.get("tech", {})
-        if tech:
-            tech_items = [f"{k}: {v}" for k, v in tech.items() if v]
-            if tech_items: parts.append("TEKNOLOJİ: " + ", ".join(tech_items))
+        # Diger kategoriler + notlar: cok sayidaysa sadece istege en ilgili top_k kayit
+        items = self._profile_items(profile)
+        notes = [n for n in profile.get("notes", []) if n]
+        top_k = self.config["top_k"]
+        if query is None or len(items) <= top_k:
+            selected = set(items) - set(notes[:-5])  # Son 5 not
+        else:
+            hits = self.profile_index.search(query, top_k, self.config["min_score"])
+            # get_context gibi: ilgili kayit yoksa / dizin kullanilamiyorsa en yeni kayitlar
+            selected = {text for text, _ in hits} or set(list(items)[-top_k:])
         
-        # Location
-        loc = profile.get("location", {})
-        if loc:
-            loc_items = [f"{k}: {v}" for k, v in loc.items() if v]
-            if loc_items: parts.append("KONUM: " + ", ".join(loc_items))
-        
-        # Personality
-        pers = profile.get("personality", {})
-        if pers:
-            pers_items = [f"{k}: {v}" for k, v in pers.items() if v]
-            if pers_items: parts.append("KİŞİLİK: " + ", ".join(pers_items))
-        
-        # Notes
-        notes = profile.get("notes", [])
-        if notes:
-            parts.append("NOTLAR: " + " | ".join(notes[-5:]))  # Son 5 not
+        for _, label in self.PROFILE_LABELS:
+            chosen = [t for t, l in items.items() if l == label and t in selected]
+            if chosen: parts.append(f"{label}: " + ", ".join(chosen))
+        chosen_notes = [n for n in notes if n in selected]
+        if chosen_notes:
+            parts.append("NOTLAR: " + " | ".join(chosen_notes))
         
         if not parts:
             return ""
         
         return "[KULLANICI PROFİLİ]:\n" + "\n".join(parts)
 
+    # Bilgi icermeyen soru kaliplari (kisa mesajlarda)
+    QUESTION_PATTERNS = [
+        "adım ne", "adımı", "beni tanıyor", "hatırlıyor mu", 
+        "kim olduğumu", "ne biliyorsun", "neler biliyorsun",
+        "nasılsın", "ne yapabilirsin", "merhaba", "selam",
+        "ne zaman", "kaç", "nedir", "kimdir"
+    ]
+    # Bilgi icerme potansiyeli olan anahtar kelimeler
+    INFO_KEYWORDS = [
+        "adım", "ismim", "benim adım", "ben ", "yaşım", "yaşında",
+        "severim", "seviyorum", "tutuyorum", "takımım", "favori",
+        "kullanıyorum", "çalışıyorum", "işim", "mesleğim",
+        "bilgisayarım", "telefonum", "arabam",
+        "oturuyorum", "yaşıyorum", "şehrım", "memleketim",
+        "hobim", "ilgi", "nefret", "sevmem", "beğen",
+        "projemiz", "projem", "okulumda", "üniversite",
+        "doğum", "burçum", "kardeşim", "ailem",
+        "öğrenci", "mühendis", "developer", "programcı",
+        "windows", "linux", "mac", "iphone", "samsung", "android",
+        "nvidia", "amd", "intel", "rtx", "gtx",
+        "galatasaray", "fenerbahçe", "beşiktaş", "trabzonspor"
+    ]
+
+    def _has_personal_info(self, user_msg):
+        """Hizli on-filtre: cok kisa, soru olan ya da anahtar kelime icermeyen mesajlar kuyruga girmez"""
+        msg_lower = user_msg.lower().strip()
+        if len(msg_lower) < 5:
+            return False
+        if any(p in msg_lower for p in self.QUESTION_PATTERNS) and len(msg_lower) < 40:
+            return False
+        return any(k in msg_lower for k in self.INFO_KEYWORDS)
+
     def remember_cloud(self, user_msg, ai_reply, gemini_client, model_name):
         """
-        Arka planda Gemini'yi kullanarak konusmadan kisisel bilgi cikarir.
-        Thread icinde calisir, ana cevabi geciktirmez.
+        Konusmayi arka plandaki tek cikarim iscisinin kuyruguna ekler, ana cevabi geciktirmez.
+        Kuyruk doluysa en eski is atilir: yeni mesaj genelde daha guncel bilgidir.
         """
-        def _extract_and_save():
+        if not self._has_personal_info(user_msg):
+            EXTRACT_TOTAL.inc(result="skipped")
+            return
+        job = (user_msg, ai_reply, gemini_client, model_name)
+        with self._lock:
+            if self._extract_worker is None:
+                self._extract_worker = threading.Thread(target=self._extract_loop, name="memory-extract", daemon=True)
+                self._extract_worker.start()
+        try:
+            self._extract_queue.put_nowait(job)
+        except queue.Full:
             try:
-                self._extract_personal_info(user_msg, ai_reply, gemini_client, model_name)
+                self._extract_queue.get_nowait()
+                self._extract_queue.task_done()
+                EXTRACT_TOTAL.inc(result="dropped")
+            except queue.Empty:
+                pass
+            try:
+                self._extract_queue.put_nowait(job)
+            except queue.Full:
+                EXTRACT_TOTAL.inc(result="dropped")
+                return
+        EXTRACT_TOTAL.inc(result="queued")
+
+    def _extract_loop(self):
+        """Tek isci: ilk isi bekler, extract_window saniye icinde gelenleri toplar, tek cagri yapar."""
+        while True:
+            batch = [self._extract_queue.get()]
+            deadline = time.monotonic() + self.config["extract_window"]
+            while len(batch) < self.config["extract_batch"]:
+                remaining = 0 if self._closing.is_set() else deadline - time.monotonic()
+                try:
+                    batch.append(self._extract_queue.get(timeout=remaining) if remaining > 0
+                                 else self._extract_queue.get_nowait())
+                except queue.Empty:
+                    break
+            # Ayni mesaj tekrar gelmisse bir kez sorulur; istemci/model en son isteginki
+            unique = list({msg: (msg, reply) for msg, reply, _, _ in batch}.values())
+            _, _, gemini_client, model_name = batch[-1]
+            try:
+                self._extract_personal_info(unique, gemini_client, model_name)
             except Exception as e:
+                EXTRACT_TOTAL.inc(result="error")
                 print(f"Cloud Memory Extract Error: {e}")
-        
-        t = threading.Thread(target=_extract_and_save, daemon=True)
-        t.start()
+            finally:
+                for _ in batch:
+                    self._extract_queue.task_done()
 
-    def _extract_personal_info(self, user_msg, ai_reply, gemini_client, model_name):
+    def close(self, timeout=None):
+        """Kapanis: kuyrukta kalan cikarimlari en fazla extract_drain saniye isler, sonra flush eder."""
+        self._closing.set()
+        timeout = self.config["extract_drain"] if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        if self._extract_worker is not None:
+            while self._extract_queue.unfinished_tasks and time.monotonic() < deadline:
+                time.sleep(0.05)
+        self.flush()
+
+    @timed("memory.extract_personal_info")
+    def _extract_personal_info(self, messages, gemini_client, model_name):
         """
-        Gemini'yi kullanarak konusmadan kisisel bilgileri cikarir.
-        Sadece GERCEK bilgi iceren mesajlarda calisir.
+        Gemini'yi kullanarak bir grup konusmadan kisisel bilgileri tek cagrida cikarir.
+        messages: [(user_msg, ai_reply), ...] — on-filtreden gecmis mesajlar.
         """
         from google.genai import types
         
-        # Hizli on-filtre: cok kisa veya soru olan mesajlari atla
-        msg_lower = user_msg.lower().strip()
-        if len(msg_lower) < 5:
-            return
-        
-        # Soru kaliplari (bilgi icermez, soruyorlar)
-        question_patterns = [
-            "adım ne", "adımı", "beni tanıyor", "hatırlıyor mu", 
-            "kim olduğumu", "ne biliyorsun", "neler biliyorsun",
-            "nasılsın", "ne yapabilirsin", "merhaba", "selam",
-            "ne zaman", "kaç", "nedir", "kimdir"
-        ]
-        if any(p in msg_lower for p in question_patterns) and len(msg_lower) < 40:
-            return
-        
-        # Bilgi icerme potansiyeli olan anahtar kelimeler
-        info_keywords = [
-            "adım", "ismim", "benim adım", "ben ", "yaşım", "yaşında",
-            "severim", "seviyorum", "tutuyorum", "takımım", "favori",
-            "kullanıyorum", "çalışıyorum", "işim", "mesleğim",
-            "bilgisayarım", "telefonum", "arabam",
-            "oturuyorum", "yaşıyorum", "şehrım", "memleketim",
-            "hobim", "ilgi", "nefret", "sevmem", "beğen",
-            "projemiz", "projem", "okulumda", "üniversite",
-            "doğum", "burçum", "kardeşim", "ailem",
-            "öğrenci", "mühendis", "developer", "programcı",
-            "windows", "linux", "mac", "iphone", "samsung", "android",
-            "nvidia", "amd", "intel", "rtx", "gtx",
-            "galatasaray", "fenerbahçe", "beşiktaş", "trabzonspor"
-        ]
-        
-        if not any(k in msg_lower for k in info_keywords):
-            return
-        
         # Mevcut profili yukle
         current_profile = self.get_user_profile()
         
+        conversation = "\n".join(
+            f"{i}. KULLANICI: \"{user_msg}\"\n   AI: \"{ai_reply[:200]}\""
+            for i, (user_msg, ai_reply) in enumerate(messages, 1)
+        )
         extraction_prompt = (
-            f"GÖREV: Aşağıdaki kullanıcı mesajından KİŞİSEL BİLGİ çıkar.\n"
+            f"GÖREV: Aşağıdaki kullanıcı mesajlarından KİŞİSEL BİLGİ çıkar.\n"
             f"SADECE kesin bilgi çıkar. Tahmin yapma. Soru cümlesinden bilgi çıkarma.\n"
+            f"Mesajlar eskiden yeniye sıralıdır; çelişirse en yenisi geçerlidir.\n"
             f"\n"
-            f"KULLANICI MESAJI: \"{user_msg}\"\n"
-            f"AI CEVABI: \"{ai_reply[:200]}\"\n"
+            f"MESAJLAR:\n{conversation}\n"
             f"\n"
             f"MEVCUT PROFİL: {json.dumps(current_profile, ensure_ascii=False)}\n"
             f"\n"
@@ -253,6 +418,7 @@ class MemoryManager:
                             raw_text += part.text
             
             if not raw_text.strip():
+                EXTRACT_TOTAL.inc(result="empty")
                 return
             
             # JSON parse et
@@ -265,23 +431,49 @@ class MemoryManager:
             
             extracted = json.loads(json_str)
             
-            # Bos JSON = yeni bilgi yok
-            if not extracted or extracted == {}:
-                return
-            
-            # Mevcut profile merge et
-            self._merge_profile(current_profile, extracted)
-            self.save_user_profile(current_profile)
-            
-            try:
-                print(f"CLOUD HAFIZA: Yeni bilgi kaydedildi -> {json.dumps(extracted, ensure_ascii=False)}")
-            except: pass
-            
         except json.JSONDecodeError:
             # JSON parse edilemedi, atla
-            pass
+            EXTRACT_TOTAL.inc(result="empty")
+            return
         except Exception as e:
+            EXTRACT_TOTAL.inc(result="error")
             print(f"Cloud Memory Extraction Error: {e}")
+            return
+
+        applied = self.apply_profile_update(extracted) if isinstance(extracted, dict) else {}
+        EXTRACT_TOTAL.inc(result="applied" if applied else "empty")
+        if applied:
+            try:
+                print(f"CLOUD HAFIZA: {len(messages)} mesajdan yeni bilgi kaydedildi -> {json.dumps(applied, ensure_ascii=False)}")
+            except: pass
+
+    def apply_profile_update(self, extracted):
+        """
+        Cikarilan veriyi profile tek yerden, kilit altinda uygular. Profilde zaten ayni olan
+        alanlar ve notlar atilir; gercekten yeni bir sey yoksa hic yazilmaz. Donus: uygulanan fark.
+        """
+        with self._lock:
+            current = copy.deepcopy(self._profile)
+            fresh = {}
+            for category, values in extracted.items():
+                existing = current.get(category)
+                if category == "notes":
+                    notes = values if isinstance(values, list) else [values]
+                    new_notes = [n for n in dict.fromkeys(notes) if n and n not in (existing or [])]
+                    if new_notes: fresh["notes"] = new_notes
+                elif isinstance(values, dict):
+                    changed = {k: v for k, v in values.items()
+                               if v and str(v).strip() and (existing or {}).get(k) != v}
+                    if changed: fresh[category] = changed
+                elif values and existing != values:
+                    fresh[category] = values
+            if not fresh:
+                return {}
+            self._merge_profile(current, fresh)
+            items = self._set_profile_locked(current)
+        # Gomme kilit disinda: get_context / get_cloud_context arka plan iscisini beklemesin
+        self.profile_index.sync(items)
+        return fresh
 
     def _merge_profile(self, current, new_data):
         """
@@ -298,8 +490,7 @@ class MemoryManager:
                     for note in values:
                         if note and note not in current["notes"]:
                             current["notes"].append(note)
-                            # Max 20 not tut
-                            if len(current["notes"]) > 20:
+                            if len(current["notes"]) > self.config["max_notes"]:
                                 current["notes"].pop(0)
                 elif isinstance(values, str) and values:
                     if values not in current["notes"]:
@@ -312,6 +503,23 @@ class MemoryManager:
             elif values:
                 # Direkt deger (beklenmedik ama handle et)
                 current[category] = values
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_memory():
+    """Surec genelinde tek MemoryManager (dosyalar bir kez yuklenir, kapanista close() ile yazilir)."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                from utils.settings_manager import SettingsManager
+                memory = MemoryManager(settings=SettingsManager())
+                atexit.register(memory.close)
+                _shared = memory
+    return _shared
 # --- END FEATURE: memory_manager ---
 
 # ============================================================
@@ -0,0 +1,243 @@
+"""
+Metrics — asistan hatti icin hafif Prometheus metrikleri.
+Asama sureleri (komutan, ajanlar, hafiza, gecmis, STT/TTS, Gemini) histogram olarak
+tutulur ve /metrics uzerinden Prometheus text formatinda sunulur.
+Harici bagimlilik yok; kayit maliyeti bir perf_counter + kisa kilitli toplama.
+
+Kullanim:
+    with timed("commander", model=m) as t:
+        intent = ...
+        t.labels["intent"] = intent
+
+    @timed("memory.remember")
+    def remember(...): ...
+
+    yield from timed_stream(gen, "agent", intent="CHAT", model=m)
+"""
+
+import time
+import bisect
+import functools
+import threading
+
+# --- FEATURE: metrics ---
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._series.items())
+        for key, value in items:
+            lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [kova sayilari..., +Inf sayisi, toplam]
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def _render_series(self, key, series):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, ("le", _format_value(float(bound))))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        plain = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{plain} {_format_value(series[-1])}")
+        lines.append(f"{self.name}_count{plain} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_LABELS = ("stage", "intent", "model", "status")
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "jarvis_stage_duration_seconds",
+    "Asistan hatti asama suresi (saniye).",
+    STAGE_LABELS,
+)
+STAGE_FIRST_CHUNK_SECONDS = REGISTRY.histogram(
+    "jarvis_stage_first_chunk_seconds",
+    "Akis yapan asamalarda ilk parcaya kadar gecen sure (saniye).",
+    ("stage", "intent", "model"),
+)
+GEMINI_FALLBACKS = REGISTRY.counter(
+    "jarvis_gemini_fallback_total",
+    "Primary Gemini modeli hata verip fallback modele gecilen istek sayisi.",
+    ("model",),
+)
+
+
+def observe_stage(stage, seconds, status="ok", **labels):
+    try:
+        STAGE_SECONDS.observe(seconds, stage=stage, status=status, **labels)
+    except Exception:
+        pass
+
+
+class timed:
+    """Asama suresini olcen context manager / dekorator. labels sozlugu blok icinde guncellenebilir."""
+
+    def __init__(self, stage, **labels):
+        self.stage = stage
+        self.labels = labels
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        status = "ok" if exc_type is None else "error"
+        observe_stage(self.stage, time.perf_counter() - self._start, status, **self.labels)
+        return False
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(self.stage, **self.labels):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def timed_stream(gen, stage, **labels):
+    """Generator'i saran generator: toplam sure + ilk parca suresi. Erken kapatilirsa status=cancelled."""
+    start = time.perf_counter()
+    first = True
+    status = "ok"
+    try:
+        for item in gen:
+            if first:
+                first = False
+                try: STAGE_FIRST_CHUNK_SECONDS.observe(time.perf_counter() - start, stage=stage, **labels)
+                except Exception: pass
+            yield item
+    except GeneratorExit:
+        status = "cancelled"
+        # Ic generator'i da kapat (ornegin Ollama HTTP akisi hemen kapansin)
+        try: gen.close()
+        except Exception: pass
+        raise
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        observe_stage(stage, time.perf_counter() - start, status, **labels)
+
+
+def render_metrics():
+    return REGISTRY.render()
+# --- END FEATURE: metrics ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
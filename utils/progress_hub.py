@@ -0,0 +1,189 @@
+"""
+Progress Hub — istek bazli ilerleme/durum kanali.
+Her istek kendi request_id'si ile bir kanal acar; progress_callback ve ajan
+asamalari (komutan karari, arac cagrilari, TTS) olaylari bu kanala yayinlar.
+Istemciler /progress_stream/{request_id} uzerinden SSE ile olaylari alir,
+boylece global CURRENT_PROGRESS'in ezilmesi ve /get_progress polling'i ortadan kalkar.
+"""
+
+import time
+import uuid
+import asyncio
+import threading
+
+# --- FEATURE: progress_hub ---
+def emit_stage(progress_callback, stage, message=""):
+    """Ajan asamasini (commander, tool, tts...) callback'e bildirir. Callback yoksa/eskiyse sessizce gecer."""
+    if not progress_callback:
+        return
+    try:
+        progress_callback(None, message, stage=stage)
+    except TypeError:
+        # Eski imza: callback(percent, message) — asama olaylarini desteklemiyor
+        pass
+    except Exception as e:
+        try: print(f"Progress Stage Error: {e}")
+        except: pass
+
+
+class _Channel:
+    def __init__(self, request_id):
+        self.request_id = request_id
+        self.created = time.time()
+        self.closed_at = None
+        self.state = {"status": "idle", "percent": 0, "message": "", "stage": None}
+        self.events = []
+        self.subscribers = []  # (loop, asyncio.Queue)
+
+
+class ProgressHub:
+    """
+    Thread-safe yayin merkezi. Yayinlayicilar worker thread'lerinde calisir,
+    aboneler event loop'ta; olaylar loop.call_soon_threadsafe ile aktarilir.
+    Istemci kanala istekten once de abone olabilir (request_id istemcide uretilir).
+    """
+
+    MAX_EVENTS = 200      # Kanal basina saklanan son olay sayisi (gec abone icin tekrar oynatilir)
+    CLOSED_TTL = 60       # Kapanan kanal bu kadar saniye sonra silinir
+    IDLE_TTL = 600        # Hic kapanmayan (yarim kalmis) kanal omru
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels = {}
+
+    @staticmethod
+    def new_request_id():
+        return uuid.uuid4().hex
+
+    def _get(self, request_id):
+        channel = self._channels.get(request_id)
+        if channel is None:
+            channel = _Channel(request_id)
+            self._channels[request_id] = channel
+        return channel
+
+    def _cleanup(self):
+        now = time.time()
+        for rid, ch in list(self._channels.items()):
+            if ch.closed_at is not None:
+                expired = now - ch.closed_at > self.CLOSED_TTL
+            else:
+                expired = now - ch.created > self.IDLE_TTL
+            if expired and not ch.subscribers:
+                del self._channels[rid]
+
+    def _dispatch(self, channel, event):
+        channel.events.append(event)
+        if len(channel.events) > self.MAX_EVENTS:
+            del channel.events[:-self.MAX_EVENTS]
+        for loop, queue in list(channel.subscribers):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # Abonenin event loop'u kapanmis
+                channel.subscribers.remove((loop, queue))
+
+    # ==================== YAYIN ====================
+
+    def publish(self, request_id, percent=None, message="", stage=None):
+        """percent=None: yuzdesi olmayan asama olayi (komutan karari, arac cagrisi...)."""
+        if not request_id:
+            return
+        with self._lock:
+            self._cleanup()
+            channel = self._get(request_id)
+            if channel.closed_at is not None:
+                return
+            state = channel.state
+            if percent is not None:
+                state["percent"] = percent
+                state["status"] = "generating" if percent < 100 else "idle"
+            else:
+                state["status"] = "working"
+            if message:
+                state["message"] = message
+            if stage:
+                state["stage"] = stage
+            event = dict(state, type="progress" if percent is not None else "stage", time=time.time())
+            self._dispatch(channel, event)
+
+    def close(self, request_id, status="done"):
+        """Istek bitti: son olayi gonder, aboneler akisi kapatir."""
+        if not request_id:
+            return
+        with self._lock:
+            channel = self._get(request_id)
+            if channel.closed_at is not None:
+                return
+            channel.closed_at = time.time()
+            channel.state["status"] = status
+            self._dispatch(channel, dict(channel.state, type="done", time=time.time()))
+
+    def callback(self, request_id, also=None):
+        """progress_callback uyumlu fonksiyon: fn(percent, message="", stage=None)."""
+        def report(percent, message="", stage=None):
+            self.publish(request_id, percent, message, stage)
+            if also:
+                try: also(percent, message)
+                except: pass
+        return report
+
+    def snapshot(self, request_id):
+        with self._lock:
+            channel = self._channels.get(request_id)
+            return dict(channel.state) if channel else None
+
+    # ==================== ABONELIK ====================
+
+    async def subscribe(self, request_id, keepalive=15):
+        """Kanalin olaylarini (onceki olaylar dahil) 'done' gelene kadar yield eden async generator.
+        Kanal IDLE_TTL boyunca hic olay almazsa 'expired' durumlu son olayla kapanir."""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        with self._lock:
+            self._cleanup()
+            channel = self._get(request_id)
+            backlog = list(channel.events)
+            closed = channel.closed_at is not None
+            if not closed:
+                channel.subscribers.append((loop, queue))
+
+        try:
+            for event in backlog:
+                yield event
+            if closed:
+                return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    # Hic yayinlanmayan request_id (yanlis id / istek hic baslamadi): sonsuza dek bekleme
+                    with self._lock:
+                        abandoned = not channel.events and time.time() - channel.created > self.IDLE_TTL
+                    if abandoned:
+                        yield dict(channel.state, type="done", status="expired", time=time.time())
+                        break
+                    # Baglantiyi canli tut (proxy/mobil ag zaman asimi)
+                    yield None
+                    continue
+                yield event
+                if event.get("type") == "done":
+                    break
+        finally:
+            with self._lock:
+                try: channel.subscribers.remove((loop, queue))
+                except ValueError: pass
+# --- END FEATURE: progress_hub ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
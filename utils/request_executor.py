@@ -0,0 +1,229 @@
+"""
+Request Executor — FastAPI async endpoint'leri icin sinirli is kuyrugu.
+Bloklayan motor isleri (ollama.chat, Playwright, Whisper, dosya I/O) event loop
+yerine backend'in gercek paralelligine gore boyutlanmis thread havuzlarinda calisir.
+Kuyruk dolunca ExecutorBusyError firlatilir, server bunu 503'e cevirir.
+"""
+
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# --- FEATURE: request_executor ---
+class ExecutorBusyError(Exception):
+    """Lane kuyrugu dolu — istemciye 503 + Retry-After donulmeli."""
+
+    def __init__(self, lane_name, max_queue):
+        super().__init__(f"'{lane_name}' kuyrugu dolu ({max_queue} is)")
+        self.lane_name = lane_name
+        self.max_queue = max_queue
+
+
+class WorkerLane:
+    """
+    Tek bir backend icin sinirli calisma serisi.
+    - workers: ayni anda calisan is sayisi (backend'in gercek paralelligi)
+    - max_queue: calisan + bekleyen toplam is siniri, asilinca ExecutorBusyError
+    """
+
+    def __init__(self, name, workers=1, max_queue=8):
+        self.name = name
+        self.workers = max(1, int(workers))
+        self.max_queue = max(self.workers, int(max_queue))
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"lane-{name}")
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def _acquire(self):
+        with self._lock:
+            if self._pending >= self.max_queue:
+                raise ExecutorBusyError(self.name, self.max_queue)
+            self._pending += 1
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+    def stats(self):
+        with self._lock:
+            pending = self._pending
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": pending,
+            "running": min(pending, self.workers),
+            "queued": max(0, pending - self.workers),
+        }
+
+    async def run(self, fn, *args, **kwargs):
+        """fn'i lane havuzunda calistirir ve sonucunu bekler (event loop serbest kalir)."""
+        self._acquire()
+
+        def job():
+            # Slot is gercekten bittiginde birakilir; istemci kopsa bile thread mesgul sayilir
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._release()
+
+        try:
+            future = self._pool.submit(job)
+        except Exception:
+            self._release()
+            raise
+        return await asyncio.wrap_future(future)
+
+    def open_stream(self, gen):
+        """
+        Senkron bir generator'i lane'de tek is olarak tuketen async iterator dondurur.
+        Slot burada (yanit baslamadan) alinir ki kuyruk doluysa 503 donulebilsin.
+        Generator calistigi surece worker mesgul kalir; parcalar geldikce aktarilir.
+        Govde hic okunmazsa (istemci yanit baslamadan koptu) slot aclose/cop toplamada birakilir.
+        """
+        self._acquire()
+        return _LaneStream(self, gen)
+
+    async def _stream(self, gen):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def emit(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # Event loop kapanmis (sunucu duruyor)
+                stop.set()
+
+        def pump():
+            try:
+                if stop.is_set():
+                    return
+                for item in gen:
+                    emit(item)
+                    if stop.is_set():
+                        break
+            except BaseException as e:
+                emit(e)
+            finally:
+                try: gen.close()
+                except: pass
+                self._release()
+                emit(done)
+
+        try:
+            self._pool.submit(pump)
+        except Exception:
+            self._release()
+            raise
+
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Istemci baglantiyi kestiyse uretimi durdur: pump bir sonraki parcada
+            # generator'i kapatir (Ollama HTTP stream'i de kapanir) ve slotu birakir
+            stop.set()
+
+
+class _LaneStream:
+    """
+    open_stream'in ayirdigi slotu tasiyan async iterator. Ilk __anext__'te uretim baslar ve
+    slotun sahipligi pump'a gecer (is bitince o birakir). Hic tuketilmeden kapatilir ya da
+    cop toplanirsa slot burada birakilir; aksi halde lane kalici olarak dolar ve hep 503 doner.
+    """
+
+    def __init__(self, lane, gen):
+        self._lane = lane
+        self._gen = gen
+        self._inner = None
+        self._reserved = True
+        self._guard = threading.Lock()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._inner is None:
+            with self._guard:
+                if not self._reserved:
+                    raise StopAsyncIteration
+                self._reserved = False
+            self._inner = self._lane._stream(self._gen)
+        return await self._inner.__anext__()
+
+    async def aclose(self):
+        if self._inner is not None:
+            await self._inner.aclose()
+        else:
+            self._abandon()
+
+    def _abandon(self):
+        with self._guard:
+            if not self._reserved:
+                return
+            self._reserved = False
+        try: self._gen.close()
+        except: pass
+        self._lane._release()
+
+    def __del__(self):
+        self._abandon()
+
+
+class RequestExecutor:
+    """
+    Isimli lane'leri yonetir. Varsayilanlar config.json'daki "execution" bolumuyle ezilebilir:
+        "execution": {"local_llm": {"workers": 1, "max_queue": 8}, ...}
+    local_llm worker sayisi OLLAMA_NUM_PARALLEL ortam degiskeninden de alinabilir.
+    """
+
+    DEFAULT_LANES = {
+        "local_llm": {"workers": 1, "max_queue": 8},   # Ollama: tek GPU/CPU, istekler sirayla
+        "cloud_llm": {"workers": 4, "max_queue": 16},  # Gemini API: ag bekleyen isler
+        "browser": {"workers": 1, "max_queue": 2},     # Playwright: tek tarayici penceresi
+        "speech": {"workers": 1, "max_queue": 4},      # Whisper / Edge-TTS: zaten kilitli
+    }
+
+    def __init__(self, settings=None):
+        config = dict(self.DEFAULT_LANES)
+        num_parallel = os.getenv("OLLAMA_NUM_PARALLEL")
+        if num_parallel and num_parallel.isdigit():
+            config["local_llm"] = dict(config["local_llm"], workers=int(num_parallel))
+
+        overrides = settings.get("execution", {}) if settings else {}
+        for name, values in (overrides or {}).items():
+            if isinstance(values, dict):
+                config[name] = dict(config.get(name, {}), **values)
+
+        self.lanes = {
+            name: WorkerLane(name, cfg.get("workers", 1), cfg.get("max_queue", 8))
+            for name, cfg in config.items()
+        }
+
+    def lane(self, name):
+        return self.lanes[name]
+
+    def stats(self):
+        return {name: lane.stats() for name, lane in self.lanes.items()}
+# --- END FEATURE: request_executor ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
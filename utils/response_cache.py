@@ -0,0 +1,232 @@
+"""
+Response Cache — EngineManager.chat_mode onunde iki katmanli cevap onbellegi.
+1) Exact: normalize prompt + ilgili gecmis hash'i + model -> cevap
+   (anlam tasiyan isaretler korunur: "C++ nedir" / "C# nedir" / "5*3" / "5+3" ayri anahtarlar)
+2) Semantic: ayni gecmis/model kapsamindaki kayitlar arasinda embedding benzerligi.
+   Sadece yogun (dense) bir embedding_model ayarliysa acilir: hashed 3-gram vektorleri
+   "tarihcesini" / "gelecegini" gibi tek kelime farkli sorulari ayirt edemiyor.
+Intent bazli TTL (SEARCH/SYSTEM gibi anlik/eylem ajanlari hic onbelleklenmez),
+LRU tahliye + bellek siniri, hit/miss metrikleri.
+"""
+
+import re
+import sys
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from utils.embeddings import EmbeddingProvider, normalize_text, cosine
+from utils.metrics import REGISTRY
+
+# --- FEATURE: response_cache ---
+CACHE_REQUESTS = REGISTRY.counter(
+    "jarvis_response_cache_total",
+    "Cevap onbellegi sorgulari (tier: exact/semantic/none, result: hit/miss/skip).",
+    ("tier", "result"),
+)
+CACHE_ENTRIES = REGISTRY.gauge("jarvis_response_cache_entries", "Onbellekteki kayit sayisi.")
+CACHE_BYTES = REGISTRY.gauge("jarvis_response_cache_bytes", "Onbellegin yaklasik bellek kullanimi.")
+
+
+class _Entry:
+    __slots__ = ("key", "scope", "prompt", "answer", "intent", "vector", "numbers", "expires", "size")
+
+    def __init__(self, key, scope, prompt, answer, intent, vector, numbers, expires):
+        self.key = key
+        self.scope = scope
+        self.prompt = prompt
+        self.answer = answer
+        self.intent = intent
+        self.vector = vector
+        self.numbers = numbers
+        self.expires = expires
+        vec = vector[1] if vector else ()
+        self.size = sys.getsizeof(answer) + sys.getsizeof(prompt) + 24 * len(vec) + 200
+
+
+class ResponseCache:
+    """
+    Ayarlar (config.json "response_cache", hepsi opsiyonel):
+        enabled, max_entries, max_mb, semantic_threshold,
+        embedding_model (yoksa sadece exact katman), ttl: {"CHAT": 86400, ...}
+    """
+
+    # Saniye; 0 = onbelleklenmez. CLOUD: intent'i bilinmeyen Gemini cevaplari (saat, haber,
+    # kisisel sorular karisik gelir; intent bilinmeden guvenli TTL yok, varsayilan kapali)
+    DEFAULT_TTL = {
+        "CHAT": 24 * 3600,
+        "CODING": 24 * 3600,
+        "ANALYSIS": 12 * 3600,
+        "MATH": 7 * 24 * 3600,
+        "CLOUD": 0,
+        "SEARCH": 0, "SYSTEM": 0, "SYSTEM_REPORT": 0,
+        "BROWSER": 0, "IMAGE": 0, "VISION": 0,
+    }
+    # Semantic eslesmeye izin verilmeyen intent'ler (sayilar/komutlar kucuk farkla tamamen degisir)
+    EXACT_ONLY = {"MATH"}
+
+    # Onceki konusmaya atif yapan takip sorusu isaretleri: varsa gecmis anahtara dahil edilir
+    FOLLOW_UP = re.compile(
+        r"\b(peki|ya|onun|ona|onu|ondan|bunun|buna|bunu|bundan|sunun|suna|sunu|bu|su|o|"
+        r"daha|detay\w*|devam|baska|ayni|hala|oyleyse|neden|niye)\b"
+    )
+    ERROR_MARKERS = ("Error", "Hata", "HATA", "❌", "⚠️", "Üzgünüm", "Uzgunum")
+    # Exact anahtarda korunan isaretler (digerleri gibi atilirsa farkli sorular cakisir)
+    KEY_SYMBOLS = "+#*/%=<>^$€&@"
+    FOOTER = re.compile(r"\n\n-{6,}\n\[Hiz:[^\]]*\]\s*$")
+
+    def __init__(self, settings=None):
+        cfg = (settings.get("response_cache", {}) if settings else {}) or {}
+        self.enabled = cfg.get("enabled", True)
+        self.max_entries = int(cfg.get("max_entries", 1000))
+        self.max_bytes = int(float(cfg.get("max_mb", 16)) * 1024 * 1024)
+        self.semantic_threshold = float(cfg.get("semantic_threshold", 0.92))
+        self.ttl = dict(self.DEFAULT_TTL, **(cfg.get("ttl") or {}))
+        self.embedder = EmbeddingProvider(cfg.get("embedding_model"))
+        self.semantic = bool(cfg.get("embedding_model"))
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> _Entry (LRU sirasi)
+        self._bytes = 0
+
+    # ==================== ANAHTARLAR ====================
+
+    def _scope(self, prompt, history, model, context=""):
+        """Model + enjekte edilen hafiza + (takip sorusuysa) onceki tur.
+        Bagimsiz sorular sohbetten bagimsiz eslesir; hafiza degisince eski cevaplar eslesmez."""
+        previous_turns = ""
+        if history and self.FOLLOW_UP.search(normalize_text(prompt)):
+            previous = [m for m in history if m.get("text") != prompt][-2:]
+            previous_turns = "\n".join(f"{m.get('role')}:{normalize_text(m.get('text', ''))}" for m in previous)
+        digest = hashlib.sha1(previous_turns.encode("utf-8")).hexdigest()[:16] if previous_turns else "-"
+        memory = hashlib.sha1(context.strip().encode("utf-8")).hexdigest()[:16] if context and context.strip() else "-"
+        return f"{model}|{memory}|{digest}"
+
+    def _key(self, scope, prompt):
+        return hashlib.sha1(f"{scope}|{normalize_text(prompt, keep=self.KEY_SYMBOLS)}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _numbers(prompt):
+        return tuple(re.findall(r"\d+(?:[.,]\d+)?", prompt or ""))
+
+    def _embed(self, prompt):
+        """Yogun vektor ya da None (semantic kapali / Ollama gecici olarak hashed'e dustu)."""
+        if not self.semantic:
+            return None
+        vector = self.embedder.embed(prompt)
+        return vector if vector[0] != "hashed" else None
+
+    # ==================== SORGU ====================
+
+    def lookup(self, prompt, history=None, model="", context=""):
+        """Donus: {"answer", "tier", "intent", "score"} veya None. context: prompt'a giren hafiza."""
+        if not self.enabled or not prompt:
+            return None
+        scope = self._scope(prompt, history, model, context)
+        key = self._key(scope, prompt)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires > now:
+                    self._entries.move_to_end(key)
+                    CACHE_REQUESTS.inc(tier="exact", result="hit")
+                    return {"answer": entry.answer, "tier": "exact", "intent": entry.intent, "score": 1.0}
+                self._remove(key)
+            candidates = [e for e in self._entries.values()
+                          if e.scope == scope and e.vector and e.intent not in self.EXACT_ONLY]
+        CACHE_REQUESTS.inc(tier="exact", result="miss")
+
+        vector = self._embed(prompt) if candidates else None
+        if vector is None:
+            CACHE_REQUESTS.inc(tier="semantic", result="miss")
+            return None
+
+        numbers = self._numbers(prompt)
+        best, best_score = None, 0.0
+        for e in candidates:
+            if e.expires <= now or e.numbers != numbers:
+                continue
+            score = cosine(vector, e.vector)
+            if score > best_score:
+                best, best_score = e, score
+
+        if best is not None and best_score >= self.semantic_threshold:
+            with self._lock:
+                if best.key in self._entries:
+                    self._entries.move_to_end(best.key)
+            CACHE_REQUESTS.inc(tier="semantic", result="hit")
+            return {"answer": best.answer, "tier": "semantic", "intent": best.intent, "score": round(best_score, 3)}
+        CACHE_REQUESTS.inc(tier="semantic", result="miss")
+        return None
+
+    # ==================== KAYIT ====================
+
+    def cacheable(self, intent, answer):
+        if not self.enabled or not answer or not answer.strip():
+            return False
+        if self.ttl.get(intent or "CHAT", 0) <= 0:
+            return False
+        head = answer.strip()[:80]
+        return not any(marker in head for marker in self.ERROR_MARKERS)
+
+    def store(self, prompt, answer, intent, history=None, model="", context=""):
+        if not self.cacheable(intent, answer):
+            CACHE_REQUESTS.inc(tier="none", result="skip")
+            return False
+        answer = self.FOOTER.sub("", answer)
+        scope = self._scope(prompt, history, model, context)
+        key = self._key(scope, prompt)
+        vector = None if intent in self.EXACT_ONLY else self._embed(prompt)
+        entry = _Entry(key, scope, prompt, answer, intent, vector, self._numbers(prompt),
+                       time.time() + self.ttl.get(intent or "CHAT", 0))
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            self._evict()
+            CACHE_ENTRIES.set(len(self._entries))
+            CACHE_BYTES.set(self._bytes)
+        return True
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self):
+        # Once suresi dolanlar, sonra en az kullanilanlar (LRU basi)
+        now = time.time()
+        for key in [k for k, e in self._entries.items() if e.expires <= now]:
+            self._remove(key)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            CACHE_ENTRIES.set(0)
+            CACHE_BYTES.set(0)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes,
+                    "max_entries": self.max_entries, "max_bytes": self.max_bytes,
+                    "embedding": self.embedder.kind}
+# --- END FEATURE: response_cache ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
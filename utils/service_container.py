@@ -0,0 +1,124 @@
+"""
+Service Container — agir alt sistemlerin (motorlar, hafiza, ses) tembel kurulumu.
+Her servis ilk kullanimda (get) ya da port acildiktan sonra arka plan isinmasinda
+(warm_up) bir kez kurulur. Durum /ready uzerinden raporlanir; masaustu kabugu
+(app.py) pencereyi acmadan once bunu bekler.
+
+Kullanim:
+    services = ServiceContainer()
+    services.register("gemini", lambda: GeminiEngine(...))
+    services.get("gemini")          # ilk cagrida kurar, sonra ayni ornek
+    services.warm_up()              # kayitli servisleri arka planda sirayla kurar
+"""
+
+import time
+import threading
+
+from utils.metrics import REGISTRY
+
+# --- FEATURE: service_container ---
+SERVICE_INIT_SECONDS = REGISTRY.gauge(
+    "jarvis_service_init_seconds",
+    "Servisin kurulum suresi (saniye).",
+    ("service",),
+)
+
+
+class _Service:
+    __slots__ = ("name", "factory", "warm", "instance", "state", "seconds", "error", "lock")
+
+    def __init__(self, name, factory, warm):
+        self.name = name
+        self.factory = factory
+        self.warm = warm
+        self.instance = None
+        self.state = "pending"      # pending -> building -> ready | failed
+        self.seconds = None
+        self.error = None
+        self.lock = threading.Lock()
+
+
+class ServiceContainer:
+    def __init__(self):
+        self._services = {}
+        self._order = []
+        self._warm_thread = None
+        self.created = time.time()
+
+    def register(self, name, factory, warm=True):
+        """factory: argumansiz cagrilabilir. warm=False: sadece ilk kullanimda kurulur."""
+        self._services[name] = _Service(name, factory, warm)
+        self._order.append(name)
+
+    def get(self, name):
+        service = self._services[name]
+        if service.state == "ready":
+            return service.instance
+        with service.lock:
+            if service.state != "ready":
+                service.state = "building"
+                start = time.perf_counter()
+                try:
+                    service.instance = service.factory()
+                except Exception as e:
+                    service.state = "failed"
+                    service.error = str(e)
+                    raise
+                finally:
+                    service.seconds = time.perf_counter() - start
+                    SERVICE_INIT_SECONDS.set(service.seconds, service=name)
+                service.state = "ready"
+                service.error = None
+        return service.instance
+
+    def is_built(self, name):
+        return self._services[name].state == "ready"
+
+    def warm_up(self, background=True):
+        """warm=True servisleri kayit sirasiyla kur. Hatalar loglanir, ilk get'te tekrar denenir."""
+        def _run():
+            start = time.perf_counter()
+            for name in self._order:
+                if not self._services[name].warm:
+                    continue
+                try:
+                    self.get(name)
+                except Exception as e:
+                    try: print(f"Servis kurulamadi ({name}): {e}")
+                    except: pass
+            try: print(f"Servisler hazir ({time.perf_counter() - start:.2f}s)")
+            except: pass
+
+        if not background:
+            _run()
+            return None
+        if self._warm_thread is None:
+            self._warm_thread = threading.Thread(target=_run, name="service-warmup", daemon=True)
+            self._warm_thread.start()
+        return self._warm_thread
+
+    def ready(self):
+        """Isinacak servislerin hepsi denendi mi (basarisiz olanlar da hazir sayilir, status'ta gorunur)."""
+        return all(s.state in ("ready", "failed") for s in self._services.values() if s.warm)
+
+    def status(self):
+        return {
+            name: {"state": s.state,
+                   "seconds": round(s.seconds, 3) if s.seconds is not None else None,
+                   "error": s.error}
+            for name, s in ((n, self._services[n]) for n in self._order)
+        }
+# --- END FEATURE: service_container ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
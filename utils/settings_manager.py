@@ -1,8 +1,179 @@
 import json
 import os
+import tempfile
+import threading
+from contextlib import contextmanager
 
 # --- FEATURE: settings_manager ---
+KEYS_FIELDS = ("api_key", "gemini_api_key", "elevenlabs_voice_id")
+
+
+def _atomic_write_json(path, data):
+    """tmp dosyaya yaz + os.replace: yarim yazilmis config.json asla okunmaz."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".settings_", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+
+
+class _SettingsStore:
+    """
+    Surec genelinde tek ayar deposu (dosya yolu basina bir tane).
+    config.json ve api_keys.json bellekte tutulur; dosya mtime'i degisince
+    (baska surec / elle duzenleme) yeniden okunur. Yazmalar atomiktir ve
+    batch() icinde biriktirilip tek seferde yapilir.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_paths(cls, config_path, keys_path, default_config):
+        key = (os.path.abspath(config_path), os.path.abspath(keys_path))
+        with cls._instances_lock:
+            store = cls._instances.get(key)
+            if store is None:
+                store = cls._instances[key] = cls(config_path, keys_path, default_config)
+            return store
+
+    def __init__(self, config_path, keys_path, default_config):
+        self.config_path = config_path
+        self.keys_path = keys_path
+        self.default_config = default_config
+        self._lock = threading.RLock()
+        self._config = None
+        self._keys = None
+        self._config_sig = None
+        self._keys_sig = None
+        self._batch_depth = 0
+        self._dirty = set()
+
+    @staticmethod
+    def _signature(path):
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _read_config(self):
+        if not os.path.exists(self.config_path):
+            return dict(self.default_config)
+        try:
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+            for key, value in self.default_config.items():
+                if key not in loaded:
+                    loaded[key] = value
+            return loaded
+        except:
+            return dict(self.default_config)
+
+    def _read_keys(self):
+        empty = {field: "" for field in KEYS_FIELDS}
+        if not os.path.exists(self.keys_path):
+            return empty
+        try:
+            with open(self.keys_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except:
+            return empty
+
+    def _refresh(self, force=False):
+        # Bekleyen (yazilmamis) degisiklik varsa diskten ezme
+        if self._batch_depth:
+            return
+        sig = self._signature(self.config_path)
+        if force or self._config is None or sig != self._config_sig:
+            self._config = self._read_config()
+            self._config_sig = sig
+        sig = self._signature(self.keys_path)
+        if force or self._keys is None or sig != self._keys_sig:
+            self._keys = self._read_keys()
+            self._keys_sig = sig
+
+    def _flush(self):
+        if "config" in self._dirty:
+            try:
+                _atomic_write_json(self.config_path, self._config)
+                self._config_sig = self._signature(self.config_path)
+            except Exception as e:
+                print(f"Config save error: {e}")
+        if "keys" in self._dirty:
+            try:
+                _atomic_write_json(self.keys_path, self._keys)
+                self._keys_sig = self._signature(self.keys_path)
+            except Exception as e:
+                print(f"Keys save error: {e}")
+        self._dirty.clear()
+
+    # ==================== API ====================
+
+    def config(self, force=False):
+        with self._lock:
+            self._refresh(force)
+            return self._config
+
+    def keys(self):
+        with self._lock:
+            self._refresh()
+            return self._keys
+
+    def get(self, key, default=None):
+        with self._lock:
+            self._refresh()
+            source = self._keys if key in KEYS_FIELDS else self._config
+            return source.get(key, default)
+
+    def update(self, values):
+        """Birden fazla anahtari tek islemde degistir: her dosya en fazla bir kez yazilir."""
+        with self.batch():
+            for key, value in values.items():
+                if key in KEYS_FIELDS:
+                    self._keys[key] = value
+                    self._dirty.add("keys")
+                else:
+                    self._config[key] = value
+                    self._dirty.add("config")
+
+    def mark_dirty(self, name):
+        with self._lock:
+            self._dirty.add(name)
+            if not self._batch_depth:
+                self._flush()
+
+    @contextmanager
+    def batch(self):
+        with self._lock:
+            self._refresh()
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._flush()
+
+
 class SettingsManager:
+    """
+    Ayar erisimi. Tum ornekler ayni dosyalar icin ortak _SettingsStore'u paylasir,
+    bu yuzden SettingsManager() olusturmak ucuzdur ve get() diski okumaz.
+    Coklu degisiklik icin:
+        sm.update({"theme": "Koyu", "language": "tr"})
+        # veya
+        with sm.batch():
+            sm.set("theme", "Koyu"); sm.set("language", "tr")
+    """
+
     def __init__(self, config_path="config.json", keys_path="api_keys.json"):
         self.config_path = config_path
         self.keys_path = keys_path
@@ -20,63 +191,40 @@ class SettingsManager:
                 "vision": "llava"
             }
         }
-        self.config = self.load_config()
+        self._store = _SettingsStore.for_paths(config_path, keys_path, self.default_config)
+
+    @property
+    def config(self):
+        return self._store.config()
 
     def load_config(self):
-        if not os.path.exists(self.config_path):
-            return self.default_config
-        
-        try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                loaded = json.load(f)
-                for key, value in self.default_config.items():
-                    if key not in loaded:
-                        loaded[key] = value
-                return loaded
-        except:
-            return self.default_config
+        """Diskten zorla yeniden oku."""
+        return self._store.config(force=True)
 
     def _load_keys(self):
-        """API anahtarlarini ayri dosyadan yukler."""
-        if not os.path.exists(self.keys_path):
-            return {"api_key": "", "gemini_api_key": "", "elevenlabs_voice_id": ""}
-        try:
-            with open(self.keys_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except:
-            return {"api_key": "", "gemini_api_key": "", "elevenlabs_voice_id": ""}
+        return dict(self._store.keys())
 
     def _save_keys(self, keys_dict):
-        """API anahtarlarini dosyaya kaydeder."""
-        try:
-            with open(self.keys_path, "w", encoding="utf-8") as f:
-                json.dump(keys_dict, f, indent=4)
-        except Exception as e:
-            print(f"Keys save error: {e}")
+        with self._store.batch():
+            store_keys = self._store.keys()
+            store_keys.clear()
+            store_keys.update(keys_dict)
+            self._store.mark_dirty("keys")
 
     def save_config(self):
-        try:
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                json.dump(self.config, f, indent=4)
-        except Exception as e:
-            print(f"Config save error: {e}")
+        self._store.mark_dirty("config")
 
     def get(self, key, default=None):
-        keys_fields = ["api_key", "gemini_api_key", "elevenlabs_voice_id"]
-        if key in keys_fields:
-            keys = self._load_keys()
-            return keys.get(key, default)
-        return self.config.get(key, default)
+        return self._store.get(key, default)
 
     def set(self, key, value):
-        keys_fields = ["api_key", "gemini_api_key", "elevenlabs_voice_id"]
-        if key in keys_fields:
-            keys = self._load_keys()
-            keys[key] = value
-            self._save_keys(keys)
-        else:
-            self.config[key] = value
-            self.save_config()
+        self._store.update({key: value})
+
+    def update(self, values):
+        self._store.update(values)
+
+    def batch(self):
+        return self._store.batch()
 # --- END FEATURE: settings_manager ---
 
 # ============================================================
@@ -0,0 +1,114 @@
+"""
+Speculative — bir generator'i arka plan thread'inde onceden calistirip parcalarini tamponlar.
+LocalBrain, komutan karar verirken CHAT ajanini bununla spekulatif olarak baslatir:
+karar CHAT ise tamponlanan + gelen parcalar aynen kullanilir, degilse cancel() ile
+uretim durdurulur (generator kapanir, Ollama HTTP akisi kesilir) ve bosa giden is olculur.
+"""
+
+import time
+import queue
+import threading
+
+from utils.metrics import REGISTRY
+
+# --- FEATURE: speculative_stream ---
+SPECULATION_TOTAL = REGISTRY.counter(
+    "jarvis_speculation_total",
+    "Spekulatif CHAT uretimi sonuclari (hit: kullanildi, miss: iptal edildi).",
+    ("result",),
+)
+SPECULATION_WASTED_SECONDS = REGISTRY.counter(
+    "jarvis_speculation_wasted_seconds_total",
+    "Iptal edilen spekulatif uretimlerde harcanan sure (saniye).",
+)
+SPECULATION_WASTED_CHUNKS = REGISTRY.counter(
+    "jarvis_speculation_wasted_chunks_total",
+    "Iptal edilen spekulatif uretimlerde uretilip atilan parca sayisi.",
+)
+
+
+class BackgroundStream:
+    """Generator'i hemen ayri thread'de tuketmeye baslar; iterasyon tampondan okur."""
+
+    _DONE = object()
+
+    def __init__(self, gen, name="speculative", on_cancel=None):
+        self._gen = gen
+        self._on_cancel = on_cancel   # Ornek: CancelToken.cancel — ilk parcayi bekleyen HTTP akisini keser
+        self._queue = queue.Queue()
+        self._cancel = threading.Event()
+        self.started = time.perf_counter()
+        self.finished = None
+        self.chunks = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            for item in self._gen:
+                if self._cancel.is_set():
+                    break
+                self.chunks += 1
+                self._queue.put(item)
+        except Exception as e:
+            self._queue.put(e)
+        finally:
+            try: self._gen.close()
+            except: pass
+            self.finished = time.perf_counter()
+            self._queue.put(self._DONE)
+
+    def __iter__(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is self._DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Tuketici erken biraktiysa (istemci koptu) arka plan uretimini de durdur
+            self._stop()
+
+    def _stop(self):
+        if self._cancel.is_set():
+            return
+        self._cancel.set()
+        if self._on_cancel is not None and self.finished is None:
+            try: self._on_cancel()
+            except Exception as e:
+                try: print(f"Spekulasyon iptal hatasi: {e}")
+                except: pass
+
+    def cancel(self):
+        """Uretimi durdur. Donus: (bosa giden sure, uretilen parca sayisi)."""
+        self._stop()
+        end = self.finished or time.perf_counter()
+        wasted = end - self.started
+        return wasted, self.chunks
+
+    def commit(self):
+        SPECULATION_TOTAL.inc(result="hit")
+        return self
+
+    def discard(self):
+        wasted, chunks = self.cancel()
+        SPECULATION_TOTAL.inc(result="miss")
+        SPECULATION_WASTED_SECONDS.inc(wasted)
+        SPECULATION_WASTED_CHUNKS.inc(chunks)
+        return wasted, chunks
+# --- END FEATURE: speculative_stream ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
@@ -0,0 +1,211 @@
+"""
+Vector Memory — uzun sureli hafiza icin artimli NumPy vektor dizini (float16 .npz kaydi);
+embedding turu degisirse metinlerden yeniden kurulur.
+"""
+
+import os
+import json
+import threading
+
+import numpy as np
+
+from utils.embeddings import EmbeddingProvider, hashed_ngrams
+from utils.metrics import REGISTRY, timed
+
+# --- FEATURE: vector_memory ---
+MEMORY_ITEMS = REGISTRY.gauge(
+    "jarvis_memory_index_items",
+    "Hafiza vektor dizinindeki kayit sayisi (index: facts/profile).",
+    ("index",),
+)
+
+
+class VectorIndex:
+    def __init__(self, path, embedder=None, hashed_dim=512, name="facts"):
+        self.path = path
+        self.name = name
+        self.embedder = embedder or EmbeddingProvider()
+        self.hashed_dim = hashed_dim
+        self.kind = None
+        self._lock = threading.RLock()
+        self._vectors = np.zeros((0, 0), dtype=np.float32)   # Kapasite >= _count (ikiye katlanarak buyur)
+        self._count = 0
+        self._texts = []
+        self._rows = {}       # metin -> satir
+        self._pending = []    # Ollama kapaliyken gelen, dizin turunde gomulemeyen metinler
+        self.dirty = False
+        self._load()
+
+    @property
+    def target_kind(self):
+        """Ayarlardaki embedding turu (gecici Ollama hatasindan bagimsiz)."""
+        return f"dense:{self.embedder.model}" if self.embedder.model else "hashed"
+
+    def __len__(self):
+        return self._count
+
+    # ==================== GOMME ====================
+
+    def _embed(self, text):
+        """(tur, float32 vektor). hashed vektorler dizinde kucuk boyutta tutulur."""
+        kind, vec = ("hashed", None) if self.embedder.kind == "hashed" else self.embedder.embed(text)
+        if kind == "hashed":
+            sparse = hashed_ngrams(text, dim=self.hashed_dim)
+            dense = np.zeros(self.hashed_dim, dtype=np.float32)
+            dense[list(sparse)] = list(sparse.values())
+            return kind, dense
+        return kind, np.asarray(vec, dtype=np.float32)
+
+    def _append(self, text, vec):
+        if self._count == 0 and self._vectors.shape[1] != vec.shape[0]:
+            self._vectors = np.zeros((16, vec.shape[0]), dtype=np.float32)
+        if vec.shape[0] != self._vectors.shape[1]:
+            return False
+        if self._count == len(self._vectors):
+            grown = np.zeros((max(16, 2 * len(self._vectors)), self._vectors.shape[1]), dtype=np.float32)
+            grown[:self._count] = self._vectors[:self._count]
+            self._vectors = grown
+        self._vectors[self._count] = vec
+        self._rows[text] = self._count
+        self._texts.append(text)
+        self._count += 1
+        return True
+
+    # ==================== GUNCELLEME ====================
+
+    def add(self, text):
+        if not text:
+            return
+        with self._lock:
+            if text in self._rows or text in self._pending:
+                return
+            self._pending.append(text)
+            self._drain()
+
+    def _drain(self):
+        """Bekleyen metinleri dizin turunde gomer. Tur uyusmazsa (Ollama kapali) sonraya kalir."""
+        while self._pending:
+            kind, vec = self._embed(self._pending[0])
+            if kind != self.target_kind:
+                break
+            if self._count == 0:
+                self.kind = kind
+            text = self._pending.pop(0)
+            if self._append(text, vec):
+                self.dirty = True
+        MEMORY_ITEMS.set(self._count, index=self.name)
+
+    def remove(self, text):
+        with self._lock:
+            if text in self._pending:
+                self._pending.remove(text)
+            row = self._rows.pop(text, None)
+            if row is None:
+                return
+            last = self._count - 1
+            if row != last:
+                moved = self._texts[last]
+                self._vectors[row] = self._vectors[last]
+                self._texts[row] = moved
+                self._rows[moved] = row
+            self._texts.pop()
+            self._count -= 1
+            self.dirty = True
+            MEMORY_ITEMS.set(self._count, index=self.name)
+
+    def sync(self, texts):
+        """Dizini verilen metin kumesine esitler: eksikler eklenir, fazlalar silinir."""
+        wanted = list(dict.fromkeys(t for t in texts if t))
+        with self._lock:
+            if self._count and self.kind != self.target_kind:
+                try: print(f"Hafiza dizini ({self.name}): embedding turu degisti, yeniden kuruluyor")
+                except: pass
+                self._reset()
+            keep = set(wanted)
+            for text in [t for t in self._texts if t not in keep]:
+                self.remove(text)
+            self._pending = [t for t in self._pending if t in keep]
+            for text in wanted:
+                if text not in self._rows and text not in self._pending:
+                    self._pending.append(text)
+            self._drain()
+
+    def _reset(self):
+        self.kind = None
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._count = 0
+        self._texts = []
+        self._rows = {}
+        self.dirty = True
+
+    # ==================== ARAMA ====================
+
+    @timed("memory.search")
+    def search(self, query, k=5, min_score=0.0):
+        """En benzer k kayit: [(metin, skor), ...] yuksekten dusuge. Dizin kullanilamiyorsa []."""
+        with self._lock:
+            if self._pending:
+                self._drain()
+            if not self._count or not query:
+                return []
+            kind, q = self._embed(query)
+            if kind != self.kind or q.shape[0] != self._vectors.shape[1]:
+                return []
+            scores = self._vectors[:self._count] @ q
+            k = min(k, self._count)
+            top = np.argpartition(-scores, k - 1)[:k] if k < self._count else np.arange(self._count)
+            top = top[np.argsort(-scores[top])]
+            return [(self._texts[i], float(scores[i])) for i in top if scores[i] >= min_score]
+
+    # ==================== KAYIT ====================
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+                vectors = data["vectors"].astype(np.float32)
+            if len(meta["texts"]) != len(vectors):
+                raise ValueError("metin/vektor sayisi uyusmuyor")
+            self.kind = meta["kind"] if meta["texts"] else None
+            self._vectors = vectors
+            self._count = len(vectors)
+            self._texts = list(meta["texts"])
+            self._rows = {t: i for i, t in enumerate(self._texts)}
+            MEMORY_ITEMS.set(self._count, index=self.name)
+        except Exception as e:
+            try: print(f"Hafiza dizini okunamadi ({os.path.basename(self.path)}), yeniden kurulacak: {e}")
+            except: pass
+            self._reset()
+
+    def save(self):
+        """Degisiklik varsa atomik olarak yazar (gecici dosya + os.replace)."""
+        with self._lock:
+            if not self.dirty:
+                return
+            vectors = self._vectors[:self._count].astype(np.float16)
+            meta = json.dumps({"kind": self.kind, "texts": self._texts}, ensure_ascii=False).encode("utf-8")
+            self.dirty = False
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                np.savez_compressed(f, vectors=vectors, meta=np.frombuffer(meta, dtype=np.uint8))
+            os.replace(tmp, self.path)
+        except Exception as e:
+            self.dirty = True
+            print(f"Hafiza dizini yazilamadi ({os.path.basename(self.path)}): {e}")
+# --- END FEATURE: vector_memory ---
+
+# ============================================================
+# GELISTIRICI NOTU (AI & Insan):
+# Bu projede "Feature Marker" sistemi kullanilmaktadir.
+# Yeni ozellik eklerken asagidaki formati kullanin:
+#
+#   # --- FEATURE: ozellik_adi ---
+#   ... kodlar ...
+#   # --- END FEATURE: ozellik_adi ---
+#
+# Bu markerlar otomatik guncelleme ve birlestirme icin gereklidir.
+# Markerlar olmadan ozellikler kayit defterine eklenmez!
+# ============================================================
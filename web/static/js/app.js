@@ -34,39 +34,42 @@ async function sendMessage() {
     showLoading(loadingId);
     isGenerating = true;
 
-    // Check for image generation to start polling
-    if (text.toLowerCase().includes("çiz") || text.toLowerCase().includes("oluştur")) {
-        startProgressPolling(loadingId);
-    }
+    // Istege ozel ilerleme kanali (komutan karari, arac cagrilari, cizim yuzdesi)
+    const requestId = newRequestId();
+    startProgressStream(loadingId, requestId);
 
     // 3. API Call — Try streaming first, fallback to regular
     try {
         const formData = new FormData();
         formData.append('mesaj', text);
         formData.append('mod', 'sohbet');
+        formData.append('request_id', requestId);
 
         // Use streaming endpoint
         const response = await fetch('/chat_stream', { method: 'POST', body: formData });
 
-        // Remove loading indicator
-        stopProgressPolling();
-        removeLoading(loadingId);
+        // Sunucu kuyrugu dolu (503): /chat'e dusmek ayni kuyruga tekrar yuk bindirir
+        if (response.status === 503) {
+            stopProgressStream();
+            removeLoading(loadingId);
+            const busy = await response.json();
+            addMessage(busy.cevap || "Sistem su an mesgul.", 'ai');
+            isGenerating = false;
+            return;
+        }
 
         if (!response.ok) throw new Error("Stream failed");
 
-        // Create AI message bubble for streaming
-        const { row, textDiv, rawText } = createStreamingMessage();
+        // AI balonu ilk parca gelince olusturulur; o zamana kadar yukleme + ilerleme gorunur
+        let row = null, textDiv = null;
+        const cursor = document.createElement('span');
+        cursor.className = 'streaming-cursor';
 
         const reader = response.body.getReader();
         const decoder = new TextDecoder();
         let buffer = '';
         let fullText = '';
 
-        // Add cursor
-        const cursor = document.createElement('span');
-        cursor.className = 'streaming-cursor';
-        textDiv.appendChild(cursor);
-
         while (true) {
             const { done, value } = await reader.read();
             if (done) break;
@@ -83,6 +86,11 @@ async function sendMessage() {
                             // Remove cursor when done
                             cursor.remove();
                         } else {
+                            if (!textDiv) {
+                                stopProgressStream();
+                                removeLoading(loadingId);
+                                ({ row, textDiv } = createStreamingMessage());
+                            }
                             fullText += data.text;
                             // Remove cursor temporarily, update text, re-add cursor
                             cursor.remove();
@@ -96,6 +104,9 @@ async function sendMessage() {
         }
 
         // Final render without cursor + add copy button
+        stopProgressStream();
+        removeLoading(loadingId);
+        if (!textDiv) ({ row, textDiv } = createStreamingMessage());
         cursor.remove();
         textDiv.innerHTML = formatMessage(fullText);
         addCopyButton(row, textDiv, fullText);
@@ -105,7 +116,7 @@ async function sendMessage() {
 
     } catch (error) {
         // Fallback to regular /chat endpoint
-        stopProgressPolling();
+        stopProgressStream();
         removeLoading(loadingId);
         console.warn("Stream failed, fallback:", error);
 
@@ -113,6 +124,7 @@ async function sendMessage() {
             const formData2 = new FormData();
             formData2.append('mesaj', text);
             formData2.append('mod', 'sohbet');
+            formData2.append('request_id', newRequestId());
 
             const res = await fetch('/chat', { method: 'POST', body: formData2 });
             const data = await res.json();
@@ -193,36 +205,60 @@ function addCopyButton(messageRow, textDiv, rawText) {
 //  FEATURE 3: SIDEBAR SEARCH
 // =============================================
 
+let archiveSearchTimer = null;
+let archiveSearchHits = new Set();
+
 function initSidebarSearch() {
     if (!sidebarSearch) return;
 
     sidebarSearch.addEventListener('input', () => {
-        const query = sidebarSearch.value.trim().toLowerCase();
-        const items = historyList.querySelectorAll('.history-item');
-        let visibleCount = 0;
-
-        // Remove old no-results message
-        const oldNoResults = historyList.querySelector('.no-results');
-        if (oldNoResults) oldNoResults.remove();
-
-        items.forEach(item => {
-            const text = item.textContent.toLowerCase();
-            if (!query || text.includes(query)) {
-                item.style.display = '';
-                visibleCount++;
-            } else {
-                item.style.display = 'none';
-            }
-        });
+        filterSidebarItems();
+
+        // Sunucu tarafi tam metin arama (mesaj iceriginde), 250ms debounce
+        if (archiveSearchTimer) clearTimeout(archiveSearchTimer);
+        const query = sidebarSearch.value.trim();
+        if (!query) {
+            archiveSearchHits = new Set();
+            return;
+        }
+        archiveSearchTimer = setTimeout(async () => {
+            try {
+                const res = await fetch(`/search_archives?q=${encodeURIComponent(query)}&page_size=100`);
+                const data = await res.json();
+                if (sidebarSearch.value.trim() !== query) return; // Eski sonuc
+                archiveSearchHits = new Set((data.results || []).map(r => r.filename));
+                filterSidebarItems();
+            } catch (e) { }
+        }, 250);
+    });
+}
 
-        // Show no results message
-        if (query && visibleCount === 0) {
-            const noResults = document.createElement('div');
-            noResults.className = 'no-results';
-            noResults.textContent = 'Sonuc bulunamadi';
-            historyList.appendChild(noResults);
+function filterSidebarItems() {
+    const query = sidebarSearch.value.trim().toLowerCase();
+    const items = historyList.querySelectorAll('.history-item');
+    let visibleCount = 0;
+
+    // Remove old no-results message
+    const oldNoResults = historyList.querySelector('.no-results');
+    if (oldNoResults) oldNoResults.remove();
+
+    items.forEach(item => {
+        const text = item.textContent.toLowerCase();
+        if (!query || text.includes(query) || archiveSearchHits.has(item.dataset.filename)) {
+            item.style.display = '';
+            visibleCount++;
+        } else {
+            item.style.display = 'none';
         }
     });
+
+    // Show no results message
+    if (query && visibleCount === 0) {
+        const noResults = document.createElement('div');
+        noResults.className = 'no-results';
+        noResults.textContent = 'Sonuc bulunamadi';
+        historyList.appendChild(noResults);
+    }
 }
 
 // =============================================
@@ -456,11 +492,15 @@ async function loadSidebarHistory() {
             item.style.display = 'flex';
             item.style.justifyContent = 'space-between';
             item.style.alignItems = 'center';
-
-            let display = chat.filename.replace("chat_", "").replace(".json", "");
-            const parts = display.split("_");
-            if (parts.length > 2) {
-                display = parts.slice(2).join(" ");
+            item.dataset.filename = chat.filename;
+
+            let display = chat.title;
+            if (!display) {
+                display = chat.filename.replace("chat_", "").replace(".json", "");
+                const parts = display.split("_");
+                if (parts.length > 2) {
+                    display = parts.slice(2).join(" ");
+                }
             }
 
             const textSpan = document.createElement("span");
@@ -553,53 +593,91 @@ function removeLoading(id) {
     if (el) el.remove();
 }
 
-// Global polling interval
-let progressInterval = null;
+// Aktif ilerleme kanali (SSE)
+let progressSource = null;
 
-function startProgressPolling(elementId) {
-    if (progressInterval) clearInterval(progressInterval);
+function newRequestId() {
+    if (window.crypto && crypto.randomUUID) return crypto.randomUUID().replace(/-/g, '');
+    return Date.now().toString(36) + Math.random().toString(36).slice(2);
+}
 
-    setTimeout(() => {
-        const loaderDiv = document.getElementById(elementId);
-        if (!loaderDiv) return;
+function ensureProgressBar(elementId) {
+    const loaderDiv = document.getElementById(elementId);
+    if (!loaderDiv) return;
+
+    const textContent = loaderDiv.querySelector('.text-content');
+    if (!textContent || textContent.querySelector(".progress-container")) return;
+
+    const pCont = document.createElement('div');
+    pCont.className = 'progress-container';
+    pCont.style.marginTop = '10px';
+    pCont.style.width = '100%';
+    pCont.innerHTML = `
+        <div style="font-size:12px; margin-bottom:5px; color:#aaa;" id="${elementId}-status">Hazirlaniyor...</div>
+        <div style="width:100%; height:8px; background:#444; border-radius:4px; overflow:hidden;">
+            <div id="${elementId}-bar" class="progress-bar" style="width:0%; height:100%; background:cyan; transition:width 0.5s;"></div>
+        </div>
+    `;
+    textContent.appendChild(pCont);
+}
+
+function setLoadingStatus(elementId, message) {
+    const loaderDiv = document.getElementById(elementId);
+    if (!loaderDiv || !message) return;
 
+    let stat = document.getElementById(`${elementId}-status`);
+    if (!stat) {
         const textContent = loaderDiv.querySelector('.text-content');
         if (!textContent) return;
+        stat = document.createElement('div');
+        stat.id = `${elementId}-status`;
+        stat.style.cssText = 'font-size:12px; margin-top:6px; color:#aaa;';
+        textContent.appendChild(stat);
+    }
+    stat.innerText = message;
+}
 
-        if (!textContent.querySelector(".progress-container")) {
-            const pCont = document.createElement('div');
-            pCont.className = 'progress-container';
-            pCont.style.marginTop = '10px';
-            pCont.style.width = '100%';
-            pCont.innerHTML = `
-                <div style="font-size:12px; margin-bottom:5px; color:#aaa;" id="${elementId}-status">Hazirlaniyor...</div>
-                <div style="width:100%; height:8px; background:#444; border-radius:4px; overflow:hidden;">
-                    <div id="${elementId}-bar" class="progress-bar" style="width:0%; height:100%; background:cyan; transition:width 0.5s;"></div>
-                </div>
-            `;
-            textContent.appendChild(pCont);
+function startProgressStream(elementId, requestId) {
+    stopProgressStream();
+    if (!window.EventSource) return;
+
+    const source = new EventSource(`/progress_stream/${requestId}`);
+    progressSource = source;
+
+    source.onmessage = (e) => {
+        let data;
+        try { data = JSON.parse(e.data); } catch (err) { return; }
+
+        if (data.type === 'done') {
+            source.close();
+            if (progressSource === source) progressSource = null;
+            return;
         }
 
-        progressInterval = setInterval(async () => {
-            try {
-                const res = await fetch('/get_progress');
-                const data = await res.json();
+        if (data.type === 'progress') {
+            // Yuzdeli is (resim cizimi vb.): ilerleme cubugu
+            ensureProgressBar(elementId);
+            const bar = document.getElementById(`${elementId}-bar`);
+            if (bar) bar.style.width = data.percent + "%";
+            setLoadingStatus(elementId, data.message || `Olusturuluyor... %${data.percent}`);
+        } else {
+            // Asama olayi: komutan karari, arac cagrisi, seslendirme
+            setLoadingStatus(elementId, data.message);
+        }
+        scrollToBottom();
+    };
 
-                if (data.status === "generating") {
-                    const bar = document.getElementById(`${elementId}-bar`);
-                    const stat = document.getElementById(`${elementId}-status`);
-                    if (bar) bar.style.width = data.percent + "%";
-                    if (stat) stat.innerText = data.message || `Olusturuluyor... %${data.percent}`;
-                }
-            } catch (e) { }
-        }, 1000);
-    }, 100);
+    // Kanal kapaninca tarayicinin otomatik yeniden baglanmasini engelle
+    source.onerror = () => {
+        source.close();
+        if (progressSource === source) progressSource = null;
+    };
 }
 
-function stopProgressPolling() {
-    if (progressInterval) {
-        clearInterval(progressInterval);
-        progressInterval = null;
+function stopProgressStream() {
+    if (progressSource) {
+        progressSource.close();
+        progressSource = null;
     }
 }
 
@@ -654,7 +732,7 @@ async function loadGalleryImages() {
 async function startImageMode() {
     showToast("Sistem Saglik Kontrolu Baslatiliyor...");
 
-    addMessage("**Sistem Analizi Baslatildi...**\nTum yerel modeller kontrol ediliyor. Lutfen bekleyin.", 'ai');
+    addMessage("**Sistem Analizi Baslatildi...**\nSon saglik kontrolu sonuclari getiriliyor.", 'ai');
 
     try {
         const res = await fetch('/system/test_agents');
@@ -667,9 +745,11 @@ async function startImageMode() {
 
         let report = "### JARVIS Sistem Raporu\n\n";
         data.forEach(item => {
-            const icon = item.status === "OK" ? "[OK]" : "[FAIL]";
+            const icons = { OK: "[OK]", IDLE: "[BEKLEMEDE]", PENDING: "[...]" };
+            const icon = icons[item.status] || "[FAIL]";
             report += `**${item.agent}** (${item.model})\n- Durum: ${icon} ${item.status}\n`;
             if (item.time) report += `- Sure: ${item.time}\n`;
+            if (item.age !== undefined) report += `- Son kontrol: ${Math.round(item.age)} sn once\n`;
             if (item.response) report += `- Yanit: ${item.response}\n`;
             report += "\n";
         });